@@ -6,3 +6,90 @@ DISCORD_BOT_TOKEN=your_bot_token_here
 
 # Webhook secret for signing API requests (get from UserVault admin)
 DISCORD_WEBHOOK_SECRET=your_webhook_secret_here
+
+# Optional: HTTP connection pool tuning for API calls
+# HTTP_POOL_LIMIT=100
+# HTTP_POOL_LIMIT_PER_HOST=50
+# HTTP_KEEPALIVE_TIMEOUT=30
+# HTTP_DNS_CACHE_TTL=300
+# HTTP_USE_AIODNS=true
+# HTTP_ENDPOINT_LIMITS=minigame-data=30,minigame-reward=20,bot-api=10
+
+# Optional: per-endpoint timeouts "connect,read,total" (seconds)
+# HTTP_TIMEOUT_MINIGAME_DATA=3,8,10
+# HTTP_TIMEOUT_MINIGAME_REWARD=3,10,12
+# End-to-end time budget for all API calls of a single command
+# COMMAND_DEADLINE_SECONDS=15
+
+# Optional: logging (LOG_FORMAT=text|json, errors are always logged)
+# LOG_LEVEL=INFO
+# LOG_FORMAT=text
+# LOG_SUCCESS_SAMPLE_RATE=1.0
+
+# Optional: local health/metrics server (/healthz, /readyz, Prometheus /metrics)
+# METRICS_PORT=9108
+# METRICS_HOST=127.0.0.1
+# HEALTH_MAX_LOOP_LAG=5
+
+# Optional: per-user balance cache for wager checks
+# BALANCE_CACHE_TTL=15
+# BALANCE_CACHE_SIZE=10000
+
+# Optional: linked-account status cache for dynamic commands
+# LINK_CACHE_TTL=300
+# LINK_CACHE_NEGATIVE_TTL=30
+# LINK_CACHE_SIZE=10000
+
+# Optional: Discord user IDs (comma-separated) allowed to ?reload/?restart, and how long
+# UserVault admin/supporter checks are cached (seconds)
+# ADMIN_USER_IDS=123456789012345678,234567890123456789
+# AUTH_CACHE_TTL=60
+
+# Optional: max age (seconds) of the command list before lookups wait for a
+# fresh copy; until then a stale list is served and refreshed in the background
+# COMMANDS_HARD_TTL=900
+
+# Optional: after a failed command list refresh, wait this long (seconds) before
+# the next one, doubling per consecutive failure up to the max
+# COMMANDS_REFRESH_BACKOFF=30
+# COMMANDS_REFRESH_BACKOFF_MAX=300
+
+# Optional: answer get_bot_commands from a local JSON file (list of command
+# objects) instead of bot-api - a stand-in backend for testing command sync
+# LOCAL_COMMANDS_FILE=./commands.json
+
+# Optional: where the last good command list is cached on disk for instant startup
+# COMMANDS_SNAPSHOT_FILE=./.commands_snapshot.json
+
+# Optional: how many recent message IDs are remembered so a message replayed
+# by the gateway (e.g. after a RESUME) is not handled twice
+# MESSAGE_DEDUP_WINDOW=2048
+
+# Optional: background task supervisor - how long shutdown/reload waits for
+# running games and pending payouts (seconds), and per-kind concurrency limits
+# TASK_DRAIN_TIMEOUT=10
+# TASK_KIND_LIMITS=game=200,settlement=0,poller=2
+
+# Optional: Crash game redraws - max message edits per second per channel for
+# all running games together, and the floor it may drop to while throttled
+# CRASH_EDITS_PER_SECOND=1.25
+# CRASH_MIN_EDITS_PER_SECOND=0.2
+
+# Optional: multiplayer Crash rounds (?crashround) - betting window in seconds
+# and max players per round
+# CRASH_ROUND_BETTING_SECONDS=15
+# CRASH_ROUND_MAX_PLAYERS=25
+
+# Optional: house edge for Mines and Higher/Lower multipliers, in [0, 1)
+# (0.02 = pay 98% of the table multiplier). 0 = fair odds for Mines;
+# Higher/Lower always uses its fixed 1 + 0.5 * streak ladder.
+# PAYOUT_HOUSE_EDGE=0
+
+# Optional: resolve coinflip, RPS and slots in-process instead of asking
+# minigame-data (only settlement goes to the backend). With a server seed,
+# rounds are derived from it, the player's id and a persisted nonce instead of
+# a CSPRNG seed. Keep the seed secret: publish only its sha256 (printed at
+# startup) and reveal the seed after rotating it out.
+# LOCAL_GAMES=false
+# LOCAL_GAMES_SERVER_SEED=
+# LOCAL_GAMES_NONCE_FILE=./.local_games_nonce
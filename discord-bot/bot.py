@@ -18,22 +18,52 @@ Usage:
 
 import os
 import asyncio
+import bisect
+import contextlib
+import contextvars
 import hashlib
 import hmac
+import atexit
+import logging
+import logging.handlers
+import io
+import math
 import inspect
+import heapq
 import json
 import re
+import sys
 import time
+import traceback
 import random
-from typing import Optional, Dict, Any, List
+import weakref
+from collections import OrderedDict, deque
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 import aiohttp
+from aiohttp import web
 from dotenv import load_dotenv
 from pathlib import Path
 
+try:
+    from .payouts import (
+        MINES_CELLS, MINES_GRID_COLUMNS, PLINKO_MULTIPLIERS, check_house_edge,
+        mines_multiplier, higherlower_multiplier, crash_point_for, crash_curve, crash_ticks_before,
+    )
+except ImportError:
+    from payouts import (
+        MINES_CELLS, MINES_GRID_COLUMNS, PLINKO_MULTIPLIERS, check_house_edge,
+        mines_multiplier, higherlower_multiplier, crash_point_for, crash_curve, crash_ticks_before,
+    )
+try:
+    from .game_engine import GameEngine
+except ImportError:
+    from game_engine import GameEngine
+
 # Load environment variables from the same directory as this script
 env_path = Path(__file__).parent / '.env'
 load_dotenv(env_path)
@@ -50,10 +80,43 @@ WEBHOOK_SECRET = os.getenv("DISCORD_WEBHOOK_SECRET")
 # Flag to check if we're being loaded as extension vs standalone
 _RUNNING_AS_EXTENSION = False
 
-# Cache for dynamically loaded commands from API
-_CACHED_BOT_COMMANDS: Dict[str, Any] = {}
-_COMMANDS_LAST_FETCHED: float = 0
+# Cache for dynamically loaded commands from API (see CommandRegistry)
 _COMMANDS_CACHE_TTL: int = 60  # Refresh commands every 60 seconds
+# Past the TTL the cached registry is still served while one background task
+# refreshes it. Only past this hard ceiling do callers wait for the API.
+_COMMANDS_HARD_TTL: int = int(os.getenv("COMMANDS_HARD_TTL", "900"))
+_COMMANDS_REFRESH_TASK: Optional[asyncio.Task] = None
+# After a failed refresh no new one starts for COMMANDS_REFRESH_BACKOFF seconds
+# (doubling per consecutive failure up to COMMANDS_REFRESH_BACKOFF_MAX); the
+# current registry keeps being served meanwhile. ?refresh ignores the backoff.
+COMMANDS_REFRESH_BACKOFF = float(os.getenv("COMMANDS_REFRESH_BACKOFF", "30"))
+COMMANDS_REFRESH_BACKOFF_MAX = float(os.getenv("COMMANDS_REFRESH_BACKOFF_MAX", "300"))
+# Serve get_bot_commands from a local JSON file instead of bot-api
+# (a stand-in backend for testing registry sync without the real API).
+LOCAL_COMMANDS_FILE = os.getenv("LOCAL_COMMANDS_FILE", "").strip()
+# Last good command list, written after every successful sync and loaded at
+# import so dynamic commands route before the first API round trip.
+COMMANDS_SNAPSHOT_FILE = os.getenv("COMMANDS_SNAPSHOT_FILE", "").strip() or str(
+    Path(__file__).with_name(".commands_snapshot.json")
+)
+_COMMANDS_REFRESH_STATS: Dict[str, Any] = {
+    "refreshes": 0,
+    "failures": 0,
+    "background_refreshes": 0,
+    "coalesced": 0,
+    "stale_served": 0,
+    "full_syncs": 0,
+    "delta_syncs": 0,
+    "not_modified": 0,
+    "snapshot": "not loaded",
+    "snapshot_writes": 0,
+    "last_duration_ms": 0.0,
+    "max_duration_ms": 0.0,
+    "last_error": None,
+    "consecutive_failures": 0,
+    "backoff_until": 0.0,  # time.monotonic()
+    "backoff_skipped": 0,
+}
 
 # IMPORTANT:
 # If you run this bot against a different backend (e.g. Lovable Cloud),
@@ -93,6 +156,196 @@ COMMAND_UPDATES_CHANNEL_ID = int(os.getenv("COMMAND_UPDATES_CHANNEL_ID", "146432
 # Slash commands are optional. If you want ONLY prefix commands (?), keep this false.
 ENABLE_SLASH_COMMANDS = os.getenv("ENABLE_SLASH_COMMANDS", "false").strip().lower() in {"1", "true", "yes"}
 
+# Locally authorized users (see AuthorizationService for which commands accept
+# which list): HARDCODED_ADMIN_IDS may run dynamic admin commands, ADMIN_USER_IDS
+# (comma-separated Discord user IDs) and the bot owner may ?reload/?restart. AUTH_CACHE_TTL is how long (seconds) a UserVault
+# admin/supporter check is trusted before asking the API again.
+HARDCODED_ADMIN_IDS = frozenset({809976264856830022, 1132634609079824436})
+ADMIN_USER_IDS = frozenset(
+    int(x.strip()) for x in os.getenv("ADMIN_USER_IDS", "").split(",") if x.strip().isdigit()
+)
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+
+# HTTP connection pool tuning for all UserVault API calls.
+# - HTTP_POOL_LIMIT: max open connections in total (0 = unlimited)
+# - HTTP_POOL_LIMIT_PER_HOST: max open connections per host (0 = unlimited)
+# - HTTP_KEEPALIVE_TIMEOUT: seconds an idle connection is kept for reuse
+# - HTTP_DNS_CACHE_TTL: seconds resolved hostnames are cached
+# - HTTP_USE_AIODNS: use aiodns for async DNS resolution if it is installed
+# - HTTP_ENDPOINT_LIMITS: max concurrent requests per endpoint, e.g.
+#   "minigame-data=20,minigame-reward=10,bot-api=5"
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "50"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_USE_AIODNS = os.getenv("HTTP_USE_AIODNS", "true").strip().lower() in {"1", "true", "yes"}
+HTTP_ENDPOINT_LIMITS: Dict[str, int] = {
+    "minigame-data": 30,
+    "minigame-reward": 20,
+    "bot-api": 10,
+    "bot-verify-code": 5,
+    "bot-command-notifications": 2,
+}
+for _entry in os.getenv("HTTP_ENDPOINT_LIMITS", "").split(","):
+    _name, _, _limit = _entry.partition("=")
+    if _name.strip() and _limit.strip().isdigit():
+        HTTP_ENDPOINT_LIMITS[_name.strip()] = int(_limit.strip())
+
+# Background task supervisor (games, payouts, pollers, the Crash scheduler).
+# - TASK_DRAIN_TIMEOUT: seconds shutdown/reload waits for running games and
+#   pending payouts before cancelling them
+# - TASK_KIND_LIMITS: max concurrently running tasks per kind, e.g.
+#   "game=200,settlement=50" (0 = unlimited); extra tasks wait for a slot
+TASK_DRAIN_TIMEOUT = float(os.getenv("TASK_DRAIN_TIMEOUT", "10"))
+TASK_KIND_LIMITS: Dict[str, int] = {
+    "game": 200,
+    "settlement": 0,
+    "poller": 2,
+}
+for _entry in os.getenv("TASK_KIND_LIMITS", "").split(","):
+    _name, _, _limit = _entry.partition("=")
+    if _name.strip() and _limit.strip().isdigit():
+        TASK_KIND_LIMITS[_name.strip()] = int(_limit.strip())
+
+# Crash game display. All running games share one scheduler; message edits are
+# budgeted per channel so many games in one channel cannot hit rate limits.
+# - CRASH_EDITS_PER_SECOND: max edits per second per channel (all games together);
+#   lowered automatically when Discord starts throttling, then recovers
+# - CRASH_MIN_EDITS_PER_SECOND: floor for that adaptive rate
+CRASH_EDITS_PER_SECOND = float(os.getenv("CRASH_EDITS_PER_SECOND", "1.25"))
+CRASH_MIN_EDITS_PER_SECOND = float(os.getenv("CRASH_MIN_EDITS_PER_SECOND", "0.2"))
+
+# Multiplayer Crash rounds (?crashround): one round, one crash point and one
+# live message per channel.
+# - CRASH_ROUND_BETTING_SECONDS: how long players can join before the round starts
+# - CRASH_ROUND_MAX_PLAYERS: players per round
+CRASH_ROUND_BETTING_SECONDS = float(os.getenv("CRASH_ROUND_BETTING_SECONDS", "15"))
+CRASH_ROUND_MAX_PLAYERS = int(os.getenv("CRASH_ROUND_MAX_PLAYERS", "25"))
+
+# House edge for the locally computed Mines and Higher/Lower multipliers
+# (see payouts.py): fraction of the table multiplier kept back, in [0, 1);
+# an invalid value fails startup. 0 = fair odds for Mines; Higher/Lower keeps
+# its fixed 1 + 0.5 * streak ladder, which is not fair odds to begin with.
+# The same table value is shown in the embed and paid out.
+PAYOUT_HOUSE_EDGE = check_house_edge(float(os.getenv("PAYOUT_HOUSE_EDGE", "0")))
+
+# Quick games resolved in-process (see game_engine.py). Dice and roulette always
+# roll locally; with LOCAL_GAMES coinflip, RPS and slots do too, and only the
+# settlement (minigame-reward) goes to the backend.
+# - LOCAL_GAMES_SERVER_SEED: derive rounds from this seed, the player's id and
+#   a running nonce instead of a fresh CSPRNG seed per round (verifiable
+#   rounds). Keep it secret; only its sha256 (printed at startup) may be
+#   published until the seed is rotated out.
+# - LOCAL_GAMES_NONCE_FILE: where the nonce is persisted, so restarts and
+#   reloads never reuse a nonce for the same seed
+LOCAL_GAMES = os.getenv("LOCAL_GAMES", "false").strip().lower() in {"1", "true", "yes"}
+LOCAL_GAMES_SERVER_SEED = os.getenv("LOCAL_GAMES_SERVER_SEED", "").strip()
+LOCAL_GAMES_NONCE_FILE = os.getenv("LOCAL_GAMES_NONCE_FILE", "").strip() or str(
+    Path(__file__).with_name(".local_games_nonce")
+)
+
+# Per-endpoint HTTP timeouts in seconds: (connect, read, total).
+# Override with HTTP_TIMEOUT_<ENDPOINT>="connect,read,total",
+# e.g. HTTP_TIMEOUT_MINIGAME_REWARD="3,10,12"
+HTTP_TIMEOUTS: Dict[str, tuple] = {
+    "minigame-data": (3.0, 8.0, 10.0),
+    "minigame-reward": (3.0, 10.0, 12.0),
+    "bot-api": (3.0, 10.0, 12.0),
+    "bot-verify-code": (3.0, 10.0, 12.0),
+    "bot-command-notifications": (3.0, 8.0, 10.0),
+}
+for _name in list(HTTP_TIMEOUTS):
+    _raw = os.getenv(f"HTTP_TIMEOUT_{_name.upper().replace('-', '_')}", "")
+    try:
+        _values = tuple(float(x) for x in _raw.split(","))
+        if len(_values) == 3:
+            HTTP_TIMEOUTS[_name] = _values
+    except ValueError:
+        pass
+
+# Logging
+# - LOG_LEVEL: DEBUG also logs every request start and every received command
+# - LOG_FORMAT: "text" (colored console) or "json" (one JSON object per line)
+# - LOG_SUCCESS_SAMPLE_RATE: fraction of successful API calls that are logged
+#   (0.0 - 1.0). Errors are always logged.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").strip().lower()
+LOG_SUCCESS_SAMPLE_RATE = float(os.getenv("LOG_SUCCESS_SAMPLE_RATE", "1.0"))
+
+# Optional local metrics/health HTTP server (/healthz, /readyz, /metrics).
+# - METRICS_PORT: port to listen on (0 = disabled)
+# - METRICS_HOST: bind address; keep it on localhost unless a scraper needs it
+# - HEALTH_MAX_LOOP_LAG: /healthz fails once event-loop lag exceeds this (seconds)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+HEALTH_MAX_LOOP_LAG = float(os.getenv("HEALTH_MAX_LOOP_LAG", "5"))
+
+# Per-user balance cache used by wager checks before a game.
+# - BALANCE_CACHE_TTL: seconds a balance is trusted without asking the API
+# - BALANCE_CACHE_SIZE: max users kept (least recently used are evicted)
+BALANCE_CACHE_TTL = float(os.getenv("BALANCE_CACHE_TTL", "15"))
+BALANCE_CACHE_SIZE = int(os.getenv("BALANCE_CACHE_SIZE", "10000"))
+
+# Linked-account status cache used before dynamic (database-defined) commands.
+# - LINK_CACHE_TTL: seconds a "linked" answer is trusted
+# - LINK_CACHE_NEGATIVE_TTL: seconds a "not linked" answer is trusted
+LINK_CACHE_TTL = float(os.getenv("LINK_CACHE_TTL", "300"))
+LINK_CACHE_NEGATIVE_TTL = float(os.getenv("LINK_CACHE_NEGATIVE_TTL", "30"))
+LINK_CACHE_SIZE = int(os.getenv("LINK_CACHE_SIZE", "10000"))
+
+# Recently processed message IDs; a message seen again (e.g. replayed by the
+# gateway after a RESUME) is ignored instead of being handled twice.
+MESSAGE_DEDUP_WINDOW = int(os.getenv("MESSAGE_DEDUP_WINDOW", "2048"))
+
+# End-to-end budget for one command: starts when the message arrives and is
+# shared by every API call the command makes.
+COMMAND_DEADLINE_SECONDS = float(os.getenv("COMMAND_DEADLINE_SECONDS", "15"))
+
+_command_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "uservault_command_deadline", default=None
+)
+
+
+def start_command_deadline(seconds: float = COMMAND_DEADLINE_SECONDS):
+    """Start the deadline budget for the command running in the current task."""
+    _command_deadline.set(time.monotonic() + seconds)
+
+
+def clear_command_deadline():
+    """Remove the deadline (e.g. for long-running game tasks spawned by a command)."""
+    _command_deadline.set(None)
+
+
+def command_time_remaining() -> Optional[float]:
+    """Seconds left in the current command's budget, or None if no deadline is set."""
+    deadline = _command_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+# Retry policy for idempotent reads (exponential backoff with full jitter)
+API_RETRY_MAX_ATTEMPTS = int(os.getenv("API_RETRY_MAX_ATTEMPTS", "3"))
+API_RETRY_BASE_DELAY = float(os.getenv("API_RETRY_BASE_DELAY", "0.25"))
+API_RETRY_MAX_DELAY = float(os.getenv("API_RETRY_MAX_DELAY", "2.0"))
+API_RETRY_STATUSES = {429, 502, 503, 504}
+
+# Circuit breaker per endpoint URL
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+
+class APITimeoutError(Exception):
+    """An API call exceeded its endpoint timeout or the command deadline."""
+
+
+class CommandDeadlineExceeded(APITimeoutError):
+    """The command's deadline budget ran out (not the backend's fault)."""
+
+
+class CircuitOpenError(Exception):
+    """The endpoint's circuit breaker is open; the call was not attempted."""
+
 # Only validate in standalone mode - extensions get config from host bot
 def _validate_standalone_config():
     """Validate configuration only when running standalone."""
@@ -140,9 +393,9 @@ def safe_int_balance(value: Any) -> int:
 
 
 
-class RequestLogger:
-    """Logger for API requests with colors and timing."""
-    
+class ColorLogFormatter(logging.Formatter):
+    """Console format used by the bot: `[HH:MM:SS] message` with ANSI colors."""
+
     COLORS = {
         'green': '\033[92m',
         'red': '\033[91m',
@@ -152,63 +405,1199 @@ class RequestLogger:
         'reset': '\033[0m',
         'bold': '\033[1m',
     }
+    LEVEL_COLORS = {
+        logging.DEBUG: 'blue',
+        logging.INFO: 'reset',
+        logging.WARNING: 'yellow',
+        logging.ERROR: 'red',
+        logging.CRITICAL: 'red',
+    }
+
+    def format(self, record: logging.LogRecord) -> str:
+        color_name = getattr(record, "color", None) or self.LEVEL_COLORS.get(record.levelno, 'reset')
+        color = self.COLORS.get(color_name, self.COLORS['reset'])
+        reset = self.COLORS['reset']
+        timestamp = time.strftime("%H:%M:%S", time.localtime(record.created))
+        text = f"{self.COLORS['cyan']}[{timestamp}]{reset} {color}{record.getMessage()}{reset}"
+        if record.exc_info:
+            text += "\n" + self.formatException(record.exc_info)
+        return text
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line, including any structured `fields` of the record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that hands the raw record to the listener thread.
+
+    The stock QueueHandler formats the message in the calling thread; here
+    %-formatting and JSON encoding happen in the listener thread instead, so
+    the event loop only pays for creating the record.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _stop_logging():
+    """Flush and stop the current log listener thread."""
+    root = logging.getLogger("uservault")
+    listener = getattr(root, "_uservault_listener", None)
+    if listener is not None:
+        root._uservault_listener = None  # type: ignore[attr-defined]
+        listener.stop()
+
+
+def setup_logging() -> logging.Logger:
+    """
+    Route the "uservault" loggers through a queue drained by a background
+    thread. Safe to call again on extension reload (the old listener is stopped).
+    """
+    import queue as _queue
+
+    root = logging.getLogger("uservault")
+    try:
+        _stop_logging()
+    except Exception:
+        pass
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonLogFormatter() if LOG_FORMAT == "json" else ColorLogFormatter())
+
+    log_queue: _queue.SimpleQueue = _queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    if not getattr(root, "_uservault_atexit", False):
+        # Registered once per process; flushes whichever listener is current
+        atexit.register(_stop_logging)
+        root._uservault_atexit = True  # type: ignore[attr-defined]
+
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+    root.propagate = False
+    root._uservault_listener = listener  # type: ignore[attr-defined]
+    return root
+
+
+log = setup_logging()
+api_log = logging.getLogger("uservault.api")
+
+
+class _HistogramSlice:
+    """Latency counts for one fixed time slice of a RollingLatencyHistogram."""
+
+    __slots__ = ("start", "count", "errors", "max_ms", "buckets", "statuses")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.count = 0
+        self.errors = 0
+        self.max_ms = 0.0
+        self.buckets: Dict[int, int] = {}
+        self.statuses: Dict[str, int] = {}
+
+
+class RollingLatencyHistogram:
+    """
+    Bounded-memory latency histogram over rolling time windows.
+
+    Latencies go into log-scaled buckets (each bucket ~5% wider than the
+    previous one, 0.1ms .. minutes), so percentiles are accurate to a few
+    percent no matter how many samples are recorded. Samples are grouped in
+    fixed time slices; only the last `horizon` seconds of slices are kept.
+    """
+
+    WINDOWS = {"1m": 60, "5m": 300, "1h": 3600}
+
+    MIN_MS = 0.1
+    GROWTH = 1.05
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self, slice_seconds: int = 10, horizon: int = 3600):
+        self.slice_seconds = slice_seconds
+        self.slices: deque = deque(maxlen=max(1, horizon // slice_seconds))
+        self.total_count = 0
+        # Lifetime (never rotated) counters for cumulative exports like /metrics
+        self.total_sum_ms = 0.0
+        self.total_buckets: Dict[int, int] = {}
+        self.total_statuses: Dict[str, int] = {}
+
+    @classmethod
+    def bucket_for(cls, duration_ms: float) -> int:
+        if duration_ms <= cls.MIN_MS:
+            return 0
+        return int(math.log(duration_ms / cls.MIN_MS) / cls._LOG_GROWTH) + 1
+
+    @classmethod
+    def bucket_upper_ms(cls, bucket: int) -> float:
+        return cls.MIN_MS * (cls.GROWTH ** bucket)
+
+    def _current_slice(self, now: float) -> _HistogramSlice:
+        start = now - (now % self.slice_seconds)
+        if not self.slices or self.slices[-1].start != start:
+            self.slices.append(_HistogramSlice(start))
+        return self.slices[-1]
+
+    def record(self, duration_ms: float, status: str, ok: bool, now: Optional[float] = None):
+        current = self._current_slice(time.time() if now is None else now)
+        bucket = self.bucket_for(duration_ms)
+        current.buckets[bucket] = current.buckets.get(bucket, 0) + 1
+        current.statuses[status] = current.statuses.get(status, 0) + 1
+        current.count += 1
+        if not ok:
+            current.errors += 1
+        if duration_ms > current.max_ms:
+            current.max_ms = duration_ms
+        self.total_count += 1
+        self.total_sum_ms += duration_ms
+        self.total_buckets[bucket] = self.total_buckets.get(bucket, 0) + 1
+        self.total_statuses[status] = self.total_statuses.get(status, 0) + 1
+
+    def snapshot(self, window_seconds: int, now: Optional[float] = None) -> Dict[str, Any]:
+        """Merge all slices inside the window into count/error-rate/percentile stats."""
+        cutoff = (time.time() if now is None else now) - window_seconds
+        buckets: Dict[int, int] = {}
+        statuses: Dict[str, int] = {}
+        count = errors = 0
+        max_ms = 0.0
+        for sl in reversed(self.slices):
+            if sl.start + self.slice_seconds <= cutoff:
+                break
+            count += sl.count
+            errors += sl.errors
+            max_ms = max(max_ms, sl.max_ms)
+            for b, c in sl.buckets.items():
+                buckets[b] = buckets.get(b, 0) + c
+            for st, c in sl.statuses.items():
+                statuses[st] = statuses.get(st, 0) + c
+
+        def percentile(p: float) -> float:
+            if not count:
+                return 0.0
+            rank = p * count
+            seen = 0
+            for b in sorted(buckets):
+                seen += buckets[b]
+                if seen >= rank:
+                    return min(self.bucket_upper_ms(b), max_ms)
+            return max_ms
+
+        return {
+            "count": count,
+            "errors": errors,
+            "error_rate": (errors / count) if count else 0.0,
+            "p50_ms": round(percentile(0.50), 1),
+            "p95_ms": round(percentile(0.95), 1),
+            "p99_ms": round(percentile(0.99), 1),
+            "max_ms": round(max_ms, 1),
+            "statuses": statuses,
+        }
+
+    def snapshot_all(self, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        now = time.time() if now is None else now
+        return {name: self.snapshot(seconds, now) for name, seconds in self.WINDOWS.items()}
+
+    def cumulative_buckets(self, bounds_ms: List[float]) -> List[int]:
+        """Lifetime sample counts at or below each bound (Prometheus `le` style)."""
+        counts = [0] * len(bounds_ms)
+        for b, c in self.total_buckets.items():
+            upper = self.bucket_upper_ms(b)
+            for i, bound in enumerate(bounds_ms):
+                if upper <= bound:
+                    counts[i] += c
+        return counts
+
+
+class RequestLogger:
+    """Logger for API requests with colors and timing."""
     
-    def __init__(self, enabled: bool = True):
+    def __init__(self, enabled: bool = True, success_sample_rate: float = LOG_SUCCESS_SAMPLE_RATE):
         self.enabled = enabled
+        self.success_sample_rate = success_sample_rate
         self.request_count = 0
         self.success_count = 0
         self.error_count = 0
+        # Latency histograms keyed by endpoint and by "endpoint:action"
+        self.endpoint_latency: Dict[str, RollingLatencyHistogram] = {}
+        self.action_latency: Dict[str, RollingLatencyHistogram] = {}
     
-    def log(self, level: str, message: str):
+    def log(self, level: str, message: str, *args, **fields):
+        """Log `message % args` at INFO with the given console color and structured fields."""
         if not self.enabled:
             return
-        
-        timestamp = time.strftime("%H:%M:%S")
-        color = self.COLORS.get(level, self.COLORS['reset'])
-        reset = self.COLORS['reset']
-        print(f"{self.COLORS['cyan']}[{timestamp}]{reset} {color}{message}{reset}")
+        api_log.info(message, *args, extra={"color": level, "fields": fields})
     
     def request_start(self, endpoint: str, action: str, user_id: str = None):
         self.request_count += 1
-        user_info = f" (User: {user_id})" if user_id else ""
-        self.log('blue', f"📡 REQUEST #{self.request_count}: {action} → {endpoint}{user_info}")
+        if self.enabled and api_log.isEnabledFor(logging.DEBUG):
+            api_log.debug(
+                "📡 REQUEST #%d: %s → %s%s",
+                self.request_count, action, endpoint, f" (User: {user_id})" if user_id else "",
+                extra={"color": "blue", "fields": {"event": "request_start", "endpoint": endpoint, "action": action, "user_id": user_id}},
+            )
     
-    def request_success(self, action: str, duration_ms: float, response_preview: str = ""):
+    def request_success(
+        self,
+        action: str,
+        duration_ms: float,
+        response: Any = None,
+        endpoint: str = None,
+        status_code: int = 200,
+    ):
         self.success_count += 1
-        preview = f" | {response_preview[:50]}..." if len(response_preview) > 50 else f" | {response_preview}" if response_preview else ""
-        self.log('green', f"✅ SUCCESS: {action} ({duration_ms:.0f}ms){preview}")
+        self.record_latency(endpoint, action, duration_ms, status_code, ok=True)
+
+        # Sampled: most successes are only counted, never formatted
+        if not self.enabled or not api_log.isEnabledFor(logging.INFO):
+            return
+        if self.success_sample_rate < 1.0 and random.random() >= self.success_sample_rate:
+            return
+
+        # Only the preview of a logged response is serialized, and only at DEBUG
+        preview = ""
+        if response and api_log.isEnabledFor(logging.DEBUG):
+            preview = response if isinstance(response, str) else json.dumps(response, default=str)
+            preview = f" | {preview[:50]}..." if len(preview) > 50 else f" | {preview}"
+        api_log.info(
+            "✅ SUCCESS: %s (%.0fms)%s", action, duration_ms, preview,
+            extra={"color": "green", "fields": {
+                "event": "request_success", "endpoint": endpoint, "action": action,
+                "status": status_code, "duration_ms": round(duration_ms, 1),
+            }},
+        )
     
-    def request_error(self, action: str, error: str, status_code: int = None):
+    def request_error(
+        self,
+        action: str,
+        error: str,
+        status_code: int = None,
+        duration_ms: float = None,
+        endpoint: str = None,
+    ):
         self.error_count += 1
-        status = f" [HTTP {status_code}]" if status_code else ""
-        self.log('red', f"❌ ERROR: {action}{status} - {error}")
-    
+        if duration_ms is not None:
+            self.record_latency(endpoint, action, duration_ms, status_code, ok=False)
+        if not self.enabled:
+            return
+        api_log.warning(
+            "❌ ERROR: %s%s - %s", action, f" [HTTP {status_code}]" if status_code else "", error,
+            extra={"color": "red", "fields": {
+                "event": "request_error", "endpoint": endpoint, "action": action, "status": status_code,
+                "duration_ms": round(duration_ms, 1) if duration_ms is not None else None, "error": error,
+            }},
+        )
+
     def stats(self):
         total = self.request_count
         success_rate = (self.success_count / total * 100) if total > 0 else 0
-        self.log('yellow', f"📊 STATS: {total} requests | {self.success_count} success | {self.error_count} errors | {success_rate:.1f}% success rate")
+        self.log(
+            'yellow', "📊 STATS: %d requests | %d success | %d errors | %.1f%% success rate",
+            total, self.success_count, self.error_count, success_rate,
+            event="stats", requests=total, success=self.success_count, errors=self.error_count,
+        )
+
+    def record_latency(self, endpoint: Optional[str], action: str, duration_ms: float, status_code: Optional[int], ok: bool):
+        """Add one request to the per-endpoint and per-action histograms."""
+        endpoint = endpoint or "unknown"
+        status = str(status_code) if status_code else "no_response"
+        key = f"{endpoint}:{action}"
+
+        hist = self.endpoint_latency.get(endpoint)
+        if hist is None:
+            hist = self.endpoint_latency[endpoint] = RollingLatencyHistogram()
+        hist.record(duration_ms, status, ok)
+
+        hist = self.action_latency.get(key)
+        if hist is None:
+            hist = self.action_latency[key] = RollingLatencyHistogram()
+        hist.record(duration_ms, status, ok)
+
+    def dump(self) -> Dict[str, Any]:
+        """Machine-readable snapshot of counters and latency histograms."""
+        now = time.time()
+        return {
+            "generated_at": now,
+            "requests": self.request_count,
+            "success": self.success_count,
+            "errors": self.error_count,
+            "endpoints": {name: h.snapshot_all(now) for name, h in sorted(self.endpoint_latency.items())},
+            "actions": {name: h.snapshot_all(now) for name, h in sorted(self.action_latency.items())},
+        }
 
 
 # Global request logger
 request_logger = RequestLogger(enabled=True)
 
 
+class HTTPSessionManager:
+    """
+    Owns the shared aiohttp session and its tuned TCPConnector.
+
+    - Exactly one session is created, even when many coroutines call
+      get_session() concurrently on a cold start.
+    - Each endpoint family (minigame-data, minigame-reward, ...) gets its own
+      concurrency limit so one busy endpoint cannot starve the others.
+    - Pool occupancy, connection reuse and wait times are tracked so the
+      limits can be sized from real traffic (see ?apistats).
+    """
+
+    def __init__(
+        self,
+        limit: int = HTTP_POOL_LIMIT,
+        limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = HTTP_DNS_CACHE_TTL,
+        use_aiodns: bool = HTTP_USE_AIODNS,
+        endpoint_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.use_aiodns = use_aiodns
+        self.endpoint_limits = dict(HTTP_ENDPOINT_LIMITS if endpoint_limits is None else endpoint_limits)
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        # One SSL context for the lifetime of the process: the CA bundle is
+        # loaded once and TLS sessions can be resumed across reconnects.
+        self._ssl_context = None
+        self._endpoint_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.resolver_name = "threaded"
+
+        # Counters
+        self.sessions_created = 0
+        self.in_flight: Dict[str, int] = {}
+        self.peak_in_flight: Dict[str, int] = {}
+        self.waiting: Dict[str, int] = {}
+        self.slot_waits: Dict[str, int] = {}
+        self.slot_wait_total_ms: Dict[str, float] = {}
+        self.slot_wait_max_ms: Dict[str, float] = {}
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.connection_queued = 0
+        self.connection_queue_total_ms = 0.0
+        self.connection_queue_max_ms = 0.0
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Hook aiohttp's tracing signals to count reuse and pool wait time."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_queued_start(session, ctx, params):
+            ctx.queued_at = time.perf_counter()
+
+        async def on_queued_end(session, ctx, params):
+            waited_ms = (time.perf_counter() - getattr(ctx, "queued_at", time.perf_counter())) * 1000
+            self.connection_queued += 1
+            self.connection_queue_total_ms += waited_ms
+            self.connection_queue_max_ms = max(self.connection_queue_max_ms, waited_ms)
+
+        async def on_create_end(session, ctx, params):
+            self.connections_created += 1
+
+        async def on_reuse(session, ctx, params):
+            self.connections_reused += 1
+
+        trace_config.on_connection_queued_start.append(on_queued_start)
+        trace_config.on_connection_queued_end.append(on_queued_end)
+        trace_config.on_connection_create_end.append(on_create_end)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+    def _build_connector(self) -> aiohttp.TCPConnector:
+        if self._ssl_context is None:
+            import ssl
+            self._ssl_context = ssl.create_default_context()
+
+        resolver = None
+        if self.use_aiodns:
+            try:
+                import aiodns  # noqa: F401  (optional dependency)
+                resolver = aiohttp.AsyncResolver()
+                self.resolver_name = "aiodns"
+            except Exception:
+                self.resolver_name = "threaded"
+
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=self.dns_cache_ttl > 0,
+            resolver=resolver,
+            ssl=self._ssl_context,
+        )
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it exactly once."""
+        session = self.session
+        if session is not None and not session.closed:
+            return session
+
+        async with self._session_lock:
+            # Another coroutine may have created it while we waited for the lock
+            if self.session is None or self.session.closed:
+                self.session = aiohttp.ClientSession(
+                    connector=self._build_connector(),
+                    trace_configs=[self._build_trace_config()],
+                )
+                self.sessions_created += 1
+            return self.session
+
+    def _semaphore(self, endpoint: str) -> Optional[asyncio.Semaphore]:
+        limit = self.endpoint_limits.get(endpoint, 0)
+        if limit <= 0:
+            return None
+        sem = self._endpoint_semaphores.get(endpoint)
+        if sem is None:
+            sem = asyncio.Semaphore(limit)
+            self._endpoint_semaphores[endpoint] = sem
+        return sem
+
+    @contextlib.asynccontextmanager
+    async def slot(self, endpoint: str, timeout: Optional[float] = None):
+        """
+        Hold one of the endpoint's concurrency slots for the duration of a request.
+        Raises asyncio.TimeoutError if no slot frees up within `timeout` seconds.
+        """
+        sem = self._semaphore(endpoint)
+        if sem is not None:
+            self.waiting[endpoint] = self.waiting.get(endpoint, 0) + 1
+            wait_start = time.perf_counter()
+            try:
+                await asyncio.wait_for(sem.acquire(), timeout)
+            finally:
+                self.waiting[endpoint] -= 1
+            waited_ms = (time.perf_counter() - wait_start) * 1000
+            self.slot_waits[endpoint] = self.slot_waits.get(endpoint, 0) + 1
+            self.slot_wait_total_ms[endpoint] = self.slot_wait_total_ms.get(endpoint, 0.0) + waited_ms
+            self.slot_wait_max_ms[endpoint] = max(self.slot_wait_max_ms.get(endpoint, 0.0), waited_ms)
+
+        current = self.in_flight.get(endpoint, 0) + 1
+        self.in_flight[endpoint] = current
+        self.peak_in_flight[endpoint] = max(self.peak_in_flight.get(endpoint, 0), current)
+        try:
+            yield
+        finally:
+            self.in_flight[endpoint] -= 1
+            if sem is not None:
+                sem.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool occupancy and wait-time counters."""
+        endpoints = {}
+        for name in sorted(set(self.endpoint_limits) | set(self.in_flight)):
+            waits = self.slot_waits.get(name, 0)
+            endpoints[name] = {
+                "limit": self.endpoint_limits.get(name, 0),
+                "in_flight": self.in_flight.get(name, 0),
+                "peak_in_flight": self.peak_in_flight.get(name, 0),
+                "waiting": self.waiting.get(name, 0),
+                "avg_wait_ms": (self.slot_wait_total_ms.get(name, 0.0) / waits) if waits else 0.0,
+                "max_wait_ms": self.slot_wait_max_ms.get(name, 0.0),
+            }
+
+        total_conns = self.connections_created + self.connections_reused
+        return {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "keepalive_timeout": self.keepalive_timeout,
+            "dns_cache_ttl": self.dns_cache_ttl,
+            "resolver": self.resolver_name,
+            "sessions_created": self.sessions_created,
+            "in_flight": sum(self.in_flight.values()),
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_rate": (self.connections_reused / total_conns) if total_conns else 0.0,
+            "connection_queued": self.connection_queued,
+            "connection_queue_avg_ms": (
+                self.connection_queue_total_ms / self.connection_queued if self.connection_queued else 0.0
+            ),
+            "connection_queue_max_ms": self.connection_queue_max_ms,
+            "endpoints": endpoints,
+        }
+
+    async def close(self):
+        async with self._session_lock:
+            if self.session and not self.session.closed:
+                await self.session.close()
+            self.session = None
+
+
+# Shared connection pool (one per process)
+http_pool = HTTPSessionManager()
+
+
+class TaskSupervisor:
+    """
+    Owns every long-running background task the bot starts.
+
+    - Tasks are named and grouped by kind ("game", "settlement", "poller",
+      "scheduler"); each kind has its own concurrency limit (TASK_KIND_LIMITS),
+      extra tasks wait for a slot instead of piling onto the event loop.
+    - A task that dies with an exception is logged with its traceback and
+      kept in a short list of reports (see ?apistats json).
+    - drain() runs on shutdown and extension reload: pollers are cancelled
+      right away, games and settlements get until the deadline to finish.
+    """
+
+    REPORTS_KEPT = 20
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = dict(TASK_KIND_LIMITS if limits is None else limits)
+        self._tasks: Dict[asyncio.Task, Dict[str, Any]] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self.reports: deque = deque(maxlen=self.REPORTS_KEPT)
+
+    def _kind_counts(self, kind: str) -> Dict[str, int]:
+        counts = self._counts.get(kind)
+        if counts is None:
+            counts = self._counts[kind] = {"started": 0, "waiting": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        return counts
+
+    async def _run_limited(self, kind: str, coro):
+        sem = self._semaphores.get(kind)
+        if sem is None:
+            sem = self._semaphores[kind] = asyncio.Semaphore(self.limits[kind])
+        counts = self._kind_counts(kind)
+        counts["waiting"] += 1
+        try:
+            await sem.acquire()
+        except BaseException:
+            coro.close()
+            raise
+        finally:
+            counts["waiting"] -= 1
+        try:
+            return await coro
+        finally:
+            sem.release()
+
+    def get(self, name: str) -> Optional[asyncio.Task]:
+        """Running task with this name, if any."""
+        for task, info in self._tasks.items():
+            if info["name"] == name and not task.done():
+                return task
+        return None
+
+    def spawn(self, kind: str, coro, name: Optional[str] = None, *, drain: bool = True, unique: bool = False) -> asyncio.Task:
+        """
+        Start `coro` as a supervised task.
+
+        drain=False tasks (pollers) are cancelled immediately on shutdown.
+        unique=True returns the already running task of the same name instead
+        of starting a second copy.
+        """
+        name = name or f"{kind}:{getattr(coro, '__qualname__', 'task')}"
+        if unique:
+            existing = self.get(name)
+            if existing is not None:
+                coro.close()
+                return existing
+
+        if self.limits.get(kind, 0) > 0:
+            coro = self._run_limited(kind, coro)
+        task = asyncio.ensure_future(coro)
+        self._tasks[task] = {"kind": kind, "name": name, "drain": drain, "started_at": time.time()}
+        self._kind_counts(kind)["started"] += 1
+        task.add_done_callback(self._on_done)
+        return task
+
+    async def run(self, kind: str, coro, name: Optional[str] = None):
+        """
+        Await `coro` as a supervised task. Cancelling the caller does not
+        cancel the task, so a payout is never cut off halfway.
+        """
+        return await asyncio.shield(self.spawn(kind, coro, name))
+
+    def _on_done(self, task: asyncio.Task):
+        info = self._tasks.pop(task, None)
+        if info is None:
+            return
+        counts = self._kind_counts(info["kind"])
+        if task.cancelled():
+            counts["cancelled"] += 1
+            return
+        exc = task.exception()
+        if exc is None:
+            counts["completed"] += 1
+            return
+
+        counts["failed"] += 1
+        self.reports.append({
+            "at": time.time(),
+            "kind": info["kind"],
+            "name": info["name"],
+            "runtime_s": round(time.time() - info["started_at"], 3),
+            "error": f"{type(exc).__name__}: {exc}",
+            "traceback": "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))[-4000:],
+        })
+        log.error(
+            "💥 Background task %s (%s) crashed: %s", info["name"], info["kind"], exc,
+            exc_info=(type(exc), exc, exc.__traceback__),
+            extra={"fields": {"event": "task_failed", "task": info["name"], "kind": info["kind"]}},
+        )
+
+    async def drain(self, timeout: float = TASK_DRAIN_TIMEOUT) -> Dict[str, int]:
+        """
+        Cancel pollers, wait up to `timeout` for games and settlements (including
+        settlements they start meanwhile), then cancel whatever is left.
+        The calling task is never waited for or cancelled.
+        """
+        current = asyncio.current_task()
+        for task, info in list(self._tasks.items()):
+            if not info["drain"] and task is not current:
+                task.cancel()
+
+        drained = 0
+        deadline = time.monotonic() + timeout
+        while True:
+            pending = [t for t, info in self._tasks.items() if info["drain"] and t is not current and not t.done()]
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
+            done, _ = await asyncio.wait(pending, timeout=remaining)
+            drained += len(done)
+
+        leftover = [t for t in self._tasks if t is not current and not t.done()]
+        for task in leftover:
+            task.cancel()
+        if leftover:
+            await asyncio.wait(leftover, timeout=1.0)
+            log.warning("⚠️ Cancelled %d background task(s) still running after the %gs drain", len(leftover), timeout)
+        return {"drained": drained, "cancelled": len(leftover)}
+
+    def stats(self) -> Dict[str, Any]:
+        running: Dict[str, int] = {}
+        for info in self._tasks.values():
+            running[info["kind"]] = running.get(info["kind"], 0) + 1
+        kinds = set(self._counts) | set(running)
+        return {
+            "kinds": {
+                kind: {
+                    **self._kind_counts(kind),
+                    "running": running.get(kind, 0),
+                    "limit": self.limits.get(kind, 0),
+                }
+                for kind in sorted(kinds)
+            },
+            "reports": [{k: v for k, v in r.items() if k != "traceback"} for r in self.reports],
+        }
+
+
+# Shared task supervisor (one per loaded module; drained on close/teardown)
+task_supervisor = TaskSupervisor()
+
+# Local outcome engine for the quick games (see LOCAL_GAMES)
+try:
+    game_engine = GameEngine(LOCAL_GAMES_SERVER_SEED, LOCAL_GAMES_NONCE_FILE)
+except (OSError, ValueError) as e:
+    # Never restart the nonce at 0 for a seed that was already used
+    print(f"⚠️ Could not use {LOCAL_GAMES_NONCE_FILE} ({e}); local games use unseeded CSPRNG rounds")
+    game_engine = GameEngine()
+if game_engine.server_seed_hash:
+    print(f"🎲 Local games server seed sha256: {game_engine.server_seed_hash} (nonce {game_engine.nonce})")
+
+
+class RetryPolicy:
+    """Bounded exponential backoff with full jitter."""
+
+    def __init__(
+        self,
+        max_attempts: int = API_RETRY_MAX_ATTEMPTS,
+        base_delay: float = API_RETRY_BASE_DELAY,
+        max_delay: float = API_RETRY_MAX_DELAY,
+        retry_statuses: Optional[set] = None,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = set(API_RETRY_STATUSES if retry_statuses is None else retry_statuses)
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based)."""
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    closed    -> requests flow; consecutive failures are counted
+    open      -> requests fail fast until reset_timeout has passed
+    half_open -> a single probe request is let through; success closes the
+                 circuit, failure opens it again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    def before_request(self):
+        """Raise CircuitOpenError if the request must not be attempted."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"{self.name} temporarily unavailable (retry in {self.retry_in():.0f}s)"
+                )
+            self.state = self.HALF_OPEN
+            self.probe_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            if self.probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} is recovering, please try again shortly")
+            self.probe_in_flight = True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        self.probe_in_flight = False
+
+    def release_probe(self):
+        """Give up a half-open probe without a verdict (e.g. command deadline ran out)."""
+        self.probe_in_flight = False
+
+    def retry_in(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in": self.retry_in(),
+        }
+
+
+class BalanceCache:
+    """
+    Bounded LRU cache of get_balance responses keyed by Discord user ID.
+
+    Entries expire after `ttl` seconds. Reward calls that return the new
+    balance write it through; calls that change a balance without returning
+    it invalidate the entry instead.
+    """
+
+    def __init__(self, ttl: float = BALANCE_CACHE_TTL, max_size: int = BALANCE_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.write_throughs = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return dict(entry[1])
+
+    def set(self, user_id: str, result: Dict[str, Any]):
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl, dict(result))
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: str):
+        if self._entries.pop(str(user_id), None) is not None:
+            self.invalidations += 1
+
+    def apply_result(self, user_id: str, result: Dict[str, Any]):
+        """Write through the new balance from a reward response, or drop the entry."""
+        new_balance = result.get("newBalance", result.get("new_balance")) if not result.get("error") else None
+        if new_balance is None:
+            self.invalidate(user_id)
+            return
+        entry = self._entries.get(user_id)
+        cached = dict(entry[1]) if entry is not None else {}
+        cached["balance"] = new_balance
+        self.set(user_id, cached)
+        self.write_throughs += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "write_throughs": self.write_throughs,
+            "invalidations": self.invalidations,
+        }
+
+
+class LocalCommandBackend:
+    """
+    Stand-in for bot-api's get_bot_commands, backed by a JSON file.
+
+    The file holds a list of command objects (or {"commands": [...]}) and is
+    re-read when it changes. Answers use the same version protocol as the
+    real backend: the full list, {"not_modified": true}, or a delta against
+    one of the recently served versions.
+    """
+
+    def __init__(self, path: str, history: int = 16):
+        self.path = Path(path)
+        self.history = history
+        self._versions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._mtime: Optional[float] = None
+        self._version: Optional[str] = None
+
+    def _load(self) -> str:
+        mtime = self.path.stat().st_mtime
+        if mtime != self._mtime or self._version is None:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            commands_list = raw.get("commands", []) if isinstance(raw, dict) else raw
+            by_name = {cmd["name"].lower(): cmd for cmd in commands_list if cmd.get("name")}
+            canonical = json.dumps(by_name, sort_keys=True, separators=(",", ":"))
+            self._version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+            self._versions[self._version] = by_name
+            self._versions.move_to_end(self._version)
+            while len(self._versions) > self.history:
+                self._versions.popitem(last=False)
+            self._mtime = mtime
+        return self._version
+
+    def get_bot_commands(self, known_version: Optional[str] = None) -> dict:
+        try:
+            version = self._load()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            return {"error": f"Local commands file unusable: {e}"}
+        current = self._versions[version]
+        if known_version == version:
+            return {"not_modified": True, "version": version}
+
+        base = self._versions.get(known_version) if known_version else None
+        if base is None:
+            return {"commands": list(current.values()), "version": version}
+        return {
+            "delta": True,
+            "base_version": known_version,
+            "version": version,
+            "added": [cmd for name, cmd in current.items() if name not in base],
+            "changed": [cmd for name, cmd in current.items() if name in base and base[name] != cmd],
+            "removed": [name for name in base if name not in current],
+        }
+
+
+class LinkStatusCache:
+    """
+    Bounded cache of "is this Discord user linked?" answers.
+
+    Linked and not-linked answers have separate TTLs, so a user who just
+    linked on the website is picked up quickly while linked users are not
+    re-checked on every command. Concurrent lookups for the same user share
+    one in-flight request.
+    """
+
+    def __init__(
+        self,
+        ttl: float = LINK_CACHE_TTL,
+        negative_ttl: float = LINK_CACHE_NEGATIVE_TTL,
+        max_size: int = LINK_CACHE_SIZE,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def peek(self, user_id: str) -> Optional[bool]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return entry[1]
+
+    def set(self, user_id: str, linked: bool):
+        ttl = self.ttl if linked else self.negative_ttl
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + ttl, linked)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        """Forget a user's status, including any lookup still in flight."""
+        user_id = str(user_id)
+        if self._entries.pop(user_id, None) is not None:
+            self.invalidations += 1
+        self._inflight.pop(user_id, None)
+
+    async def get(self, user_id: str, loader) -> Optional[bool]:
+        """
+        Return the cached status, or run `loader()` once for all concurrent callers.
+        `loader` returns True/False, or None if the status could not be determined.
+        """
+        linked = self.peek(user_id)
+        if linked is not None:
+            self.hits += 1
+            return linked
+
+        task = self._inflight.get(user_id)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(user_id, loader))
+            self._inflight[user_id] = task
+        # Shielded so one cancelled caller does not cancel the shared lookup
+        return await asyncio.shield(task)
+
+    async def _load(self, user_id: str, loader) -> Optional[bool]:
+        this_task = asyncio.current_task()
+        try:
+            linked = await loader()
+            # Skip the store if the user was invalidated while we were waiting
+            if linked is not None and self._inflight.get(user_id) is this_task:
+                self.set(user_id, linked)
+            return linked
+        finally:
+            if self._inflight.get(user_id) is this_task:
+                del self._inflight[user_id]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "ttl": self.ttl,
+            "negative_ttl": self.negative_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": ((self.hits + self.coalesced) / lookups) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "in_flight": len(self._inflight),
+        }
+
+
 class UserVaultAPI:
     """API client for UserVault minigame endpoints."""
-    
-    def __init__(self, webhook_secret: str):
+
+    def __init__(
+        self,
+        webhook_secret: str,
+        pool: Optional[HTTPSessionManager] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
         self.webhook_secret = webhook_secret
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.pool = pool or http_pool
         self.logger = request_logger
-    
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retry_counts: Dict[str, int] = {}
+        self.balance_cache = BalanceCache()
+        self.link_cache = LinkStatusCache()
+        self.local_commands = LocalCommandBackend(LOCAL_COMMANDS_FILE) if LOCAL_COMMANDS_FILE else None
+        self.local_games = game_engine if LOCAL_GAMES else None
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        return self.pool.session
+
     async def _get_session(self) -> aiohttp.ClientSession:
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
-        return self.session
-    
+        return await self.pool.get_session()
+
     async def close(self):
-        if self.session and not self.session.closed:
-            await self.session.close()
+        await self.pool.close()
+
+    def _request_timeout(self, endpoint: str) -> aiohttp.ClientTimeout:
+        """
+        Build the ClientTimeout for one request: the endpoint's own limits,
+        shrunk to whatever is left of the current command deadline.
+        """
+        connect, read, total = HTTP_TIMEOUTS.get(endpoint, (5.0, 15.0, 20.0))
+        remaining = command_time_remaining()
+        if remaining is not None:
+            if remaining <= 0:
+                raise CommandDeadlineExceeded(f"Command deadline exceeded before calling {endpoint}")
+            total = min(total, remaining)
+        return aiohttp.ClientTimeout(
+            total=total,
+            sock_connect=min(connect, total),
+            sock_read=min(read, total),
+        )
+
+    def _breaker(self, endpoint: str, url: str) -> CircuitBreaker:
+        breaker = self.breakers.get(url)
+        if breaker is None:
+            breaker = CircuitBreaker(endpoint)
+            self.breakers[url] = breaker
+        return breaker
+
+    async def _post_json(
+        self,
+        endpoint: str,
+        url: str,
+        *,
+        signed_payload: Optional[str] = None,
+        idempotent: bool = False,
+        **kwargs,
+    ) -> tuple[int, dict]:
+        """
+        POST to a UserVault endpoint through its circuit breaker.
+
+        - signed_payload: raw JSON body to send with a fresh HMAC signature
+          on every attempt
+        - idempotent: retry transient failures (timeouts, connection errors,
+          429/502/503/504) with jittered backoff, within the command deadline
+
+        Returns (status, json). Raises CircuitOpenError / APITimeoutError /
+        aiohttp.ClientError when no usable response was received.
+        """
+        breaker = self._breaker(endpoint, url)
+        max_attempts = self.retry_policy.max_attempts if idempotent else 1
+        attempt = 0
+
+        while True:
+            attempt += 1
+            breaker.before_request()
+
+            if signed_payload is not None:
+                signature, timestamp = self._generate_signature(signed_payload)
+                kwargs["data"] = signed_payload.encode("utf-8")
+                kwargs["headers"] = {
+                    "Content-Type": "application/json",
+                    "x-webhook-signature": signature,
+                    "x-webhook-timestamp": timestamp,
+                }
+
+            error: Optional[Exception] = None
+            status, result = 0, {}
+            try:
+                status, result = await self._post_once(endpoint, url, **kwargs)
+            except CommandDeadlineExceeded:
+                breaker.release_probe()
+                raise
+            except (APITimeoutError, aiohttp.ClientError) as e:
+                breaker.record_failure()
+                error = e
+            except BaseException:
+                breaker.release_probe()
+                raise
+            else:
+                if status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if status not in self.retry_policy.retry_statuses:
+                    return status, result
+
+            if attempt >= max_attempts:
+                if error is not None:
+                    raise error
+                return status, result
+
+            delay = self.retry_policy.backoff(attempt)
+            remaining = command_time_remaining()
+            if remaining is not None and delay >= remaining:
+                if error is not None:
+                    raise error
+                return status, result
+
+            self.retry_counts[endpoint] = self.retry_counts.get(endpoint, 0) + 1
+            await asyncio.sleep(delay)
+
+    async def _post_once(self, endpoint: str, url: str, **kwargs) -> tuple[int, dict]:
+        """
+        Single POST inside the endpoint's pool slot and timeout budget.
+        Returns (status, json). Raises APITimeoutError on any timeout.
+        """
+        timeout = self._request_timeout(endpoint)
+        session = await self._get_session()
+        try:
+            async with self.pool.slot(endpoint, timeout.total), session.post(
+                url, timeout=timeout, **kwargs
+            ) as response:
+                if response.status == 304:
+                    return response.status, {"not_modified": True}
+                try:
+                    result = await response.json(content_type=None)
+                except ValueError:
+                    # e.g. an HTML 502 page from the proxy
+                    result = None
+                if not isinstance(result, dict):
+                    result = {"error": f"HTTP {response.status}"} if response.status >= 400 else {"data": result}
+                return response.status, result
+        except asyncio.TimeoutError:
+            remaining = command_time_remaining()
+            if remaining is not None and remaining <= 0:
+                raise CommandDeadlineExceeded(f"{endpoint} timed out (command deadline exceeded)") from None
+            raise APITimeoutError(
+                f"{endpoint} timed out (connect {timeout.sock_connect:.3g}s / "
+                f"read {timeout.sock_read:.3g}s / total {timeout.total:.3g}s)"
+            ) from None
     
     def _generate_signature(self, payload_json: str) -> tuple[str, str]:
         """Generate HMAC signature for reward API calls.
@@ -226,103 +1615,98 @@ class UserVaultAPI:
         ).hexdigest()
         return signature, timestamp
     
-    async def game_api(self, action: str, **params) -> dict:
+    async def game_api(self, action: str, *, idempotent: bool = False, **params) -> dict:
         """Call the game API (no auth needed - just game logic)."""
-        session = await self._get_session()
         payload = {"action": action, **params}
         
         self.logger.request_start("minigame-data", action)
         start_time = time.time()
         
         try:
-            async with session.post(GAME_API, json=payload) as response:
-                duration_ms = (time.time() - start_time) * 1000
-                result = await response.json()
-                
-                if response.status == 200 and not result.get("error"):
-                    preview = json.dumps(result)[:100] if result else ""
-                    self.logger.request_success(action, duration_ms, preview)
-                else:
-                    self.logger.request_error(action, result.get("error", "Unknown error"), response.status)
-                
-                return result
+            status, result = await self._post_json("minigame-data", GAME_API, json=payload, idempotent=idempotent)
+            duration_ms = (time.time() - start_time) * 1000
+            
+            if status == 200 and not result.get("error"):
+                self.logger.request_success(action, duration_ms, result, endpoint="minigame-data", status_code=status)
+            else:
+                self.logger.request_error(action, result.get("error", "Unknown error"), status, duration_ms=duration_ms, endpoint="minigame-data")
+            
+            return result
         except Exception as e:
             duration_ms = (time.time() - start_time) * 1000
-            self.logger.request_error(action, str(e))
+            self.logger.request_error(action, str(e), duration_ms=duration_ms, endpoint="minigame-data")
             return {"error": str(e)}
     
-    async def reward_api(self, action: str, discord_user_id: str, **extra) -> dict:
+    async def reward_api(self, action: str, discord_user_id: str, *, idempotent: bool = False, **extra) -> dict:
         """Call the reward API (needs webhook secret)."""
-        session = await self._get_session()
+        if idempotent:
+            return await self._reward_api(action, discord_user_id, idempotent=True, **extra)
+        # Payouts and bet deductions run as supervised settlements: a cancelled
+        # caller cannot cut them off and shutdown waits for them (TaskSupervisor.drain)
+        return await task_supervisor.run(
+            "settlement",
+            self._reward_api(action, discord_user_id, idempotent=False, **extra),
+            name=f"settlement:{action}:{discord_user_id}",
+        )
+
+    async def _reward_api(self, action: str, discord_user_id: str, *, idempotent: bool, **extra) -> dict:
         payload = {"action": action, "discordUserId": discord_user_id, **extra}
         payload_json = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
-        signature, timestamp = self._generate_signature(payload_json)
-        
-        headers = {
-            "Content-Type": "application/json",
-            "x-webhook-signature": signature,
-            "x-webhook-timestamp": timestamp,
-        }
         
         self.logger.request_start("minigame-reward", action, discord_user_id)
         start_time = time.time()
         
         try:
-            async with session.post(
+            status, result = await self._post_json(
+                "minigame-reward",
                 REWARD_API,
-                data=payload_json.encode("utf-8"),
-                headers=headers,
-            ) as response:
-                duration_ms = (time.time() - start_time) * 1000
-                result = await response.json()
-                
-                if response.status == 200 and not result.get("error"):
-                    preview = json.dumps(result)[:100] if result else ""
-                    self.logger.request_success(action, duration_ms, preview)
-                else:
-                    self.logger.request_error(action, result.get("error", "Unknown error"), response.status)
-                
-                return result
+                signed_payload=payload_json,
+                idempotent=idempotent,
+            )
+            duration_ms = (time.time() - start_time) * 1000
+            
+            if status == 200 and not result.get("error"):
+                self.logger.request_success(action, duration_ms, result, endpoint="minigame-reward", status_code=status)
+            else:
+                self.logger.request_error(action, result.get("error", "Unknown error"), status, duration_ms=duration_ms, endpoint="minigame-reward")
+            
+            # Anything that is not a read may have moved the balance
+            if not idempotent:
+                self.balance_cache.apply_result(discord_user_id, result)
+            return result
         except Exception as e:
             duration_ms = (time.time() - start_time) * 1000
-            self.logger.request_error(action, str(e))
+            self.logger.request_error(action, str(e), duration_ms=duration_ms, endpoint="minigame-reward")
+            if not idempotent:
+                self.balance_cache.invalidate(discord_user_id)
             return {"error": str(e)}
     
-    async def bot_api(self, action: str, admin_id: str, **extra) -> dict:
+    async def bot_api(self, action: str, admin_id: str, *, idempotent: bool = False, **extra) -> dict:
         """Call the dedicated bot-api endpoint for admin/privileged commands."""
-        session = await self._get_session()
         payload = {"action": action, "adminId": admin_id, **extra}
         payload_json = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
-        signature, timestamp = self._generate_signature(payload_json)
-        
-        headers = {
-            "Content-Type": "application/json",
-            "x-webhook-signature": signature,
-            "x-webhook-timestamp": timestamp,
-        }
         
         self.logger.request_start("bot-api", action, admin_id)
         start_time = time.time()
         
         try:
-            async with session.post(
+            status, result = await self._post_json(
+                "bot-api",
                 BOT_API,
-                data=payload_json.encode("utf-8"),
-                headers=headers,
-            ) as response:
-                duration_ms = (time.time() - start_time) * 1000
-                result = await response.json()
-                
-                if response.status == 200 and not result.get("error"):
-                    preview = json.dumps(result)[:100] if result else ""
-                    self.logger.request_success(action, duration_ms, preview)
-                else:
-                    self.logger.request_error(action, result.get("error", "Unknown error"), response.status)
-                
-                return result
+                signed_payload=payload_json,
+                idempotent=idempotent,
+            )
+            duration_ms = (time.time() - start_time) * 1000
+            
+            if status in (200, 304) and not result.get("error"):
+                self.logger.request_success(action, duration_ms, result, endpoint="bot-api", status_code=status)
+            else:
+                self.logger.request_error(action, result.get("error", "Unknown error"), status, duration_ms=duration_ms, endpoint="bot-api")
+            
+            return result
         except Exception as e:
             duration_ms = (time.time() - start_time) * 1000
-            self.logger.request_error(action, str(e))
+            self.logger.request_error(action, str(e), duration_ms=duration_ms, endpoint="bot-api")
             return {"error": str(e)}
     
     # ============ GAME METHODS ============
@@ -364,48 +1748,88 @@ class UserVaultAPI:
         start = time.time()
         
         try:
-            session = await self._get_session()
-            async with session.post(
+            status, data = await self._post_json(
+                "bot-verify-code",
                 verify_url,
                 data=payload_json.encode("utf-8"),
                 headers=headers,
-            ) as resp:
-                duration_ms = (time.time() - start) * 1000
-                data = await resp.json()
-                
-                if resp.status == 200 and not data.get("error"):
-                    self.logger.request_success("verify", duration_ms, json.dumps(data)[:100])
-                else:
-                    self.logger.request_error("verify", data.get("error", "Unknown"), resp.status)
-                
-                return data
+            )
+            duration_ms = (time.time() - start) * 1000
+            
+            if status == 200 and not data.get("error"):
+                self.logger.request_success("verify", duration_ms, data, endpoint="bot-verify-code", status_code=status)
+            else:
+                self.logger.request_error("verify", data.get("error", "Unknown"), status, duration_ms=duration_ms, endpoint="bot-verify-code")
+            
+            self.link_cache.invalidate(discord_user_id)
+            return data
         except Exception as e:
-            self.logger.request_error("verify", str(e))
+            duration_ms = (time.time() - start) * 1000
+            self.logger.request_error("verify", str(e), duration_ms=duration_ms, endpoint="bot-verify-code")
+            self.link_cache.invalidate(discord_user_id)
             return {"error": str(e)}
     
     async def unlink_account(self, discord_user_id: str) -> dict:
         """Unlink Discord account from UserVault."""
-        return await self.reward_api("unlink_account", discord_user_id)
+        try:
+            return await self.reward_api("unlink_account", discord_user_id)
+        finally:
+            self.link_cache.invalidate(discord_user_id)
     
     async def get_profile(self, discord_user_id: str) -> dict:
         """Get UserVault profile for Discord user."""
-        return await self.reward_api("get_profile", discord_user_id)
+        result = await self.reward_api("get_profile", discord_user_id, idempotent=True)
+        linked = self._linked_from_profile(result)
+        if linked is not None:
+            self.link_cache.set(discord_user_id, linked)
+        return result
+
+    @staticmethod
+    def _linked_from_profile(result: dict) -> Optional[bool]:
+        """True/False from a get_profile response, None if it says neither."""
+        error = result.get("error")
+        if not error:
+            return True
+        if "not linked" in str(error).lower():
+            return False
+        return None
+
+    async def is_linked(self, discord_user_id: str) -> Optional[bool]:
+        """Whether the user has a linked UserVault account (None if unknown), via the link cache."""
+        async def load() -> Optional[bool]:
+            result = await self.reward_api("get_profile", discord_user_id, idempotent=True)
+            return self._linked_from_profile(result)
+
+        return await self.link_cache.get(discord_user_id, load)
     
     async def lookup_profile(self, username: str) -> dict:
         """Look up any UserVault profile by username or UID (public info only)."""
-        return await self.game_api("lookup_profile", username=username)
+        return await self.game_api("lookup_profile", idempotent=True, username=username)
 
     async def delete_account(self, discord_user_id: str) -> dict:
         """Delete a user's linked UserVault account data."""
-        return await self.reward_api("delete_account", discord_user_id)
+        try:
+            return await self.reward_api("delete_account", discord_user_id)
+        finally:
+            self.link_cache.invalidate(discord_user_id)
 
     async def check_admin(self, discord_user_id: str) -> dict:
         """Check if a Discord user is a UserVault admin."""
-        return await self.bot_api("check_admin", discord_user_id)
+        return await self.bot_api("check_admin", discord_user_id, idempotent=True)
 
-    async def get_bot_commands(self) -> dict:
-        """Get all enabled bot commands from database."""
-        return await self.bot_api("get_bot_commands", "")
+    async def get_bot_commands(self, known_version: Optional[str] = None) -> dict:
+        """
+        Get all enabled bot commands from database.
+
+        With known_version (the version/ETag of the registry we already have)
+        the backend may answer {"not_modified": true} or a delta with
+        "added"/"changed" commands and "removed" names instead of the full list.
+        """
+        if self.local_commands is not None:
+            return self.local_commands.get_bot_commands(known_version)
+        if known_version:
+            return await self.bot_api("get_bot_commands", "", idempotent=True, knownVersion=known_version)
+        return await self.bot_api("get_bot_commands", "", idempotent=True)
     
     async def get_trivia(self) -> dict:
         """Get a trivia question."""
@@ -415,16 +1839,22 @@ class UserVaultAPI:
         """Check trivia answer."""
         return await self.game_api("check_trivia", question=question, answer=answer)
     
-    async def spin_slots(self) -> dict:
+    async def spin_slots(self, discord_user_id: str = "") -> dict:
         """Spin the slot machine."""
+        if self.local_games is not None:
+            return self.local_games.spin_slots(discord_user_id)
         return await self.game_api("spin_slots")
     
-    async def flip_coin(self) -> dict:
+    async def flip_coin(self, discord_user_id: str = "") -> dict:
         """Flip a coin."""
+        if self.local_games is not None:
+            return self.local_games.coin_flip(discord_user_id)
         return await self.game_api("coin_flip")
     
-    async def play_rps(self, choice: str) -> dict:
+    async def play_rps(self, choice: str, discord_user_id: str = "") -> dict:
         """Play rock paper scissors."""
+        if self.local_games is not None:
+            return self.local_games.play_rps(choice, discord_user_id)
         return await self.game_api("play_rps", choice=choice)
     
     async def generate_number(self) -> dict:
@@ -471,9 +1901,21 @@ class UserVaultAPI:
             description=description
         )
     
-    async def get_balance(self, discord_user_id: str) -> dict:
-        """Get a user's balance."""
-        return await self.reward_api("get_balance", discord_user_id)
+    async def get_balance(self, discord_user_id: str, fresh: bool = False) -> dict:
+        """
+        Get a user's balance.
+
+        Served from the balance cache when possible; use fresh=True where the
+        exact current value is shown to the user.
+        """
+        if not fresh:
+            cached = self.balance_cache.get(discord_user_id)
+            if cached is not None:
+                return cached
+        result = await self.reward_api("get_balance", discord_user_id, idempotent=True)
+        if not result.get("error"):
+            self.balance_cache.set(discord_user_id, result)
+        return result
     
     async def claim_daily(self, discord_user_id: str) -> dict:
         """Claim daily reward."""
@@ -487,116 +1929,483 @@ class UserVaultAPI:
     
     async def get_pending_notifications(self) -> dict:
         """Get pending command notifications from queue."""
-        session = await self._get_session()
         payload = {"action": "get_pending"}
         payload_json = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
-        signature, timestamp = self._generate_signature(payload_json)
-        
-        headers = {
-            "Content-Type": "application/json",
-            "x-webhook-signature": signature,
-            "x-webhook-timestamp": timestamp,
-        }
         
         try:
-            async with session.post(
+            status, result = await self._post_json(
+                "bot-command-notifications",
                 NOTIFICATIONS_API,
-                data=payload_json.encode("utf-8"),
-                headers=headers,
-            ) as response:
-                return await response.json()
+                signed_payload=payload_json,
+            )
+            return result
         except Exception as e:
             return {"error": str(e)}
     
     async def mark_notification_processed(self, notification_id: str) -> dict:
         """Mark a notification as processed."""
-        session = await self._get_session()
         payload = {"action": "mark_processed", "notificationId": notification_id}
         payload_json = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
-        signature, timestamp = self._generate_signature(payload_json)
-        
-        headers = {
-            "Content-Type": "application/json",
-            "x-webhook-signature": signature,
-            "x-webhook-timestamp": timestamp,
-        }
         
         try:
-            async with session.post(
+            status, result = await self._post_json(
+                "bot-command-notifications",
                 NOTIFICATIONS_API,
-                data=payload_json.encode("utf-8"),
-                headers=headers,
-            ) as response:
-                return await response.json()
+                signed_payload=payload_json,
+            )
+            return result
         except Exception as e:
             return {"error": str(e)}
 
 
+class AuthorizationService:
+    """
+    Single place that decides who may run privileged commands.
+
+    Each kind of command keeps its own rule (they are deliberately not merged):
+    - may_run_admin_command: HARDCODED_ADMIN_IDS or UserVault admin/supporter
+      (dynamic admin commands from the registry)
+    - may_manage_bot: ADMIN_USER_IDS, the application owner or UserVault
+      admin/supporter (?reload, ?restart)
+    - is_uservault_admin: UserVault admin only (?users)
+
+    Local ID checks never need an API call. UserVault admin/supporter roles
+    come from check_admin and are cached per user for `ttl` seconds;
+    concurrent checks for the same user share one request. Failed checks are
+    not cached.
+    """
+
+    def __init__(self, client: commands.Bot, ttl: float = AUTH_CACHE_TTL):
+        self.client = client
+        self.ttl = ttl
+        self.hardcoded_admin_ids = HARDCODED_ADMIN_IDS
+        self.operator_ids = ADMIN_USER_IDS
+        self._roles: Dict[int, tuple] = {}
+        self._inflight: Dict[int, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _owner_id(self) -> Optional[int]:
+        app_info = getattr(self.client, "application", None)
+        owner = getattr(app_info, "owner", None) if app_info else None
+        return getattr(owner, "id", None)
+
+    def is_operator(self, user_id: int) -> bool:
+        """ADMIN_USER_IDS or the application owner (no API call)."""
+        return user_id in self.operator_ids or user_id == self._owner_id()
+
+    async def roles(self, user_id: int) -> Dict[str, bool]:
+        """UserVault roles of a user: {"is_admin": bool, "is_supporter": bool}."""
+        entry = self._roles.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        task = self._inflight.get(user_id)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fetch_roles(user_id))
+            self._inflight[user_id] = task
+        return await asyncio.shield(task)
+
+    async def _fetch_roles(self, user_id: int) -> Dict[str, bool]:
+        this_task = asyncio.current_task()
+        try:
+            api = getattr(self.client, "api", None)
+            if api is None:
+                return {"is_admin": False, "is_supporter": False}
+            result = await api.check_admin(str(user_id))
+            roles = {"is_admin": bool(result.get("is_admin")), "is_supporter": bool(result.get("is_supporter"))}
+            log.debug("🔍 Admin check for %s: %s", user_id, result)
+            if not result.get("error") and self._inflight.get(user_id) is this_task:
+                self._roles[user_id] = (time.monotonic() + self.ttl, roles)
+            return roles
+        except Exception as e:
+            log.warning("⚠️ Could not check UserVault admin status for %s: %s", user_id, e)
+            return {"is_admin": False, "is_supporter": False}
+        finally:
+            if self._inflight.get(user_id) is this_task:
+                del self._inflight[user_id]
+
+    async def is_uservault_admin(self, user_id: int) -> bool:
+        """UserVault admin role only."""
+        return (await self.roles(user_id))["is_admin"]
+
+    async def is_uservault_staff(self, user_id: int) -> bool:
+        """UserVault admin or supporter role."""
+        roles = await self.roles(user_id)
+        return roles["is_admin"] or roles["is_supporter"]
+
+    async def may_run_admin_command(self, user_id: int) -> bool:
+        """Dynamic admin commands: HARDCODED_ADMIN_IDS or UserVault admin/supporter."""
+        if user_id in self.hardcoded_admin_ids:
+            return True
+        return await self.is_uservault_staff(user_id)
+
+    async def may_manage_bot(self, user_id: int) -> bool:
+        """?reload/?restart: ADMIN_USER_IDS, the owner or UserVault admin/supporter."""
+        if self.is_operator(user_id):
+            return True
+        return await self.is_uservault_staff(user_id)
+
+    def invalidate(self, user_id: Optional[int] = None):
+        """Forget cached roles for one user, or for everyone."""
+        if user_id is None:
+            self._roles.clear()
+            self._inflight.clear()
+        else:
+            self._roles.pop(user_id, None)
+            self._inflight.pop(user_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hardcoded_admins": len(self.hardcoded_admin_ids),
+            "operators": len(self.operator_ids),
+            "cached_users": len(self._roles),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
 def _ensure_uservault_client_state(client: commands.Bot):
     """Ensure the running discord.py client has the attributes our commands rely on."""
     if not hasattr(client, "api"):
         client.api = UserVaultAPI(WEBHOOK_SECRET)
     if not hasattr(client, "active_guess_games"):
         client.active_guess_games = {}
+    # Re-created after a reload so it always uses this module's admin lists
+    if not isinstance(getattr(client, "uservault_auth", None), AuthorizationService):
+        client.uservault_auth = AuthorizationService(client)
+    if not isinstance(getattr(client, "uservault_messages", None), MessagePipeline):
+        client.uservault_messages = MessagePipeline(client)
     return client
 
 
-async def fetch_commands_from_api(api: UserVaultAPI, force: bool = False) -> Dict[str, Any]:
+class CommandRegistry:
+    """
+    Immutable, versioned snapshot of the database-defined bot commands.
+
+    Built once per sync with every index the hot paths need, then swapped in
+    as a whole (set_command_registry), so readers never see a half-built
+    registry and lookups are single dict hits on pre-lowercased keys.
+    """
+
+    # Commands that always need admin rights, whatever their category
+    ADMIN_COMMAND_NAMES = frozenset({
+        "setbal", "addbal", "removebal", "ban", "unban", "kick", "mute", "unmute", "warn", "clearwarns",
+    })
+
+    __slots__ = (
+        "commands", "version", "fetched_at", "generation",
+        "by_name", "lookup", "by_category", "enabled", "enabled_by_category", "admin_names",
+    )
+
+    def __init__(
+        self,
+        commands_list: Any = (),
+        version: Optional[str] = None,
+        fetched_at: float = 0.0,
+        generation: int = 0,
+    ):
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for cmd in commands_list:
+            name = str(cmd.get("name") or "").lower()
+            if name:
+                by_name[name] = cmd
+
+        lookup = dict(by_name)
+        categories: Dict[str, List[Dict[str, Any]]] = {}
+        enabled_categories: Dict[str, List[Dict[str, Any]]] = {}
+        enabled: List[Dict[str, Any]] = []
+        admin_names = set()
+        for name, cmd in by_name.items():
+            for alias in cmd.get("aliases") or ():
+                lookup.setdefault(str(alias).lower(), cmd)
+            category = cmd.get("category") or "other"
+            categories.setdefault(category, []).append(cmd)
+            if cmd.get("is_enabled", True):
+                enabled.append(cmd)
+                enabled_categories.setdefault(category, []).append(cmd)
+            if category == "admin" or name in self.ADMIN_COMMAND_NAMES:
+                admin_names.add(name)
+
+        self._init_fields(
+            commands=tuple(by_name.values()),
+            version=version,
+            fetched_at=fetched_at,
+            generation=generation,
+            by_name=MappingProxyType(by_name),
+            lookup=MappingProxyType(lookup),
+            by_category=MappingProxyType({c: tuple(cmds) for c, cmds in categories.items()}),
+            enabled=tuple(enabled),
+            enabled_by_category=MappingProxyType({c: tuple(cmds) for c, cmds in enabled_categories.items()}),
+            admin_names=frozenset(admin_names),
+        )
+
+    def _init_fields(self, **fields):
+        for key, value in fields.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("CommandRegistry is immutable; build a new one instead")
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    @property
+    def loaded(self) -> bool:
+        """False until a sync or snapshot has populated the registry."""
+        return self.fetched_at > 0
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.fetched_at
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Command by lowercase name or alias."""
+        return self.lookup.get(key)
+
+    def is_admin_command(self, key: str) -> bool:
+        """Admin flag by lowercase name or alias (aliases resolve to the canonical command)."""
+        cmd = self.lookup.get(key)
+        if cmd is None:
+            return False
+        return str(cmd.get("name") or key).lower() in self.admin_names
+
+    def refreshed(self, fetched_at: float) -> "CommandRegistry":
+        """Same commands and indexes, confirmed unchanged at `fetched_at`."""
+        clone = object.__new__(CommandRegistry)
+        clone._init_fields(**{slot: getattr(self, slot) for slot in self.__slots__})
+        clone._init_fields(fetched_at=fetched_at)
+        return clone
+
+    def with_delta(self, delta: Dict[str, Any], version: Optional[str], fetched_at: float, generation: int) -> "CommandRegistry":
+        """New registry with a delta's removed/added/changed commands applied."""
+        updated = dict(self.by_name)
+        for name in delta.get("removed") or []:
+            updated.pop(str(name).lower(), None)
+        for cmd in (delta.get("added") or []) + (delta.get("changed") or []):
+            name = str(cmd.get("name") or "").lower()
+            if name:
+                updated[name] = cmd
+        return CommandRegistry(updated.values(), version, fetched_at, generation)
+
+
+_COMMAND_REGISTRY = CommandRegistry()
+
+
+def get_command_registry() -> CommandRegistry:
+    """The current command registry. Hold on to the returned object for a consistent view."""
+    return _COMMAND_REGISTRY
+
+
+def set_command_registry(registry: CommandRegistry):
+    """Atomically replace the current command registry."""
+    global _COMMAND_REGISTRY
+    _COMMAND_REGISTRY = registry
+
+
+async def fetch_commands_from_api(api: UserVaultAPI, force: bool = False) -> CommandRegistry:
     """
     Fetch all commands from the API and cache them.
     
     This is the CENTRAL function for loading commands dynamically.
     Commands are cached for _COMMANDS_CACHE_TTL seconds to avoid excessive API calls.
+    After that the cached commands are still returned immediately while a
+    background refresh runs (stale-while-revalidate), up to _COMMANDS_HARD_TTL.
     Use force=True to bypass the cache (e.g., after ?refresh).
     """
-    global _CACHED_BOT_COMMANDS, _COMMANDS_LAST_FETCHED
-    
-    now = time.time()
-    
-    # Return cached commands if still valid
-    if not force and _CACHED_BOT_COMMANDS and (now - _COMMANDS_LAST_FETCHED) < _COMMANDS_CACHE_TTL:
-        return _CACHED_BOT_COMMANDS
+    registry = _COMMAND_REGISTRY
+    if not force and _commands_refresh_backing_off():
+        # The last refresh failed: serve what we have (stale or empty) for now
+        _COMMANDS_REFRESH_STATS["backoff_skipped"] += 1
+        return registry
+    if not force and registry.loaded:
+        age = registry.age()
+        if age < _COMMANDS_CACHE_TTL:
+            return registry
+        if age < _COMMANDS_HARD_TTL:
+            _COMMANDS_REFRESH_STATS["stale_served"] += 1
+            schedule_commands_refresh(api)
+            return registry
+
+    # Empty, hard-expired or forced: wait for the (shared) refresh
+    return await asyncio.shield(_commands_refresh_task(api))
+
+
+def schedule_commands_refresh(api: UserVaultAPI, force: bool = False):
+    """Start a background refresh if the cache is stale (or force) and none is running."""
+    if _COMMANDS_REFRESH_TASK is not None and not _COMMANDS_REFRESH_TASK.done():
+        return
+    if not force and _COMMAND_REGISTRY.loaded and _COMMAND_REGISTRY.age() < _COMMANDS_CACHE_TTL:
+        return
+    if not force and _commands_refresh_backing_off():
+        _COMMANDS_REFRESH_STATS["backoff_skipped"] += 1
+        return
+    _COMMANDS_REFRESH_STATS["background_refreshes"] += 1
+    _commands_refresh_task(api)
+
+
+def _commands_refresh_backing_off() -> bool:
+    return time.monotonic() < _COMMANDS_REFRESH_STATS["backoff_until"]
+
+
+def _record_commands_refresh_failure(error: Any):
+    """Count a failed refresh and push the next attempt out (exponential backoff)."""
+    stats = _COMMANDS_REFRESH_STATS
+    stats["failures"] += 1
+    stats["last_error"] = str(error)
+    stats["consecutive_failures"] += 1
+    delay = min(COMMANDS_REFRESH_BACKOFF * 2 ** (stats["consecutive_failures"] - 1), COMMANDS_REFRESH_BACKOFF_MAX)
+    stats["backoff_until"] = time.monotonic() + delay
+
+
+def _record_commands_refresh_success():
+    stats = _COMMANDS_REFRESH_STATS
+    stats["last_error"] = None
+    stats["consecutive_failures"] = 0
+    stats["backoff_until"] = 0.0
+
+
+def _commands_refresh_task(api: UserVaultAPI) -> asyncio.Task:
+    """Return the in-flight refresh task, starting one if needed."""
+    global _COMMANDS_REFRESH_TASK
+    if _COMMANDS_REFRESH_TASK is not None and not _COMMANDS_REFRESH_TASK.done():
+        _COMMANDS_REFRESH_STATS["coalesced"] += 1
+        return _COMMANDS_REFRESH_TASK
+    _COMMANDS_REFRESH_TASK = asyncio.ensure_future(_refresh_commands(api))
+    return _COMMANDS_REFRESH_TASK
+
+
+async def _refresh_commands(api: UserVaultAPI) -> CommandRegistry:
+    """Fetch the command list once and swap a new registry in."""
+    # Shared by every waiter, so it must not inherit one caller's command deadline
+    clear_command_deadline()
+    stats = _COMMANDS_REFRESH_STATS
+    started = time.perf_counter()
+    stats["refreshes"] += 1
+    current = _COMMAND_REGISTRY
     
     try:
-        result = await api.get_bot_commands()
+        known_version = current.version if current.loaded else None
+        result = await api.get_bot_commands(known_version)
         if result.get("error"):
             print(f"⚠️ [UserVault] Error fetching commands from API: {result.get('error')}")
-            # Return cached commands on error
-            return _CACHED_BOT_COMMANDS or {"commands": []}
-        
-        commands_list = result.get("commands", [])
+            _record_commands_refresh_failure(result.get("error"))
+            # Keep serving the current registry on error
+            return current
         
-        # Build a dict keyed by command name for fast lookup
-        commands_by_name: Dict[str, Any] = {}
-        for cmd in commands_list:
-            name = cmd.get("name", "").lower()
-            if name:
-                commands_by_name[name] = cmd
+        now = time.time()
+        version = result.get("version") or result.get("etag")
+        generation = current.generation + 1
+
+        if result.get("not_modified") and current.loaded:
+            # Nothing changed: keep the indexes, just restart the TTL
+            stats["not_modified"] += 1
+            _record_commands_refresh_success()
+            registry = current.refreshed(now)
+            set_command_registry(registry)
+            return registry
+
+        if result.get("delta") and current.loaded and result.get("base_version", known_version) == known_version:
+            registry = current.with_delta(result, version, now, generation)
+            stats["delta_syncs"] += 1
+        elif "commands" in result:
+            registry = CommandRegistry(result.get("commands", []), version, now, generation)
+            stats["full_syncs"] += 1
+        else:
+            # A delta/not-modified answer we cannot apply: start over with a full fetch
+            result = await api.get_bot_commands()
+            if result.get("error") or "commands" not in result:
+                _record_commands_refresh_failure(result.get("error") or "unexpected get_bot_commands response")
+                return current
+            version = result.get("version") or result.get("etag")
+            registry = CommandRegistry(result["commands"], version, now, generation)
+            stats["full_syncs"] += 1
         
-        _CACHED_BOT_COMMANDS = {
-            "commands": commands_list,
-            "by_name": commands_by_name,
-            "fetched_at": now,
-        }
-        _COMMANDS_LAST_FETCHED = now
+        set_command_registry(registry)
+        _record_commands_refresh_success()
         
-        print(f"✅ [UserVault] Loaded {len(commands_list)} commands from API")
-        return _CACHED_BOT_COMMANDS
+        print(f"✅ [UserVault] Loaded {len(registry)} commands from API")
+        await asyncio.to_thread(write_commands_snapshot, registry)
+        return registry
         
     except Exception as e:
         print(f"❌ [UserVault] Failed to fetch commands from API: {e}")
-        return _CACHED_BOT_COMMANDS or {"commands": []}
+        _record_commands_refresh_failure(e)
+        return current
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        stats["last_duration_ms"] = duration_ms
+        stats["max_duration_ms"] = max(stats["max_duration_ms"], duration_ms)
+
+
+def _commands_checksum(commands_list: List[Dict[str, Any]]) -> str:
+    canonical = json.dumps(commands_list, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def write_commands_snapshot(registry: CommandRegistry, path: str = COMMANDS_SNAPSHOT_FILE) -> bool:
+    """Atomically write the command list, its version and a checksum to disk."""
+    commands_list = list(registry.commands)
+    snapshot = {
+        "format": 1,
+        "version": registry.version,
+        "fetched_at": registry.fetched_at,
+        "checksum": _commands_checksum(commands_list),
+        "commands": commands_list,
+    }
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ [UserVault] Could not write command snapshot {path}: {e}")
+        return False
+    _COMMANDS_REFRESH_STATS["snapshot_writes"] += 1
+    return True
+
+
+def load_commands_snapshot(path: str = COMMANDS_SNAPSHOT_FILE) -> bool:
+    """
+    Load the on-disk command snapshot into the registry (synchronously, at import).
+    A missing, unreadable or checksum-mismatched file is ignored.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        commands_list = snapshot["commands"]
+        if snapshot.get("format") != 1 or snapshot.get("checksum") != _commands_checksum(commands_list):
+            raise ValueError("checksum mismatch")
+        fetched_at = float(snapshot.get("fetched_at") or 0)
+        registry = CommandRegistry(commands_list, snapshot.get("version"), fetched_at, _COMMAND_REGISTRY.generation + 1)
+    except FileNotFoundError:
+        _COMMANDS_REFRESH_STATS["snapshot"] = "missing"
+        return False
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        print(f"⚠️ [UserVault] Ignoring command snapshot {path}: {e}")
+        _COMMANDS_REFRESH_STATS["snapshot"] = "invalid"
+        return False
+
+    set_command_registry(registry)
+    _COMMANDS_REFRESH_STATS["snapshot"] = "loaded"
+    print(f"💾 [UserVault] Loaded {len(registry)} commands from snapshot ({int(registry.age())}s old)")
+    return True
 
 
 def get_cached_commands() -> List[Dict[str, Any]]:
     """Get the cached command list (synchronous access)."""
-    return _CACHED_BOT_COMMANDS.get("commands", [])
+    return list(_COMMAND_REGISTRY.commands)
 
 
 def get_command_by_name(name: str) -> Optional[Dict[str, Any]]:
-    """Get a specific command by name from cache."""
-    by_name = _CACHED_BOT_COMMANDS.get("by_name", {})
-    return by_name.get(name.lower())
+    """Get a specific command by name or alias from cache."""
+    return _COMMAND_REGISTRY.get(name.lower())
 
 
 def is_command_registered(name: str) -> bool:
@@ -604,11 +2413,496 @@ def is_command_registered(name: str) -> bool:
     return get_command_by_name(name) is not None
 
 
+load_commands_snapshot()
+
+
+# ============ METRICS & HEALTH SERVER ============
+
+# Game views currently alive; finished views are filtered out on read.
+_active_game_views: "weakref.WeakSet[discord.ui.View]" = weakref.WeakSet()
+
+
+def track_game_view(view: discord.ui.View):
+    """Register a game view so it shows up in the active game session metrics."""
+    _active_game_views.add(view)
+
+
+def active_game_sessions(client: Optional[commands.Bot] = None) -> Dict[str, int]:
+    """Number of running game sessions by game name."""
+    sessions: Dict[str, int] = {}
+    for view in list(_active_game_views):
+        if view.is_finished():
+            continue
+        game = type(view).__name__.replace("View", "").lower()
+        sessions[game] = sessions.get(game, 0) + 1
+    guess_games = len(getattr(client, "active_guess_games", None) or {})
+    if guess_games:
+        sessions["guess"] = guess_games
+    return sessions
+
+
+class EventLoopLagMonitor:
+    """Measures how late the event loop wakes up a sleeping task."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - expected)
+            self.max_lag = max(self.max_lag, self.lag)
+            self.samples += 1
+
+
+def _prom_labels(**labels) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class MetricsServer:
+    """
+    Small aiohttp.web server running inside the bot's own event loop.
+
+    - /healthz: liveness (event loop responsive, client not closed)
+    - /readyz: readiness (gateway connected, command registry loaded)
+    - /metrics: Prometheus text exposition format
+    """
+
+    # Histogram bucket bounds for request latencies, in milliseconds
+    LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+    def __init__(self, client: commands.Bot, host: str = METRICS_HOST, port: int = METRICS_PORT):
+        self.client = client
+        self.host = host
+        self.port = port
+        self.loop_monitor = EventLoopLagMonitor()
+        self.started_at = time.time()
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/healthz", self.handle_healthz)
+        app.router.add_get("/readyz", self.handle_readyz)
+        app.router.add_get("/metrics", self.handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.loop_monitor.start()
+        log.info("📈 Metrics server listening on http://%s:%d/metrics", self.host, self.port)
+
+    async def stop(self):
+        self.loop_monitor.stop()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle_healthz(self, request: web.Request) -> web.Response:
+        problems = []
+        if self.client.is_closed():
+            problems.append("client closed")
+        if self.loop_monitor.lag > HEALTH_MAX_LOOP_LAG:
+            problems.append(f"event loop lag {self.loop_monitor.lag:.2f}s")
+        return web.json_response(
+            {"status": "fail" if problems else "ok", "problems": problems, "version": BOT_CODE_VERSION},
+            status=503 if problems else 200,
+        )
+
+    async def handle_readyz(self, request: web.Request) -> web.Response:
+        problems = []
+        if not self.client.is_ready():
+            problems.append("gateway not ready")
+        if not get_command_registry().loaded:
+            problems.append("command registry not loaded")
+        if not getattr(self.client, "_uservault_prefix_cog_loaded", False):
+            problems.append("prefix cog not loaded")
+        return web.json_response(
+            {"status": "fail" if problems else "ok", "problems": problems},
+            status=503 if problems else 200,
+        )
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.render(), content_type="text/plain", charset="utf-8")
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text format (version 0.0.4)."""
+        lines: List[str] = []
+        now = time.time()
+
+        def metric(name: str, kind: str, help_text: str, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{_prom_labels(**labels)} {value}")
+
+        metric("uservault_build_info", "gauge", "Bot code version.", [("", {"version": BOT_CODE_VERSION}, 1)])
+        metric("uservault_uptime_seconds", "gauge", "Seconds since the metrics server started.",
+               [("", {}, round(now - self.started_at, 3))])
+
+        # API requests
+        metric("uservault_api_requests_total", "counter", "UserVault API requests started.",
+               [("", {}, request_logger.request_count)])
+        metric("uservault_api_request_results_total", "counter", "UserVault API requests by result.", [
+            ("", {"result": "success"}, request_logger.success_count),
+            ("", {"result": "error"}, request_logger.error_count),
+        ])
+        metric("uservault_api_responses_total", "counter", "UserVault API responses by endpoint and status.", [
+            ("", {"endpoint": endpoint, "status": status}, count)
+            for endpoint, hist in sorted(request_logger.endpoint_latency.items())
+            for status, count in sorted(hist.total_statuses.items())
+        ])
+        metric("uservault_api_request_duration_seconds", "histogram",
+               "UserVault API request latency by endpoint.",
+               self._histogram_samples(request_logger.endpoint_latency, "endpoint"))
+        metric("uservault_api_action_duration_seconds", "histogram",
+               "UserVault API request latency by endpoint and action.",
+               self._histogram_samples(request_logger.action_latency, "endpoint", "action"))
+        metric("uservault_prefix_route_duration_seconds", "histogram",
+               "Prefix command handler time by route.",
+               self._histogram_samples(prefix_route_latency, "route"))
+        tasks = task_supervisor.stats()["kinds"]
+        metric("uservault_tasks_running", "gauge", "Supervised background tasks running by kind.", [
+            ("", {"kind": kind}, k["running"]) for kind, k in tasks.items()
+        ])
+        metric("uservault_tasks_total", "counter", "Supervised background tasks finished by kind and result.", [
+            ("", {"kind": kind, "result": result}, k[result])
+            for kind, k in tasks.items()
+            for result in ("completed", "failed", "cancelled")
+        ])
+        crash = crash_ticker.stats()
+        metric("uservault_crash_games_running", "gauge", "Crash games on the shared tick scheduler.",
+               [("", {}, crash["games"])])
+        metric("uservault_crash_frames_total", "counter", "Crash redraws by outcome.", [
+            ("", {"result": "sent"}, crash["frames"]),
+            ("", {"result": "coalesced"}, crash["coalesced"]),
+            ("", {"result": "skipped"}, crash["skipped"]),
+            ("", {"result": "throttled"}, crash["throttled"]),
+            ("", {"result": "failed"}, crash["edit_failures"]),
+        ])
+        messages = getattr(self.client, "uservault_messages", None)
+        if messages is not None:
+            metric("uservault_messages_total", "counter", "Incoming messages by pipeline outcome.", [
+                ("", {"result": "processed"}, messages.processed),
+                ("", {"result": "skipped"}, messages.skipped),
+                ("", {"result": "duplicate"}, messages.duplicates),
+            ])
+
+        # Connection pool and circuit breakers
+        pool = http_pool.stats()
+        metric("uservault_http_connections_total", "counter", "Pooled HTTP connections by outcome.", [
+            ("", {"kind": "created"}, pool["connections_created"]),
+            ("", {"kind": "reused"}, pool["connections_reused"]),
+        ])
+        metric("uservault_http_in_flight", "gauge", "In-flight API requests by endpoint.", [
+            ("", {"endpoint": name}, ep["in_flight"]) for name, ep in sorted(pool["endpoints"].items())
+        ])
+        api = getattr(self.client, "api", None)
+        breakers = getattr(api, "breakers", {}) or {}
+        metric("uservault_circuit_open", "gauge", "1 if the endpoint circuit breaker is not closed.", [
+            ("", {"endpoint": b.name}, int(b.state != CircuitBreaker.CLOSED)) for b in breakers.values()
+        ])
+
+        balance_cache = getattr(api, "balance_cache", None)
+        if balance_cache is not None:
+            bc = balance_cache.stats()
+            metric("uservault_balance_cache_lookups_total", "counter", "Balance cache lookups by result.", [
+                ("", {"result": "hit"}, bc["hits"]),
+                ("", {"result": "miss"}, bc["misses"]),
+            ])
+            metric("uservault_balance_cache_entries", "gauge", "Users in the balance cache.", [("", {}, bc["size"])])
+            metric("uservault_balance_cache_evictions_total", "counter", "Balance cache LRU evictions.",
+                   [("", {}, bc["evictions"])])
+        link_cache = getattr(api, "link_cache", None)
+        if link_cache is not None:
+            lc = link_cache.stats()
+            metric("uservault_link_cache_lookups_total", "counter", "Link status cache lookups by result.", [
+                ("", {"result": "hit"}, lc["hits"]),
+                ("", {"result": "coalesced"}, lc["coalesced"]),
+                ("", {"result": "miss"}, lc["misses"]),
+            ])
+
+        # Command registry
+        registry = get_command_registry()
+        metric("uservault_command_registry_generation", "gauge", "Registry swaps since startup.",
+               [("", {}, registry.generation)])
+        metric("uservault_command_cache_size", "gauge", "Commands in the cached registry.",
+               [("", {}, len(registry))])
+        metric("uservault_command_cache_age_seconds", "gauge", "Seconds since the registry was fetched.",
+               [("", {}, round(registry.age(now), 3))] if registry.loaded else [])
+        refresh = _COMMANDS_REFRESH_STATS
+        metric("uservault_command_refreshes_total", "counter", "Command registry refreshes by result.", [
+            ("", {"result": "success"}, refresh["refreshes"] - refresh["failures"]),
+            ("", {"result": "failure"}, refresh["failures"]),
+        ])
+        metric("uservault_command_refresh_duration_seconds", "gauge", "Duration of the last registry refresh.",
+               [("", {}, round(refresh["last_duration_ms"] / 1000, 6))])
+        metric("uservault_command_syncs_total", "counter", "Successful registry syncs by kind.", [
+            ("", {"kind": "full"}, refresh["full_syncs"]),
+            ("", {"kind": "delta"}, refresh["delta_syncs"]),
+            ("", {"kind": "not_modified"}, refresh["not_modified"]),
+        ])
+        metric("uservault_command_cache_stale_served_total", "counter",
+               "Lookups answered from a stale registry while it was being refreshed.",
+               [("", {}, refresh["stale_served"])])
+
+        # Games
+        sessions = active_game_sessions(self.client)
+        metric("uservault_active_game_sessions", "gauge", "Running game sessions by game.",
+               [("", {"game": game}, count) for game, count in sorted(sessions.items())])
+
+        # Background loops
+        last_poll = getattr(self.client, "_uservault_last_notification_poll", None)
+        metric("uservault_notification_poll_lag_seconds", "gauge",
+               "Seconds since the last successful notification poll.",
+               [("", {}, round(now - last_poll, 3))] if last_poll else [])
+        metric("uservault_event_loop_lag_seconds", "gauge", "Latest measured event-loop scheduling delay.",
+               [("", {}, round(self.loop_monitor.lag, 6))])
+        metric("uservault_event_loop_lag_max_seconds", "gauge", "Highest event-loop scheduling delay seen.",
+               [("", {}, round(self.loop_monitor.max_lag, 6))])
+        latency = getattr(self.client, "latency", None)
+        if latency is not None and math.isfinite(latency):
+            metric("uservault_gateway_latency_seconds", "gauge", "Discord gateway heartbeat latency.",
+                   [("", {}, round(latency, 6))])
+
+        return "\n".join(lines) + "\n"
+
+    def _histogram_samples(self, histograms: Dict[str, RollingLatencyHistogram], *label_names: str):
+        for key, hist in sorted(histograms.items()):
+            labels = dict(zip(label_names, key.split(":", len(label_names) - 1)))
+            counts = hist.cumulative_buckets(self.LATENCY_BUCKETS_MS)
+            for bound, count in zip(self.LATENCY_BUCKETS_MS, counts):
+                yield "_bucket", {**labels, "le": f"{bound / 1000:g}"}, count
+            yield "_bucket", {**labels, "le": "+Inf"}, hist.total_count
+            yield "_sum", labels, round(hist.total_sum_ms / 1000, 6)
+            yield "_count", labels, hist.total_count
+
+
+async def start_metrics_server(client: commands.Bot) -> Optional[MetricsServer]:
+    """Start (or restart after a reload) the metrics server if METRICS_PORT is set."""
+    old = getattr(client, "_uservault_metrics_server", None)
+    if old is not None:
+        await old.stop()
+        client._uservault_metrics_server = None
+    if not METRICS_PORT:
+        return None
+    server = MetricsServer(client)
+    try:
+        await server.start()
+    except OSError as e:
+        log.warning("⚠️ Could not start metrics server on %s:%d: %s", METRICS_HOST, METRICS_PORT, e)
+        await server.stop()
+        return None
+    client._uservault_metrics_server = server
+    return server
+
+
+async def stop_metrics_server(client: commands.Bot):
+    server = getattr(client, "_uservault_metrics_server", None)
+    if server is not None:
+        await server.stop()
+        client._uservault_metrics_server = None
+
+
+# ============ HELP PAGES ============
+
+HELP_COMMANDS_PER_PAGE = 15
+_HELP_CATEGORY_EMOJIS = {
+    "games": "🎮",
+    "utility": "🔧",
+    "admin": "👮",
+    "other": "📦",
+}
+
+
+class HelpPages:
+    """
+    Help output for one registry generation, rendered once and then served
+    from memory: paginated embeds, a plain-text fallback for channels without
+    embed permission, and per-command detail embeds (built on first use).
+    """
+
+    def __init__(self, registry: CommandRegistry):
+        self.generation = registry.generation
+        self.registry = registry
+        self.pages: List[discord.Embed] = []
+        self.text_chunks: List[str] = []
+        self._details: Dict[str, discord.Embed] = {}
+        self._render()
+
+    def _render(self):
+        registry = self.registry
+        categories = sorted(registry.enabled_by_category.items())
+
+        overview = discord.Embed(
+            title="📋 UserVault Bot Commands",
+            description=(
+                f"**{len(registry.enabled)}** commands in {len(categories)} categories.\n"
+                f"Use `?helping <command>` for details on a specific command.\n\n"
+                + "\n".join(
+                    f"{_HELP_CATEGORY_EMOJIS.get(cat, '📦')} **{cat.capitalize()}** – {len(cmds)}"
+                    for cat, cmds in categories
+                )
+            ),
+            color=discord.Color.blurple(),
+        )
+        pages = [overview]
+        text_lines = ["**📋 UserVault Bot Commands**\n"]
+
+        for cat, cmds in categories:
+            emoji = _HELP_CATEGORY_EMOJIS.get(cat, "📦")
+            lines = []
+            for c in cmds:
+                usage = c.get("usage") or f"?{c.get('name', '???')}"
+                desc = c.get("description") or ""
+                lines.append(f"`{usage}` – {desc[:80]}")
+            chunks = [lines[i:i + HELP_COMMANDS_PER_PAGE] for i in range(0, len(lines), HELP_COMMANDS_PER_PAGE)]
+            for n, chunk in enumerate(chunks, start=1):
+                title = f"{emoji} {cat.capitalize()}" + (f" ({n}/{len(chunks)})" if len(chunks) > 1 else "")
+                pages.append(discord.Embed(title=title, description="\n".join(chunk)[:4000], color=discord.Color.blurple()))
+
+            text_lines.append(f"**{cat.capitalize()}:**")
+            text_lines.extend(f"  {c.get('usage') or '?' + c.get('name', '???')}" for c in cmds)
+
+        for i, page in enumerate(pages, start=1):
+            page.set_footer(text=f"Page {i}/{len(pages)} • UserVault Bot • v:{BOT_CODE_VERSION}")
+        self.pages = pages
+
+        # Discord messages are limited to 2000 characters
+        chunk = ""
+        for line in text_lines:
+            if len(chunk) + len(line) + 1 > 1900:
+                self.text_chunks.append(chunk)
+                chunk = ""
+            chunk += line + "\n"
+        if chunk:
+            self.text_chunks.append(chunk)
+
+    def command_embed(self, key: str) -> Optional[discord.Embed]:
+        """Detail embed for one command (lowercase name or alias)."""
+        cmd = self.registry.get(key)
+        if cmd is None:
+            return None
+        name = str(cmd.get("name", "unknown")).lower()
+        embed = self._details.get(name)
+        if embed is None:
+            usage = cmd.get("usage", f"?{cmd.get('name', 'unknown')}")
+            embed = discord.Embed(
+                title=f"📖 Command: {usage}",
+                description=cmd.get("description") or "No description available.",
+                color=discord.Color.blurple(),
+            )
+            embed.add_field(name="Category", value=cmd.get("category") or "other", inline=True)
+            embed.add_field(name="Enabled", value="✅ Yes" if cmd.get("is_enabled", True) else "❌ No", inline=True)
+            if cmd.get("aliases"):
+                embed.add_field(name="Aliases", value=", ".join(f"`{a}`" for a in cmd["aliases"]), inline=True)
+            embed.set_footer(text=f"UserVault Bot • v:{BOT_CODE_VERSION}")
+            self._details[name] = embed
+        return embed
+
+
+_HELP_PAGES_CACHE: "OrderedDict[int, HelpPages]" = OrderedDict()
+
+
+def get_help_pages(registry: Optional[CommandRegistry] = None) -> HelpPages:
+    """Help pages for a registry, rendered at most once per registry generation."""
+    registry = registry or get_command_registry()
+    pages = _HELP_PAGES_CACHE.get(registry.generation)
+    if pages is None:
+        pages = _HELP_PAGES_CACHE[registry.generation] = HelpPages(registry)
+        # Keep the current and the previous generation (a view may still page through it)
+        while len(_HELP_PAGES_CACHE) > 2:
+            _HELP_PAGES_CACHE.popitem(last=False)
+    return pages
+
+
+class HelpView(discord.ui.View):
+    """Button pagination over pre-rendered help pages."""
+
+    def __init__(self, pages: HelpPages, user_id: int):
+        super().__init__(timeout=180)
+        self.help_pages = pages
+        self.user_id = user_id
+        self.index = 0
+        self.message: Optional[discord.Message] = None
+        self._sync_buttons()
+
+    def _sync_buttons(self):
+        last = len(self.help_pages.pages) - 1
+        self.previous_page.disabled = self.index <= 0
+        self.next_page.disabled = self.index >= last
+        self.page_label.label = f"{self.index + 1}/{last + 1}"
+
+    async def _show(self, interaction: discord.Interaction, index: int):
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("Use `?help` to open your own help menu!", ephemeral=True)
+            return
+        self.index = max(0, min(index, len(self.help_pages.pages) - 1))
+        self._sync_buttons()
+        await interaction.response.edit_message(embed=self.help_pages.pages[self.index], view=self)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.index - 1)
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.secondary, disabled=True)
+    async def page_label(self, interaction: discord.Interaction, button: discord.ui.Button):
+        pass
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.index + 1)
+
+    async def on_timeout(self):
+        if self.message is None:
+            return
+        try:
+            await self.message.edit(view=None)
+        except discord.HTTPException:
+            pass
+
+
+async def send_help(destination, user_id: int, registry: CommandRegistry):
+    """Send the paginated help menu (or the text fallback) to a message or context."""
+    pages = get_help_pages(registry)
+    send = destination.reply if isinstance(destination, discord.Message) else destination.send
+    try:
+        if len(pages.pages) > 1:
+            view = HelpView(pages, user_id)
+            view.message = await send(embed=pages.pages[0], view=view)
+        else:
+            await send(embed=pages.pages[0])
+    except discord.Forbidden:
+        # No embed permission: plain text
+        for chunk in pages.text_chunks:
+            await send(chunk)
+
+
 class TriviaView(discord.ui.View):
     """View for trivia answers."""
     
     def __init__(self, bot: "UserVaultBot", trivia_data: dict, user_id: int):
         super().__init__(timeout=60)
+        track_game_view(self)
         self.bot = bot
         self.trivia_data = trivia_data
         self.user_id = user_id
@@ -652,6 +2946,7 @@ class BlackjackView(discord.ui.View):
     
     def __init__(self, bot: "UserVaultBot", game_data: dict, user_id: int):
         super().__init__(timeout=120)
+        track_game_view(self)
         self.bot = bot
         self.game_data = game_data
         self.user_id = user_id
@@ -714,92 +3009,139 @@ class BlackjackView(discord.ui.View):
         self.stop()
 
 
+class MinesBoard:
+    """
+    Minesweeper board state as two bitmasks (bit i = cell i, row-major).
+
+    mines: cells that hold a mine
+    revealed: cells the player has uncovered (including a hit mine)
+
+    Serializes to a few bytes (cell count + both masks) via to_bytes() so a
+    running board can be persisted and restored with from_bytes().
+    """
+    __slots__ = ("cells", "mines", "revealed")
+
+    def __init__(self, mines: int, revealed: int = 0, cells: int = MINES_CELLS):
+        self.cells = cells
+        self.mines = mines
+        self.revealed = revealed
+
+    @classmethod
+    def generate(cls, mine_count: int, cells: int = MINES_CELLS) -> "MinesBoard":
+        mask = 0
+        for index in random.sample(range(cells), mine_count):
+            mask |= 1 << index
+        return cls(mask, 0, cells)
+
+    @property
+    def mine_count(self) -> int:
+        return self.mines.bit_count()
+
+    @property
+    def safe_revealed(self) -> int:
+        return (self.revealed & ~self.mines).bit_count()
+
+    @property
+    def safe_total(self) -> int:
+        return self.cells - self.mine_count
+
+    @property
+    def exploded(self) -> bool:
+        return bool(self.revealed & self.mines)
+
+    def is_mine(self, index: int) -> bool:
+        return bool(self.mines >> index & 1)
+
+    def is_revealed(self, index: int) -> bool:
+        return bool(self.revealed >> index & 1)
+
+    def reveal(self, index: int) -> bool:
+        """Uncover a cell; returns True if it was a mine."""
+        self.revealed |= 1 << index
+        return self.is_mine(index)
+
+    def to_bytes(self) -> bytes:
+        width = (self.cells + 7) // 8
+        return bytes((self.cells,)) + self.mines.to_bytes(width, "little") + self.revealed.to_bytes(width, "little")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MinesBoard":
+        cells = data[0]
+        width = (cells + 7) // 8
+        if len(data) != 1 + 2 * width:
+            raise ValueError(f"Invalid mines board data ({len(data)} bytes for {cells} cells)")
+        mines = int.from_bytes(data[1:1 + width], "little")
+        revealed = int.from_bytes(data[1 + width:], "little")
+        return cls(mines, revealed, cells)
+
+
 class MinesButton(discord.ui.Button):
-    """Single cell button for Minesweeper."""
+    """Single cell button for Minesweeper. Cell state lives in the view's MinesBoard."""
     
-    def __init__(self, x: int, y: int, is_mine: bool, view: "MinesView"):
+    def __init__(self, index: int, view: "MinesView"):
         super().__init__(
             style=discord.ButtonStyle.secondary,
             label="•",
-            row=y
+            row=index // MINES_GRID_COLUMNS
         )
-        self.x = x
-        self.y = y
-        self.is_mine = is_mine
+        self.index = index
         self.mines_view = view
-        self.revealed = False
     
     async def callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.mines_view.user_id:
+        view = self.mines_view
+        if interaction.user.id != view.user_id:
             await interaction.response.send_message("❌ Das ist nicht dein Spiel!", ephemeral=True)
             return
         
         # Prevent double-click race conditions
-        if self.mines_view.game_over or self.mines_view.processing:
+        if view.game_over or view.processing:
             await interaction.response.defer()
             return
         
-        if self.revealed:
+        if view.board.is_revealed(self.index):
             await interaction.response.send_message("❌ Dieses Feld ist bereits aufgedeckt!", ephemeral=True)
             return
         
         # Set processing lock
-        self.mines_view.processing = True
+        view.processing = True
         
-        self.revealed = True
-        self.disabled = True
+        if view.board.reveal(self.index):
+            # BOOM! Game over - reveal all mines
+            view.game_over = True
+            view.won = False
+            view.render(show_mines=discord.ButtonStyle.danger)
+            
+            embed = view.create_embed(game_over=True, won=False)
+            await interaction.response.edit_message(embed=embed, view=view)
+            view.stop()
+            return
         
-        if self.is_mine:
-            # BOOM! Game over
-            self.style = discord.ButtonStyle.danger
-            self.label = "💣"
-            self.mines_view.game_over = True
-            self.mines_view.won = False
-            
-            # Reveal all mines
-            for item in self.mines_view.children:
-                if isinstance(item, MinesButton):
-                    item.disabled = True
-                    if item.is_mine:
-                        item.style = discord.ButtonStyle.danger
-                        item.label = "💣"
-            
-            embed = self.mines_view.create_embed(game_over=True, won=False)
-            await interaction.response.edit_message(embed=embed, view=self.mines_view)
-            self.mines_view.stop()
+        # Safe! Increase multiplier
+        view.update_multiplier()
+        
+        # Check if all safe cells revealed
+        if view.revealed_count >= view.board.safe_total:
+            view.game_over = True
+            view.won = True
+            view.render()
+            embed = view.create_embed(game_over=True, won=True)
+            await interaction.response.edit_message(embed=embed, view=view)
+            
+            # Award winnings
+            winnings = int(view.bet * view.multiplier)
+            await view.bot.api.send_reward(
+                str(interaction.user.id),
+                winnings,
+                "mines",
+                f"Minesweeper win x{view.multiplier:.2f}"
+            )
+            view.stop()
         else:
-            # Safe! Increase multiplier
-            self.style = discord.ButtonStyle.success
-            self.label = "✓"
-            self.mines_view.revealed_count += 1
-            self.mines_view.update_multiplier()
-            
-            # Check if all safe cells revealed
-            total_safe = 25 - self.mines_view.mine_count
-            if self.mines_view.revealed_count >= total_safe:
-                self.mines_view.game_over = True
-                self.mines_view.won = True
-                # Disable all buttons
-                for item in self.mines_view.children:
-                    if isinstance(item, MinesButton):
-                        item.disabled = True
-                embed = self.mines_view.create_embed(game_over=True, won=True)
-                await interaction.response.edit_message(embed=embed, view=self.mines_view)
-                
-                # Award winnings
-                winnings = int(self.mines_view.bet * self.mines_view.multiplier)
-                await self.mines_view.bot.api.send_reward(
-                    str(interaction.user.id),
-                    winnings,
-                    "mines",
-                    f"Minesweeper win x{self.mines_view.multiplier:.2f}"
-                )
-                self.mines_view.stop()
-            else:
-                embed = self.mines_view.create_embed()
-                await interaction.response.edit_message(embed=embed, view=self.mines_view)
-                # Release lock for next click
-                self.mines_view.processing = False
+            view.render()
+            embed = view.create_embed()
+            await interaction.response.edit_message(embed=embed, view=view)
+            # Release lock for next click
+            view.processing = False
 
 
 class MinesCashoutButton(discord.ui.Button):
@@ -835,12 +3177,7 @@ class MinesCashoutButton(discord.ui.Button):
         self.mines_view.cashed_out = True
         
         # Reveal all mines and disable
-        for item in self.mines_view.children:
-            if isinstance(item, MinesButton):
-                item.disabled = True
-                if item.is_mine and not item.revealed:
-                    item.label = "💣"
-                    item.style = discord.ButtonStyle.secondary
+        self.mines_view.render(show_mines=discord.ButtonStyle.secondary)
         
         # Calculate winnings
         winnings = int(self.mines_view.bet * self.mines_view.multiplier)
@@ -859,55 +3196,67 @@ class MinesCashoutButton(discord.ui.Button):
 
 
 class MinesView(discord.ui.View):
-    """View for Minesweeper game with 5x5 grid."""
+    """View for Minesweeper game with a 5x4 grid (the 5th row holds the cashout button)."""
     
-    def __init__(self, bot, user_id: int, bet: int, mine_count: int = 5):
+    def __init__(self, bot, user_id: int, bet: int, mine_count: int = 5, board: Optional[MinesBoard] = None):
         super().__init__(timeout=300)  # 5 minute timeout
+        track_game_view(self)
         self.bot = bot
         self.user_id = user_id
         self.bet = bet
-        self.mine_count = mine_count
-        self.revealed_count = 0
+        self.board = board or MinesBoard.generate(mine_count)
+        self.mine_count = self.board.mine_count
         self.multiplier = 1.0
         self.game_over = False
         self.won = False
         self.cashed_out = False
         self.processing = False  # Lock to prevent double-click race conditions
         
-        # Generate mine positions (5x5 grid = 25 cells)
-        all_positions = [(x, y) for x in range(5) for y in range(4)]  # Only 4 rows for buttons (row 4 = cashout)
-        self.mine_positions = set(random.sample(all_positions, mine_count))
-        
-        # Create grid buttons (4 rows of 5)
-        for y in range(4):
-            for x in range(5):
-                is_mine = (x, y) in self.mine_positions
-                btn = MinesButton(x, y, is_mine, self)
-                self.add_item(btn)
+        # Create grid buttons (4 rows of 5), indexed like the board bits
+        self.cells = [MinesButton(index, self) for index in range(self.board.cells)]
+        for btn in self.cells:
+            self.add_item(btn)
         
         # Add cashout button
         self.add_item(MinesCashoutButton(self))
-    
-    def update_multiplier(self):
-        """Calculate multiplier based on revealed safe cells."""
-        safe_cells = 20 - self.mine_count  # 20 grid cells (4 rows * 5 cols)
-        revealed = self.revealed_count
-        
-        if revealed == 0:
-            self.multiplier = 1.0
-            return
         
-        # Progressive multiplier formula
-        # Each reveal increases risk, so multiplier grows exponentially
-        base_multi = 1.0
-        for i in range(revealed):
-            remaining_safe = safe_cells - i
-            remaining_total = 20 - i
-            if remaining_total > 0 and remaining_safe > 0:
-                risk_factor = remaining_total / remaining_safe
-                base_multi *= risk_factor
+        if self.board.revealed:
+            self.update_multiplier()
+            self.render()
+    
+    @property
+    def revealed_count(self) -> int:
+        return self.board.safe_revealed
+    
+    def render(self, show_mines: Optional[discord.ButtonStyle] = None):
+        """
+        Derive every cell button from the board masks in one pass.
         
-        self.multiplier = round(base_multi, 2)
+        show_mines: style for uncovered mines (game over); None keeps them hidden.
+        Once the game is over all cells are disabled.
+        """
+        mines = self.board.mines
+        revealed = self.board.revealed
+        game_over = self.game_over
+        for index, btn in enumerate(self.cells):
+            bit = 1 << index
+            if revealed & bit:
+                btn.disabled = True
+                if mines & bit:
+                    btn.style = discord.ButtonStyle.danger
+                    btn.label = "💣"
+                else:
+                    btn.style = discord.ButtonStyle.success
+                    btn.label = "✓"
+            else:
+                btn.disabled = game_over
+                if show_mines is not None and mines & bit:
+                    btn.style = show_mines
+                    btn.label = "💣"
+    
+    def update_multiplier(self):
+        """Look up the multiplier for the revealed safe cells (precomputed per mine count)."""
+        self.multiplier = mines_multiplier(self.revealed_count, self.mine_count, MINES_CELLS, PAYOUT_HOUSE_EDGE)
     
     def create_embed(self, game_over: bool = False, won: bool = False, cashed_out: bool = False) -> discord.Embed:
         """Create the game embed."""
@@ -932,7 +3281,7 @@ class MinesView(discord.ui.View):
             description = (
                 f"**Einsatz:** {self.bet} UC\n"
                 f"**Minen:** {self.mine_count}\n"
-                f"**Aufgedeckt:** {self.revealed_count}/15\n"
+                f"**Aufgedeckt:** {self.revealed_count}/{MINES_CELLS - self.mine_count}\n"
                 f"**Multiplikator:** x{self.multiplier:.2f}\n"
                 f"**Potenzieller Gewinn:** {potential} UC"
             )
@@ -1090,6 +3439,7 @@ class HigherLowerView(discord.ui.View):
     
     def __init__(self, bot, user_id: int, bet: int):
         super().__init__(timeout=300)  # 5 minute timeout
+        track_game_view(self)
         self.bot = bot
         self.user_id = user_id
         self.bet = bet
@@ -1107,9 +3457,8 @@ class HigherLowerView(discord.ui.View):
         self.add_item(HigherLowerCashoutButton(self))
     
     def update_multiplier(self):
-        """Calculate multiplier based on streak."""
-        # Each correct guess multiplies by ~1.5
-        self.multiplier = round(1.0 + (self.streak * 0.5), 2)
+        """Look up the multiplier for the current streak."""
+        self.multiplier = higherlower_multiplier(self.streak, PAYOUT_HOUSE_EDGE)
     
     def create_embed(self, reveal_card: str = None) -> discord.Embed:
         """Create the game embed."""
@@ -1154,6 +3503,72 @@ class HigherLowerView(discord.ui.View):
 
 # ============ CRASH GAME ============
 
+# Game logic cadence: the multiplier grows once per tick
+CRASH_TICK_SECONDS = 0.8
+# Allowed auto-cashout targets for `?crash <bet> <target>x`
+CRASH_MIN_TARGET = 1.01
+CRASH_MAX_TARGET = 100.0
+
+
+def generate_crash_point() -> float:
+    """Generate crash point using provably fair algorithm.
+    
+    Uses exponential distribution - most crashes happen early,
+    but occasionally goes very high.
+    """
+    # Formula (see payouts.crash_point_for): 0.99 / (1 - r), capped at 100x
+    return crash_point_for(random.random())
+
+
+def parse_crash_target(text: str) -> float:
+    """Parse an auto-cashout target like "2x", "x2.5" or "3"; ValueError if invalid."""
+    target = round(float(text.strip().lower().strip("x")), 2)
+    if not CRASH_MIN_TARGET <= target <= CRASH_MAX_TARGET:
+        raise ValueError(f"target must be between x{CRASH_MIN_TARGET:.2f} and x{CRASH_MAX_TARGET:.0f}")
+    return target
+
+
+class CrashTrajectory:
+    """
+    Precomputed multiplier curve of one Crash round.
+
+    The curve only depends on the crash point, so every tick's multiplier and
+    the crash moment are known when the round starts; the multiplier at any
+    elapsed time is a single index lookup.
+    """
+
+    __slots__ = ("crash_point", "tick", "multipliers", "crash_tick")
+
+    def __init__(self, crash_point: float, tick: float = CRASH_TICK_SECONDS):
+        self.crash_point = crash_point
+        self.tick = tick
+        # Shared accelerating curve (payouts.crash_curve) up to the crash point
+        shown = crash_ticks_before(crash_point)
+        self.multipliers = crash_curve(max(crash_point, CRASH_MAX_TARGET))[:shown] + (crash_point,)
+        self.crash_tick = shown
+
+    @property
+    def crash_after(self) -> float:
+        """Seconds from the start of the round to the crash."""
+        return self.crash_tick * self.tick
+
+    def multiplier_at(self, elapsed: float) -> float:
+        if elapsed <= 0:
+            return self.multipliers[0]
+        return self.multipliers[min(int(elapsed / self.tick), self.crash_tick)]
+
+    def cashout_tick(self, target: float) -> Optional[int]:
+        """
+        Tick at which an auto-cashout at `target` fires, or None if the round
+        crashes first. An auto-cashout wins whenever crash_point > target; it
+        fires at the first tick showing `target` or more, at the latest at the
+        crash tick (the curve can skip past the target between two frames).
+        """
+        if not self.crash_point > target:
+            return None
+        return bisect.bisect_left(self.multipliers, target, 1, self.crash_tick)
+
+
 class CrashButton(discord.ui.Button):
     """Button to cash out in Crash game."""
     
@@ -1169,12 +3584,19 @@ class CrashButton(discord.ui.Button):
         if self.crash_view.game_over or self.crash_view.cashed_out:
             await interaction.response.defer()
             return
+
+        # Resolved by timestamp: a click after the crash moment is a loss,
+        # even if the crash has not been drawn yet
+        now = time.monotonic()
+        if self.crash_view.resolve(now):
+            await interaction.response.edit_message(embed=self.crash_view.create_embed(game_over=True), view=self.crash_view)
+            return
         
         # Cash out!
+        self.crash_view.cashout_multiplier = self.crash_view.multiplier_at(now)
         self.crash_view.cashed_out = True
         self.crash_view.game_over = True
         self.crash_view.won = True
-        self.crash_view.cashout_multiplier = self.crash_view.current_multiplier
         
         # Disable button
         self.disabled = True
@@ -1191,7 +3613,7 @@ class CrashButton(discord.ui.Button):
             "crash",
             f"Crash cashout x{self.crash_view.cashout_multiplier:.2f}"
         )
-        self.crash_view.stop()
+        self.crash_view.finish()
 
 
 class CrashView(discord.ui.View):
@@ -1199,91 +3621,81 @@ class CrashView(discord.ui.View):
     
     def __init__(self, bot, user_id: int, bet: int, message=None):
         super().__init__(timeout=60)  # 1 minute max game time
+        track_game_view(self)
         self.bot = bot
         self.user_id = user_id
         self.bet = bet
         self.message = message
-        self.current_multiplier = 1.00
         self.crash_point = self._generate_crash_point()
+        self.trajectory: Optional[CrashTrajectory] = None
         self.game_over = False
         self.won = False
         self.cashed_out = False
         self.cashout_multiplier = 1.00
-        self.tick_count = 0
+        self.started_at = 0.0
+        self.crash_at = 0.0
+        self.finished = asyncio.Event()
         
         self.add_item(CrashButton(self))
     
     def _generate_crash_point(self) -> float:
-        """Generate crash point using provably fair algorithm.
-        
-        Uses exponential distribution - most crashes happen early,
-        but occasionally goes very high.
-        """
-        # Random float 0-1, with crash formula
-        r = random.random()
-        # Minimum crash at 1.00x, exponential growth
-        # Formula: 0.99 / (1 - r) gives nice distribution
-        # Cap at 100x max
-        if r >= 0.99:
-            return 100.0
-        crash = 0.99 / (1 - r)
-        return min(round(crash, 2), 100.0)
+        return generate_crash_point()
     
     async def start_game(self, channel):
         """Start the crash game animation."""
+        # The game outlives the ?crash command that spawned it, so it must not
+        # inherit (and later trip over) that command's deadline.
+        clear_command_deadline()
         embed = self.create_embed()
         self.message = await channel.send(embed=embed, view=self)
         
         # Deduct bet immediately
-        await self.bot.api.send_reward(
-            str(self.user_id),
-            -self.bet,
-            "crash",
-            "Crash game bet"
-        )
-        
-        # Start multiplier climbing
-        await self.run_game()
-    
-    async def run_game(self):
-        """Run the game loop - multiplier increases until crash or cashout."""
-        while not self.game_over:
-            await asyncio.sleep(0.8)  # Tick every 0.8 seconds
-            
-            if self.game_over or self.cashed_out:
-                break
-            
-            # Increase multiplier
-            self.tick_count += 1
-            # Accelerating growth
-            growth = 0.05 + (self.tick_count * 0.02)
-            self.current_multiplier += growth
-            self.current_multiplier = round(self.current_multiplier, 2)
-            
-            # Check if crashed
-            if self.current_multiplier >= self.crash_point:
-                self.game_over = True
-                self.won = False
-                self.current_multiplier = self.crash_point
-                
-                # Disable button
-                for item in self.children:
-                    item.disabled = True
-                
-                embed = self.create_embed(game_over=True)
-                try:
-                    await self.message.edit(embed=embed, view=self)
-                except:
-                    pass
-                self.stop()
-                return
-            
-            # Update display
-            embed = self.create_embed()
-            try:
-                await self.message.edit(embed=embed, view=self)
-            except:
-                pass
+        await self.bot.api.send_reward(
+            str(self.user_id),
+            -self.bet,
+            "crash",
+            "Crash game bet"
+        )
+        
+        # Start multiplier climbing: the whole curve is known now, the scheduler
+        # only has to wake up for the crash moment and for display frames
+        self.trajectory = CrashTrajectory(self.crash_point)
+        self.started_at = time.monotonic()
+        self.crash_at = self.started_at + self.trajectory.crash_after
+        crash_ticker.add(self)
+        await self.finished.wait()
+
+    def multiplier_at(self, now: float) -> float:
+        if self.trajectory is None:
+            return 1.00
+        return self.trajectory.multiplier_at(now - self.started_at)
+
+    @property
+    def frame_ticks(self) -> int:
+        """Tick boundaries worth redrawing before the round ends."""
+        return self.trajectory.crash_tick
+
+    @property
+    def current_multiplier(self) -> float:
+        if self.cashed_out:
+            return self.cashout_multiplier
+        if self.game_over:
+            return self.crash_point
+        return self.multiplier_at(time.monotonic())
+
+    def resolve(self, now: float) -> bool:
+        """Crash the round if `now` is past its crash moment. True once the game is over."""
+        if not self.game_over and self.trajectory is not None and now >= self.crash_at:
+            self.game_over = True
+            self.won = False
+            for item in self.children:
+                item.disabled = True
+            self.finish()
+        return self.game_over
+
+    def finish(self):
+        self.stop()
+        self.finished.set()
     
     def create_embed(self, game_over: bool = False) -> discord.Embed:
         """Create the game embed."""
@@ -1306,20 +3718,21 @@ class CrashView(discord.ui.View):
                 color = discord.Color.red()
         else:
             title = "🚀 CRASH"
+            multiplier = self.current_multiplier
             # Create visual multiplier bar
-            bar_length = min(int(self.current_multiplier * 2), 20)
+            bar_length = min(int(multiplier * 2), 20)
             bar = "█" * bar_length + "░" * (20 - bar_length)
             
-            potential = int(self.bet * self.current_multiplier)
+            potential = int(self.bet * multiplier)
             description = (
                 f"```\n{bar}\n```\n"
-                f"# x{self.current_multiplier:.2f}\n\n"
+                f"# x{multiplier:.2f}\n\n"
                 f"**Einsatz:** {self.bet} UC\n"
                 f"**Potenzieller Gewinn:** {potential} UC\n\n"
                 f"⚠️ Cash out bevor es crasht!"
             )
-            color = discord.Color.green() if self.current_multiplier < 2 else discord.Color.orange()
-            if self.current_multiplier >= 5:
+            color = discord.Color.green() if multiplier < 2 else discord.Color.orange()
+            if multiplier >= 5:
                 color = discord.Color.red()
         
         embed = discord.Embed(title=title, description=description, color=color)
@@ -1327,6 +3740,702 @@ class CrashView(discord.ui.View):
         return embed
 
 
+# ============ CRASH TICK SCHEDULER ============
+
+# An edit slower than this means Discord is queueing us behind a rate limit
+CRASH_SLOW_EDIT_SECONDS = 1.0
+
+
+class ChannelEditBudget:
+    """Token bucket for message edits in one channel; the rate backs off on throttling (AIMD)."""
+
+    __slots__ = ("max_rate", "rate", "tokens", "updated")
+
+    def __init__(self, max_rate: float = CRASH_EDITS_PER_SECOND):
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> bool:
+        # Up to two frames of burst absorb timer jitter
+        self.tokens = min(2.0, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+    def on_throttled(self, retry_after: float = 0.0):
+        self.rate = max(CRASH_MIN_EDITS_PER_SECOND, self.rate / 2)
+        # No frames for this channel until Discord would accept one again
+        self.tokens = min(self.tokens, -retry_after * self.rate)
+
+
+class CrashTicker:
+    """
+    Resolves every running Crash game from one timer.
+
+    Each round's trajectory is precomputed, so the scheduler keeps a heap of
+    due events - the crash moment of every game plus optional display frames
+    at tick boundaries - and sleeps until the next one. A cash-out is
+    resolved by timestamp and always pays the exact multiplier of that moment.
+    Redraws are cosmetic: at most one edit per message is in flight (newer
+    frames replace queued ones) and each channel has an edit budget that
+    shrinks when Discord throttles and grows back afterwards. Final "crashed"
+    frames skip the budget.
+    """
+
+    def __init__(self, edits_per_second: float = CRASH_EDITS_PER_SECOND):
+        self.edits_per_second = edits_per_second
+        self.games: set = set()
+        self.budgets: Dict[int, ChannelEditBudget] = {}
+        self._events: List[tuple] = []
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._in_flight: set = set()
+        self._pending: Dict[int, Any] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.wakeups = 0
+        self.frames = 0
+        self.coalesced = 0
+        self.skipped = 0
+        self.throttled = 0
+        self.edit_failures = 0
+
+    def _push(self, due: float, kind: str, view: "CrashView", tick: int = 0):
+        self._seq += 1
+        heapq.heappush(self._events, (due, self._seq, kind, view, tick))
+        if self._events[0][1] == self._seq:
+            self._wakeup.set()
+
+    def add(self, view: "CrashView"):
+        self.games.add(view)
+        self._push(view.crash_at, "crash", view)
+        self._push_frame(view, 1)
+        if self._task is None or self._task.done():
+            # Own kind without a limit: every game waits on the ticker while holding a
+            # "game" slot, so the ticker must never queue behind TASK_KIND_LIMITS["game"]
+            self._task = task_supervisor.spawn("scheduler", self._run(), name="crash-ticker", unique=True)
+
+    def _push_frame(self, view: "CrashView", tick: int):
+        """Schedule a redraw at tick boundary `tick` (the multiplier only changes there)."""
+        if view.message is not None and tick < view.frame_ticks:
+            self._push(view.started_at + tick * view.trajectory.tick, "frame", view, tick)
+
+    async def _run(self):
+        events = self._events
+        while events:
+            delay = events[0][0] - time.monotonic()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.wakeups += 1
+            now = time.monotonic()
+            while events and events[0][0] <= now:
+                _, _, kind, view, tick = heapq.heappop(events)
+                if view.game_over:
+                    self.games.discard(view)
+                    continue
+                if kind == "crash":
+                    view.resolve(now)
+                    self.games.discard(view)
+                    self.request_frame(view, final=True)
+                else:
+                    self.request_frame(view)
+                    self._push_frame(view, tick + 1)
+        self.budgets.clear()
+
+    def _budget(self, channel_id: int) -> ChannelEditBudget:
+        budget = self.budgets.get(channel_id)
+        if budget is None:
+            budget = self.budgets[channel_id] = ChannelEditBudget(self.edits_per_second)
+        return budget
+
+    def request_frame(self, view: "CrashView", final: bool = False):
+        """Redraw `view` if its channel has budget left (always for a final frame)."""
+        message = view.message
+        if message is None:
+            return
+        if message.id in self._in_flight:
+            # Newest state wins; it is drawn as soon as the running edit returns
+            _, was_final = self._pending.get(message.id, (view, False))
+            self._pending[message.id] = (view, final or was_final)
+            self.coalesced += 1
+            return
+        if not final and not self._budget(message.channel.id).take(time.monotonic()):
+            self.skipped += 1
+            return
+        self._in_flight.add(message.id)
+        task_supervisor.spawn("frame", self._edit(view), name=f"crash-frame:{message.id}", drain=False)
+
+    async def _edit(self, view: "CrashView"):
+        message = view.message
+        budget = self._budget(message.channel.id)
+        try:
+            while True:
+                started = time.monotonic()
+                was_over = view.game_over
+                try:
+                    components = view if isinstance(view, discord.ui.View) else None
+                    await message.edit(embed=view.create_embed(game_over=view.game_over), view=components)
+                    self.frames += 1
+                    if time.monotonic() - started > CRASH_SLOW_EDIT_SECONDS:
+                        self.throttled += 1
+                        budget.on_throttled()
+                    else:
+                        budget.on_success()
+                except discord.HTTPException as e:
+                    if e.status == 429:
+                        self.throttled += 1
+                        budget.on_throttled(float(getattr(e, "retry_after", 1.0) or 1.0))
+                    else:
+                        self.edit_failures += 1
+                        log.warning("⚠️ Crash frame for message %s failed: %s", message.id, e)
+
+                # A cash-out during the edit must not be hidden behind this older frame
+                default = (view, True) if view.game_over and not was_over else (None, False)
+                view, final = self._pending.pop(message.id, default)
+                if view is None:
+                    return
+                if not final and not budget.take(time.monotonic()):
+                    self.skipped += 1
+                    return
+        finally:
+            self._in_flight.discard(message.id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "games": len(self.games),
+            "wakeups": self.wakeups,
+            "frames": self.frames,
+            "coalesced": self.coalesced,
+            "skipped": self.skipped,
+            "throttled": self.throttled,
+            "edit_failures": self.edit_failures,
+            "channel_rates": {str(cid): round(b.rate, 2) for cid, b in self.budgets.items()},
+        }
+
+
+crash_ticker = CrashTicker()
+
+
+class AutoCrashRound:
+    """
+    A ?crash round with an auto-cashout target.
+
+    The outcome is fixed by the crash point and the target, so the round is
+    resolved and settled in one reward call the moment it starts. The
+    optional replay only redraws one message through the shared CrashTicker
+    (budgeted like any other frame); no view, task or pending payout is kept.
+    """
+
+    __slots__ = (
+        "user_id", "bet", "target", "crash_point", "trajectory", "cashout_tick",
+        "won", "payout", "settle_error", "message", "started_at", "crash_at", "game_over",
+    )
+
+    def __init__(self, user_id: int, bet: int, target: float, crash_point: Optional[float] = None):
+        self.user_id = user_id
+        self.bet = bet
+        self.target = target
+        self.crash_point = generate_crash_point() if crash_point is None else crash_point
+        self.trajectory = CrashTrajectory(self.crash_point)
+        self.cashout_tick = self.trajectory.cashout_tick(target)
+        self.won = self.cashout_tick is not None
+        self.payout = int(bet * target) if self.won else 0
+        self.settle_error: Optional[str] = None
+        self.message = None
+        self.started_at = 0.0
+        self.crash_at = 0.0
+        self.game_over = False
+
+    async def settle(self, api: "UserVaultAPI") -> dict:
+        """Book bet and winnings as one net reward."""
+        if self.won:
+            description = f"Crash auto-cashout x{self.target:.2f}"
+        else:
+            description = f"Crash auto-cashout x{self.target:.2f} (crashed x{self.crash_point:.2f})"
+        result = await api.send_reward(str(self.user_id), self.payout - self.bet, "crash", description)
+        if result.get("error"):
+            self.settle_error = str(result["error"])
+        return result
+
+    # --- Replay (driven by CrashTicker) ---
+
+    @property
+    def frame_ticks(self) -> int:
+        return self.cashout_tick if self.won else self.trajectory.crash_tick
+
+    def start_replay(self, message):
+        self.message = message
+        self.started_at = time.monotonic()
+        self.crash_at = self.started_at + self.frame_ticks * self.trajectory.tick
+        crash_ticker.add(self)
+
+    def resolve(self, now: float) -> bool:
+        self.game_over = True
+        return True
+
+    def create_embed(self, game_over: bool = True) -> discord.Embed:
+        if not game_over:
+            # The opening frame is built before start_replay(); it shows the start, not the result
+            elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+            multiplier = self.trajectory.multiplier_at(elapsed)
+            bar_length = min(int(multiplier * 2), 20)
+            bar = "█" * bar_length + "░" * (20 - bar_length)
+            embed = discord.Embed(
+                title="🚀 CRASH (Replay)",
+                description=(
+                    f"```\n{bar}\n```\n"
+                    f"# x{multiplier:.2f}\n\n"
+                    f"**Einsatz:** {self.bet} UC\n"
+                    f"🎯 **Auto-Cashout:** x{self.target:.2f}"
+                ),
+                color=discord.Color.green() if multiplier < 2 else discord.Color.orange(),
+            )
+        elif self.won:
+            embed = discord.Embed(
+                title="💰 AUTO-CASHOUT!",
+                description=(
+                    f"Automatisch ausgezahlt bei **x{self.target:.2f}**!\n\n"
+                    f"💵 **Gewinn: {self.payout} UC**\n"
+                    f"📈 Crash war bei: x{self.crash_point:.2f}"
+                ),
+                color=discord.Color.gold(),
+            )
+        else:
+            embed = discord.Embed(
+                title="💥 CRASHED!",
+                description=(
+                    f"Der Multiplikator ist bei **x{self.crash_point:.2f}** gecrasht – "
+                    f"Ziel x{self.target:.2f} nicht erreicht.\n\n"
+                    f"💸 **Verlust: {self.bet} UC**"
+                ),
+                color=discord.Color.red(),
+            )
+        if game_over and self.settle_error:
+            embed.add_field(name="⚠️ Buchung fehlgeschlagen", value=self.settle_error[:1024], inline=False)
+        embed.set_footer(text=f"UserVault Crash • {BOT_CODE_VERSION}")
+        return embed
+
+
+class CrashRoundPlayer:
+    """One player's stake in a multiplayer Crash round."""
+
+    __slots__ = ("user_id", "name", "bet", "target", "auto_tick", "cashout", "staked", "refunded")
+
+    def __init__(self, user_id: int, name: str, bet: int, target: Optional[float]):
+        self.user_id = user_id
+        self.name = name
+        self.bet = bet
+        self.target = target
+        self.auto_tick: Optional[int] = None
+        self.cashout: Optional[float] = None
+        # The bet has been taken from the balance (set once the join booking succeeded)
+        self.staked = False
+        # The round was aborted while this player was still in; the bet was paid back
+        self.refunded = False
+
+    def result(self, round_: "CrashRoundView", now: Optional[float] = None) -> Optional[float]:
+        """Multiplier this player cashed out at (manually or by target), None if still in / lost."""
+        if self.cashout is not None:
+            return self.cashout
+        if self.auto_tick is not None:
+            auto_at = round_.started_at + self.auto_tick * round_.trajectory.tick
+            if now is None or now >= auto_at:
+                return self.target
+        return None
+
+    def payout(self, round_: "CrashRoundView") -> int:
+        multiplier = self.result(round_)
+        return int(self.bet * multiplier) if multiplier is not None else 0
+
+
+class CrashRoundCashoutButton(discord.ui.Button):
+    """Shared cash-out button; every player in the round uses the same message."""
+
+    def __init__(self, round_: "CrashRoundView"):
+        super().__init__(style=discord.ButtonStyle.success, label="💰 CASH OUT", row=0)
+        self.round = round_
+
+    async def callback(self, interaction: discord.Interaction):
+        round_ = self.round
+        player = round_.players.get(interaction.user.id)
+        if player is None:
+            await interaction.response.send_message(
+                "❌ Du spielst in dieser Runde nicht mit! Nächste Runde: `?crashround <einsatz>`", ephemeral=True
+            )
+            return
+        if round_.trajectory is None:
+            await interaction.response.send_message("⏳ Die Runde hat noch nicht begonnen!", ephemeral=True)
+            return
+
+        # Resolved by timestamp, exactly like a solo round
+        now = time.monotonic()
+        if round_.resolve(now):
+            crash_ticker.request_frame(round_, final=True)
+            await interaction.response.send_message(f"💥 Zu spät – gecrasht bei x{round_.crash_point:.2f}!", ephemeral=True)
+            return
+        done = player.result(round_, now)
+        if done is not None:
+            await interaction.response.send_message(f"✅ Du bist schon bei x{done:.2f} ausgestiegen.", ephemeral=True)
+            return
+
+        player.cashout = round_.multiplier_at(now)
+        await interaction.response.send_message(
+            f"💰 Ausgezahlt bei **x{player.cashout:.2f}** – **{int(player.bet * player.cashout)} UC** "
+            f"werden am Rundenende gutgeschrieben.",
+            ephemeral=True,
+        )
+        # Shown with the next budgeted frame, never as an extra edit
+        crash_ticker.request_frame(round_)
+
+
+class CrashRoundView(discord.ui.View):
+    """
+    Multiplayer Crash round for one channel.
+
+    Players join during the betting window and their bet is taken right
+    away; then a single trajectory runs for everyone and one message is
+    redrawn through CrashTicker, so the channel's edit rate does not grow with
+    the number of players. Each player cashes out at their own multiplier
+    (button or auto target). When the round crashes, the payouts are credited
+    together. If the round is cancelled (shutdown, ?reload), players who
+    already cashed out are still paid and everyone else gets their bet back.
+    """
+
+    def __init__(self, bot, channel):
+        super().__init__(timeout=None)
+        track_game_view(self)
+        self.bot = bot
+        self.channel = channel
+        self.crash_point = generate_crash_point()
+        self.players: Dict[int, CrashRoundPlayer] = {}
+        self.message = None
+        self.trajectory: Optional[CrashTrajectory] = None
+        self.betting_ends_at = time.time() + CRASH_ROUND_BETTING_SECONDS
+        self.started_at = 0.0
+        self.crash_at = 0.0
+        self.game_over = False
+        self.aborted = False
+        self.settled = False
+        self.settle_errors: Dict[int, str] = {}
+        self.finished = asyncio.Event()
+        self.cashout_button = CrashRoundCashoutButton(self)
+        self.cashout_button.disabled = True
+        self.add_item(self.cashout_button)
+
+    async def join(self, user: discord.abc.User, bet: int, target: Optional[float]) -> Optional[str]:
+        """
+        Add a player during the betting window and take their bet; returns an
+        error message instead of raising.
+
+        The seat is reserved before the booking, so concurrent joins cannot
+        overfill the round, and released again if the booking fails. The
+        booking runs shielded, so a cancelled caller never loses a taken bet.
+        """
+        if self.trajectory is not None or self.settled:
+            return "⏳ Diese Runde läuft schon – warte auf die nächste!"
+        if user.id in self.players:
+            return "❌ Du bist in dieser Runde schon dabei!"
+        if len(self.players) >= CRASH_ROUND_MAX_PLAYERS:
+            return f"❌ Die Runde ist voll ({CRASH_ROUND_MAX_PLAYERS} Spieler)."
+        player = CrashRoundPlayer(user.id, getattr(user, "display_name", str(user)), bet, target)
+        self.players[user.id] = player
+        return await task_supervisor.run("settlement", self._stake(player), name=f"crash-round-stake:{user.id}")
+
+    async def _stake(self, player: CrashRoundPlayer) -> Optional[str]:
+        """Take a reserved player's bet, then keep or release their seat."""
+        try:
+            result = await self.bot.api.send_reward(
+                str(player.user_id), -player.bet, "crash", f"Crash round bet ({player.bet} UC)"
+            )
+            if result.get("error"):
+                return f"❌ Einsatz konnte nicht gebucht werden: {result['error']}"
+            player.staked = True
+        finally:
+            if not player.staked and self.players.get(player.user_id) is player:
+                del self.players[player.user_id]
+        if self.settled:
+            # The round was booked while this bet was in flight; it cannot take part anymore
+            del self.players[player.user_id]
+            await self.bot.api.send_reward(
+                str(player.user_id), player.bet, "crash", f"Crash round refund ({player.bet} UC)"
+            )
+            return "⏳ Die Runde ist schon vorbei – dein Einsatz wurde zurückgebucht."
+        crash_ticker.request_frame(self)
+        return None
+
+    async def run(self):
+        """Betting window, live round, then batch settlement."""
+        # Outlives the command that opened the round
+        clear_command_deadline()
+        try:
+            self.message = await self.channel.send(embed=self.create_embed(), view=self)
+            await asyncio.sleep(max(0.0, self.betting_ends_at - time.time()))
+            if not self.players:
+                # Every join failed; closed as aborted without a live round
+                return
+
+            self.trajectory = CrashTrajectory(self.crash_point)
+            for player in self.players.values():
+                if player.target is not None:
+                    player.auto_tick = self.trajectory.cashout_tick(player.target)
+            self.started_at = time.monotonic()
+            self.crash_at = self.started_at + self.trajectory.crash_after
+            self.cashout_button.disabled = False
+            crash_ticker.add(self)
+            crash_ticker.request_frame(self)
+            await self.finished.wait()
+        finally:
+            # Cancelled (shutdown, ?reload) or failed before the crash
+            self.abort()
+            if crash_rounds.get(getattr(self.channel, "id", None)) is self:
+                del crash_rounds[self.channel.id]
+            # Shielded, so a shutdown or ?reload cannot cut the payouts off halfway
+            await task_supervisor.run("settlement", self._settle(), name=f"crash-round-settle:{self.channel.id}")
+
+    def abort(self):
+        """Stop the round early; _settle then pays cashed-out players and refunds the rest."""
+        if self.game_over:
+            return
+        self.aborted = True
+        self.game_over = True
+        self.cashout_button.disabled = True
+        self.stop()
+        self.finished.set()
+
+    async def _settle(self):
+        """Credit every payout (and, for an aborted round, every refund) in one batch; runs once."""
+        if self.settled:
+            return
+        self.settled = True
+        now = time.monotonic()
+        credits = []
+        for player in self.players.values():
+            if not player.staked:
+                continue
+            multiplier = player.result(self, now if self.aborted else None) if self.trajectory is not None else None
+            if multiplier is not None:
+                credits.append((player, int(player.bet * multiplier), f"Crash round x{multiplier:.2f}"))
+            elif self.aborted:
+                player.refunded = True
+                credits.append((player, player.bet, f"Crash round refund ({player.bet} UC)"))
+        results = await asyncio.gather(*(
+            self.bot.api.send_reward(str(p.user_id), amount, "crash", description)
+            for p, amount, description in credits
+        ), return_exceptions=True)
+        for (player, _, _), result in zip(credits, results):
+            error = str(result) if isinstance(result, Exception) else result.get("error")
+            if error:
+                self.settle_errors[player.user_id] = str(error)
+        if self.message is not None and (self.aborted or self.settle_errors):
+            crash_ticker.request_frame(self, final=True)
+
+    # --- CrashTicker protocol ---
+
+    @property
+    def frame_ticks(self) -> int:
+        return self.trajectory.crash_tick
+
+    def multiplier_at(self, now: float) -> float:
+        return self.trajectory.multiplier_at(now - self.started_at)
+
+    def resolve(self, now: float) -> bool:
+        if not self.game_over and self.trajectory is not None and now >= self.crash_at:
+            self.game_over = True
+            self.cashout_button.disabled = True
+            self.stop()
+            self.finished.set()
+        return self.game_over
+
+    def _player_lines(self, now: Optional[float]) -> str:
+        lines = []
+        for player in list(self.players.values())[:20]:
+            result = player.result(self, now) if self.trajectory is not None else None
+            target = f" 🎯x{player.target:.2f}" if player.target is not None else ""
+            if result is not None:
+                status = f"✅ x{result:.2f} → {int(player.bet * result)} UC"
+            elif player.refunded:
+                status = f"↩️ {player.bet} UC zurück"
+            elif self.game_over:
+                status = f"💥 -{player.bet} UC"
+            else:
+                status = "🚀"
+            if player.user_id in self.settle_errors:
+                status += " ⚠️"
+            lines.append(f"**{player.name}** – {player.bet} UC{target} {status}")
+        if len(self.players) > 20:
+            lines.append(f"… und {len(self.players) - 20} weitere")
+        return "\n".join(lines) or "Noch keine Spieler"
+
+    def create_embed(self, game_over: bool = False) -> discord.Embed:
+        if self.trajectory is None:
+            embed = discord.Embed(
+                title="🚀 CRASH RUNDE – Einsätze offen",
+                description=(
+                    f"Start <t:{int(self.betting_ends_at)}:R>\n"
+                    f"Mitmachen: `?crashround <einsatz> [ziel]x`\n\n"
+                    f"{self._player_lines(None)}"
+                ),
+                color=discord.Color.blurple(),
+            )
+        elif game_over and self.aborted:
+            embed = discord.Embed(
+                title="⏹️ Runde abgebrochen",
+                description=(
+                    f"Ausgestiegene Spieler werden ausgezahlt, "
+                    f"alle anderen bekommen ihren Einsatz zurück.\n\n"
+                    f"{self._player_lines(time.monotonic())}"
+                ),
+                color=discord.Color.greyple(),
+            )
+        elif game_over:
+            embed = discord.Embed(
+                title="💥 CRASHED!",
+                description=(
+                    f"Der Multiplikator ist bei **x{self.crash_point:.2f}** gecrasht!\n\n"
+                    f"{self._player_lines(None)}"
+                ),
+                color=discord.Color.red(),
+            )
+            if self.settle_errors:
+                embed.add_field(
+                    name="⚠️ Buchung fehlgeschlagen",
+                    value=", ".join(f"<@{uid}>" for uid in self.settle_errors)[:1024],
+                    inline=False,
+                )
+        else:
+            now = time.monotonic()
+            multiplier = self.multiplier_at(now)
+            bar_length = min(int(multiplier * 2), 20)
+            bar = "█" * bar_length + "░" * (20 - bar_length)
+            embed = discord.Embed(
+                title="🚀 CRASH RUNDE",
+                description=(
+                    f"```\n{bar}\n```\n"
+                    f"# x{multiplier:.2f}\n\n"
+                    f"{self._player_lines(now)}\n\n"
+                    f"⚠️ Cash out bevor es crasht!"
+                ),
+                color=discord.Color.green() if multiplier < 2 else discord.Color.orange(),
+            )
+        embed.set_footer(text=f"UserVault Crash • {len(self.players)} Spieler • {BOT_CODE_VERSION}")
+        return embed
+
+
+# Open or running multiplayer round per channel id
+crash_rounds: Dict[int, CrashRoundView] = {}
+
+
+# ============ MESSAGE PIPELINE ============
+
+class MessagePipeline:
+    """
+    Handles every incoming message exactly once.
+
+    Order: bots and plain chat leave immediately, replayed message IDs are
+    dropped, then the prefix router, then an active guess game, and finally
+    (standalone only) discord.py's own process_commands for everything the
+    router did not handle. In extension mode the host bot calls
+    process_commands itself, so the pipeline runs from the cog listener; the
+    cog's cog_check then rejects commands the router already handled.
+    """
+
+    def __init__(self, client: commands.Bot, owns_commands: bool = False, window: int = MESSAGE_DEDUP_WINDOW):
+        self.client = client
+        self.owns_commands = owns_commands
+        self.window = window
+        self.router: Optional["PrefixRouter"] = None
+        self._seen: "OrderedDict[int, None]" = OrderedDict()
+        self.processed = 0
+        self.skipped = 0
+        self.duplicates = 0
+
+    def _claim(self, message_id: int) -> bool:
+        """False if `message_id` was already handled within the window."""
+        seen = self._seen
+        if message_id in seen:
+            return False
+        seen[message_id] = None
+        if len(seen) > self.window:
+            seen.popitem(last=False)
+        return True
+
+    async def process(self, message: discord.Message):
+        if message.author.bot:
+            return
+
+        content = (message.content or "").strip()
+        game = self.client.active_guess_games.get(message.author.id)  # type: ignore[attr-defined]
+        is_prefix = content.startswith("?")
+        # Most messages are chat: no prefix, no mention prefix, no running guess game
+        if not is_prefix and game is None and not (self.owns_commands and content.startswith("<@")):
+            self.skipped += 1
+            return
+        if not self._claim(message.id):
+            self.duplicates += 1
+            return
+        self.processed += 1
+
+        # Deadline budget for every API call made while handling this message
+        start_command_deadline()
+        if is_prefix and log.isEnabledFor(logging.DEBUG):
+            log.debug("📥 Received command: %s from %s", content[:50], message.author.id)
+
+        if is_prefix and self.router is not None and await self.router.dispatch(message, content):
+            return
+        if game is not None and message.channel.id == game.get("channel_id") and await self._guess(message, game, content):
+            return
+        if self.owns_commands:
+            await self.client.process_commands(message)
+
+    async def _guess(self, message: discord.Message, game: Dict[str, Any], content: str) -> bool:
+        """Evaluate a guess for the author's number game. False if `content` is not a guess."""
+        try:
+            guess_num = int(content)
+        except ValueError:
+            return False  # Not a number, ignore
+        if not 1 <= guess_num <= 100:
+            return False
+
+        api = self.client.api  # type: ignore[attr-defined]
+        active_guess_games = self.client.active_guess_games  # type: ignore[attr-defined]
+        game["attempts"] -= 1
+        result = await api.check_guess(game["secret"], guess_num, game["attempts"])
+
+        if result.get("correct"):
+            reward = result.get("reward", 50)
+            await message.reply(f"🎉 **Correct!** The number was {guess_num}! **+{reward} UC**")
+            await api.send_reward(str(message.author.id), reward, "guess", "Number guess")
+            active_guess_games.pop(message.author.id, None)
+        elif game["attempts"] == 0:
+            await message.reply(f"❌ Out of attempts! The number was {result.get('answer', '???')}.")
+            active_guess_games.pop(message.author.id, None)
+        else:
+            hint = result.get("hint", "Try again!")
+            await message.reply(f"{hint} ({game['attempts']} attempts left)")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "duplicates": self.duplicates,
+            "window": self.window,
+            "owns_commands": self.owns_commands,
+        }
+
+
 class UserVaultBot(commands.Bot):
     """Main Discord bot class."""
     
@@ -1339,7 +4448,13 @@ class UserVaultBot(commands.Bot):
         
         self.api = UserVaultAPI(WEBHOOK_SECRET)
         self.active_guess_games: Dict[int, dict] = {}
+        self.uservault_auth = AuthorizationService(self)
+        self.uservault_messages = MessagePipeline(self, owns_commands=True)
         self.notification_task: Optional[asyncio.Task] = None
+
+    async def on_message(self, message: discord.Message):
+        """Single entry point for messages; also runs process_commands (see MessagePipeline)."""
+        await self.uservault_messages.process(message)
     
     async def setup_hook(self):
         """Called when the bot is ready to set up commands."""
@@ -1349,16 +4464,7 @@ class UserVaultBot(commands.Bot):
         if not hasattr(self, "_uservault_prefix_cog_loaded"):
             await self.add_cog(UserVaultPrefixCommands(self))
             self._uservault_prefix_cog_loaded = True
-        # Fetch available commands from API
-        print("📡 Fetching commands from API...")
-        try:
-            cmd_data = await self.api.get_all_commands()
-            if cmd_data.get("games"):
-                print(f"✅ Loaded {len(cmd_data['games'])} games from API")
-            if cmd_data.get("utilities"):
-                print(f"✅ Loaded {len(cmd_data['utilities'])} utility commands from API")
-        except Exception as e:
-            print(f"⚠️ Could not fetch commands from API: {e}")
+        await start_metrics_server(self)
         
         if ENABLE_SLASH_COMMANDS:
             # Register all commands (slash)
@@ -1367,6 +4473,7 @@ class UserVaultBot(commands.Bot):
             self.tree.add_command(coin)
             self.tree.add_command(rps)
             self.tree.add_command(blackjack)
+            self.tree.add_command(crash)
             self.tree.add_command(guess)
             self.tree.add_command(balance)
             self.tree.add_command(daily)
@@ -1394,7 +4501,9 @@ class UserVaultBot(commands.Bot):
         
         # Start notification polling
         if self.notification_task is None or self.notification_task.done():
-            self.notification_task = asyncio.create_task(self.poll_notifications())
+            self.notification_task = task_supervisor.spawn(
+                "poller", self.poll_notifications(), name="notifications", drain=False, unique=True
+            )
             print("📡 Started command notification polling")
     
     async def poll_notifications(self):
@@ -1421,6 +4530,8 @@ class UserVaultBot(commands.Bot):
                     self._uv_notif_channel_logged = True
 
                 result = await self.api.get_pending_notifications()
+                if not result.get("error"):
+                    self._uservault_last_notification_poll = time.time()
 
                 notifications = result.get("notifications") or []
                 needs_reload = False
@@ -1567,8 +4678,9 @@ class UserVaultBot(commands.Bot):
             return False
     
     async def close(self):
-        if self.notification_task:
-            self.notification_task.cancel()
+        # Pollers stop, running games and pending payouts settle before the session closes
+        await task_supervisor.drain()
+        await stop_metrics_server(self)
         await self.api.close()
         await super().close()
 
@@ -1603,7 +4715,7 @@ async def slots(interaction: discord.Interaction):
     api = interaction.client.api  # type: ignore[attr-defined]
     await interaction.response.defer()
     
-    result = await api.spin_slots()
+    result = await api.spin_slots(str(interaction.user.id))
     payout = result.get("payout", 0)
     display = result.get("display", "🎰 🎰 🎰")
     
@@ -1625,7 +4737,7 @@ async def coin(interaction: discord.Interaction, choice: app_commands.Choice[str
     api = interaction.client.api  # type: ignore[attr-defined]
     await interaction.response.defer()
     
-    result = await api.flip_coin()
+    result = await api.flip_coin(str(interaction.user.id))
     won = result.get("result") == choice.value
     emoji = result.get("emoji", "🪙")
     
@@ -1654,7 +4766,7 @@ async def rps(interaction: discord.Interaction, choice: app_commands.Choice[str]
     api = interaction.client.api  # type: ignore[attr-defined]
     await interaction.response.defer()
     
-    result = await api.play_rps(choice.value)
+    result = await api.play_rps(choice.value, str(interaction.user.id))
     
     if result.get("error"):
         await interaction.followup.send(f"❌ Error: {result['error']}")
@@ -1701,6 +4813,50 @@ async def blackjack(interaction: discord.Interaction):
         await interaction.followup.send(content, view=view)
 
 
+@app_commands.command(name="crash", description="🚀 Cash out before the multiplier crashes!")
+@app_commands.describe(
+    bet="Your bet in UC (min 10)",
+    target="Auto-cashout multiplier, e.g. 2x - resolves instantly",
+    replay="Show the round as a replay animation (auto-cashout only)",
+)
+async def crash(interaction: discord.Interaction, bet: int = 50, target: Optional[str] = None, replay: bool = False):
+    _ensure_uservault_client_state(interaction.client)  # type: ignore[arg-type]
+    api = interaction.client.api  # type: ignore[attr-defined]
+
+    cashout_target = None
+    if target is not None:
+        try:
+            cashout_target = parse_crash_target(target)
+        except ValueError:
+            await interaction.response.send_message(
+                f"❌ Ungültiges Ziel! Erlaubt: x{CRASH_MIN_TARGET:.2f} – x{CRASH_MAX_TARGET:.0f}, z.B. `2x`",
+                ephemeral=True,
+            )
+            return
+    if bet < 10:
+        await interaction.response.send_message("❌ Minimum Einsatz ist 10 UC!", ephemeral=True)
+        return
+
+    await interaction.response.defer()
+    balance_result = await api.get_balance(str(interaction.user.id))
+    current_balance = safe_int_balance(balance_result.get("balance", 0))
+    if current_balance < bet:
+        await interaction.followup.send(f"❌ Nicht genug Guthaben! Du hast {current_balance} UC.")
+        return
+
+    if cashout_target is None:
+        await interaction.followup.send(f"🚀 Crash startet – Einsatz **{bet} UC**")
+        view = CrashView(interaction.client, interaction.user.id, bet)
+        task_supervisor.spawn("game", view.start_game(interaction.channel), name=f"crash:{interaction.user.id}")
+        return
+
+    round_ = AutoCrashRound(interaction.user.id, bet, cashout_target)
+    await round_.settle(api)
+    sent = await interaction.followup.send(embed=round_.create_embed(game_over=not replay), wait=True)
+    if replay:
+        round_.start_replay(sent)
+
+
 @app_commands.command(name="guess", description="🔢 Guess the number (1-100)!")
 async def guess(interaction: discord.Interaction):
     _ensure_uservault_client_state(interaction.client)  # type: ignore[arg-type]
@@ -1729,7 +4885,7 @@ async def balance(interaction: discord.Interaction):
     api = interaction.client.api  # type: ignore[attr-defined]
     await interaction.response.defer()
     
-    result = await api.get_balance(str(interaction.user.id))
+    result = await api.get_balance(str(interaction.user.id), fresh=True)
     
     if result.get("error"):
         await interaction.followup.send(f"❌ Error: {result['error']}")
@@ -1777,19 +4933,188 @@ async def apistats(interaction: discord.Interaction):
     )
 
 
+# ============ PREFIX COMMAND ROUTER ============
+
+# Names handled by @commands.command / slash commands only. They are never
+# routed to a registry command, even if the API publishes one with that name.
+RESERVED_PREFIX_COMMANDS = frozenset({
+    "slots", "coin", "rps", "blackjack", "guess", "trivia",
+    "link", "unlink", "profile", "delete", "apistats", "refresh",
+})
+
+# Handler time per prefix route ("crash", "api:work", ...), shown in ?apistats and /metrics
+prefix_route_latency: Dict[str, RollingLatencyHistogram] = {}
+
+
+class HandledByPrefixRouter(commands.CheckFailure):
+    """The message belongs to the prefix router; the same-named @commands.command must not run too."""
+
+
+class PrefixRoute:
+    """One entry of the router table: a built-in handler or a registry command."""
+
+    __slots__ = ("name", "handler", "api_cmd", "is_admin_command", "exact")
+
+    def __init__(
+        self,
+        name: str,
+        handler: Optional[Callable[..., Awaitable[Any]]] = None,
+        api_cmd: Optional[Dict[str, Any]] = None,
+        is_admin_command: bool = False,
+        exact: bool = False,
+    ):
+        self.name = name
+        self.handler = handler
+        self.api_cmd = api_cmd
+        self.is_admin_command = is_admin_command
+        # Only match the bare command (no arguments)
+        self.exact = exact
+
+
+class PrefixRouter:
+    """
+    Dispatches `?name args` messages with one token split and one dict lookup.
+
+    The table holds the built-in handlers, their aliases and every registry
+    command/alias. Built-ins always win; the registry part is rebuilt only
+    when a new CommandRegistry generation is published.
+    """
+
+    def __init__(
+        self,
+        client: commands.Bot,
+        api_handler: Callable[..., Awaitable[Any]],
+        reserved: frozenset = RESERVED_PREFIX_COMMANDS,
+    ):
+        self.client = client
+        self.api_handler = api_handler
+        self.reserved = reserved
+        self.builtins: Dict[str, PrefixRoute] = {}
+        self._table: Dict[str, PrefixRoute] = {}
+        self._generation: Optional[int] = None
+
+    def add(self, name: str, handler: Callable[..., Awaitable[Any]], *aliases: str, exact: bool = False):
+        """Register a built-in handler under its name and aliases (exact: bare command only)."""
+        route = PrefixRoute(name, handler, exact=exact)
+        for key in (name, *aliases):
+            self.builtins[key] = route
+        self._generation = None
+
+    def table(self, registry: CommandRegistry) -> Dict[str, PrefixRoute]:
+        """Route table for `registry`, rebuilt once per generation."""
+        if registry.generation != self._generation:
+            table: Dict[str, PrefixRoute] = {}
+            for key, cmd in registry.lookup.items():
+                if key in self.reserved:
+                    continue
+                name = str(cmd.get("name") or key).lower()
+                table[key] = PrefixRoute(f"api:{name}", api_cmd=cmd, is_admin_command=registry.is_admin_command(name))
+            table.update(self.builtins)
+            self._table = table
+            self._generation = registry.generation
+        return self._table
+
+    def route_for(self, content: str) -> Optional[PrefixRoute]:
+        """The route that claims `content`, or None (no side effects)."""
+        if not content.startswith("?"):
+            return None
+        token = content[1:].split(None, 1)
+        if not token:
+            return None
+        route = self.table(get_command_registry()).get(token[0].lower())
+        if route is None or (route.exact and len(token) > 1):
+            return None
+        return route
+
+    async def dispatch(self, message: discord.Message, content: str) -> bool:
+        """Run the route for `content` (which starts with "?"). False if nothing matched."""
+        route = self.route_for(content)
+        if route is None or route.api_cmd is not None:
+            token = content[1:].split(None, 1)
+            if not token or token[0].lower() in self.reserved:
+                return False
+            # Never wait for the API here; a stale registry is refreshed in the background
+            schedule_commands_refresh(self.client.api)  # type: ignore[attr-defined]
+            if route is None:
+                return False
+
+        started = time.perf_counter()
+        ok = False
+        try:
+            if route.api_cmd is not None:
+                await self.api_handler(message, content, route.api_cmd, route.is_admin_command)
+            else:
+                await route.handler(message, content)
+            ok = True
+        finally:
+            hist = prefix_route_latency.get(route.name)
+            if hist is None:
+                hist = prefix_route_latency[route.name] = RollingLatencyHistogram()
+            hist.record((time.perf_counter() - started) * 1000, "ok" if ok else "error", ok)
+        return True
+
+
 class UserVaultPrefixCommands(commands.Cog):
     """Prefix commands (e.g. ?trivia) for admins/servers that prefer text commands."""
 
     def __init__(self, client: commands.Bot):
         self.client = _ensure_uservault_client_state(client)
 
+        # Built-in prefix handlers used by on_message; registry commands are added per generation
+        self.router = PrefixRouter(self.client, self._route_api_command)
+        self.router.add("help", self._route_help, "helping", "commands")
+        self.router.add("reload", self._route_reload, exact=True)
+        self.router.add("restart", self._route_restart, exact=True)
+        self.router.add("ping", self._route_ping, exact=True)
+        self.router.add("balance", self._route_balance, exact=True)
+        self.router.add("daily", self._route_daily, exact=True)
+        self.router.add("version", self._route_version, exact=True)
+        self.router.add("crash", self._route_crash)
+        self.router.add("crashround", self._route_crashround, "cr")
+        self.router.add("mines", self._route_mines)
+        self.router.add("higherlower", self._route_higherlower, "hl")
+        self.router.add("roulette", self._route_roulette)
+        self.router.add("dice", self._route_dice)
+        self.router.add("plinko", self._route_plinko)
+        self.router.add("keno", self._route_keno)
+        self.router.add("lookup", self._route_lookup)
+        self.router.add("users", self._route_users)
+        self.client.uservault_messages.router = self.router  # type: ignore[attr-defined]
+
+    def cog_unload(self):
+        pipeline = getattr(self.client, "uservault_messages", None)
+        if pipeline is not None and pipeline.router is self.router:
+            pipeline.router = None
+
+    async def cog_check(self, ctx: commands.Context) -> bool:
+        """
+        Keep @commands.command duplicates of router-owned names from running a
+        second time. In extension mode the host's process_commands sees every
+        message the pipeline already routed (?balance, ?daily, ?mines, ...).
+        """
+        if self.router.route_for((ctx.message.content or "").strip()) is not None:
+            raise HandledByPrefixRouter(f"?{ctx.invoked_with} is handled by the prefix router")
+        return True
+
+    async def cog_command_error(self, ctx: commands.Context, error: Exception):
+        """
+        Defining this keeps discord.py's default handler from printing a
+        traceback for HandledByPrefixRouter. Other errors are still logged.
+        """
+        if not isinstance(error, HandledByPrefixRouter):
+            log.error("❌ Prefix command ?%s failed: %s", ctx.invoked_with, error, exc_info=error)
+
+    async def cog_before_invoke(self, ctx: commands.Context):
+        """Every prefix command gets its own end-to-end deadline budget."""
+        start_command_deadline()
+
     async def cog_load(self):
-        """Called when the cog is loaded. Fetch commands from API."""
-        try:
-            await fetch_commands_from_api(self.client.api, force=True)
-            print("✅ [UserVault] Commands loaded from API on cog_load")
-        except Exception as e:
-            print(f"⚠️ [UserVault] Failed to load commands on cog_load: {e}")
+        """
+        Called when the cog is loaded (standalone and extension mode).
+        Commands are already served from the on-disk snapshot; reconcile with
+        the API in the background instead of blocking the load.
+        """
+        schedule_commands_refresh(self.client.api, force=True)  # type: ignore[attr-defined]
 
     @commands.command(name="helping", aliases=["cmds"])
     async def help_command(self, ctx: commands.Context, command_name: str = None):
@@ -1797,54 +5122,19 @@ class UserVaultPrefixCommands(commands.Cog):
         Show all available commands from the database.
         Usage: ?helping [command_name]
         """
-        # Fetch fresh commands from API
-        cmd_data = await fetch_commands_from_api(self.client.api)
-        commands_list = cmd_data.get("commands", [])
+        # Current registry (refreshed in the background when stale)
+        registry = await fetch_commands_from_api(self.client.api)
         
         if command_name:
             # Show details for a specific command
-            cmd = get_command_by_name(command_name)
-            if not cmd:
+            embed = get_help_pages(registry).command_embed(command_name.lower())
+            if embed is None:
                 await ctx.send(f"❌ Command `{command_name}` not found. Use `?help` to see all commands.")
                 return
-            
-            cmd_name = cmd.get('name', 'unknown')
-            cmd_usage = cmd.get('usage', f'?{cmd_name}')
-            embed = discord.Embed(
-                title=f"📖 Command: {cmd_usage}",
-                description=cmd.get("description", "No description available."),
-                color=discord.Color.blurple()
-            )
-            embed.add_field(name="Category", value=cmd.get("category", "General"), inline=True)
-            embed.add_field(name="Enabled", value="✅ Yes" if cmd.get("is_enabled") else "❌ No", inline=True)
-            embed.set_footer(text=f"UserVault Bot • v:{BOT_CODE_VERSION}")
             await ctx.send(embed=embed)
             return
         
-        # Group commands by category
-        categories: Dict[str, List[Dict[str, Any]]] = {}
-        for cmd in commands_list:
-            if not cmd.get("is_enabled", True):
-                continue
-            cat = cmd.get("category", "General") or "General"
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append(cmd)
-        
-        embed = discord.Embed(
-            title="📋 Available Commands",
-            description=f"Use `?help <command>` for details on a specific command.\n\n**Total:** {len(commands_list)} commands loaded from API",
-            color=discord.Color.blurple()
-        )
-        
-        for cat_name, cat_cmds in sorted(categories.items()):
-            cmd_list = ", ".join([f"`{c.get('name', '?')}`" for c in cat_cmds[:15]])
-            if len(cat_cmds) > 15:
-                cmd_list += f" (+{len(cat_cmds) - 15} more)"
-            embed.add_field(name=f"📁 {cat_name}", value=cmd_list or "No commands", inline=False)
-        
-        embed.set_footer(text=f"UserVault Bot • v:{BOT_CODE_VERSION} • ?refresh to reload commands")
-        await ctx.send(embed=embed)
+        await send_help(ctx, ctx.author.id, registry)
 
     @commands.command(name="refresh")
     async def refresh_commands(self, ctx: commands.Context):
@@ -1855,38 +5145,206 @@ class UserVaultPrefixCommands(commands.Cog):
         msg = await ctx.send("🔄 Refreshing commands from API...")
         
         try:
-            # Clear cache and force fetch
-            global _CACHED_BOT_COMMANDS, _COMMANDS_LAST_FETCHED
-            _CACHED_BOT_COMMANDS = {}
-            _COMMANDS_LAST_FETCHED = 0
-            
-            cmd_data = await fetch_commands_from_api(self.client.api, force=True)
-            commands_list = cmd_data.get("commands", [])
+            # Admin/supporter roles may have changed together with the commands
+            self.client.uservault_auth.invalidate()  # type: ignore[attr-defined]
+
+            # Force a sync; the registry is swapped in as a whole once it is built
+            registry = await fetch_commands_from_api(self.client.api, force=True)
             
-            await msg.edit(content=f"✅ Refreshed! Loaded **{len(commands_list)}** commands from API.\n(v: `{BOT_CODE_VERSION}`)")
+            await msg.edit(content=f"✅ Refreshed! Loaded **{len(registry)}** commands from API.\n(v: `{BOT_CODE_VERSION}`)")
         except Exception as e:
             await msg.edit(content=f"❌ Error refreshing commands: {e}")
 
-    @commands.command(name="apistats")
-    async def apistats_prefix(self, ctx: commands.Context):
-        logger = request_logger
+    @commands.command(name="apistats")
+    async def apistats_prefix(self, ctx: commands.Context, option: str = "5m"):
+        """
+        Show API statistics.
+        Usage: ?apistats [1m|5m|1h] or ?apistats json (machine-readable dump)
+        """
+        logger = request_logger
+        api = self.client.api  # type: ignore[attr-defined]
+        option = option.lower()
+
+        if option == "json":
+            dump = logger.dump()
+            dump["pool"] = api.pool.stats()
+            dump["balance_cache"] = api.balance_cache.stats()
+            dump["link_cache"] = api.link_cache.stats()
+            dump["auth"] = self.client.uservault_auth.stats()  # type: ignore[attr-defined]
+            registry = get_command_registry()
+            dump["command_refresh"] = {
+                **_COMMANDS_REFRESH_STATS,
+                "age": registry.age(),
+                "backoff_remaining": max(_COMMANDS_REFRESH_STATS["backoff_until"] - time.monotonic(), 0.0),
+                "version": registry.version,
+                "generation": registry.generation,
+            }
+            dump["tasks"] = task_supervisor.stats()
+            dump["crash"] = crash_ticker.stats()
+            dump["messages"] = self.client.uservault_messages.stats()  # type: ignore[attr-defined]
+            dump["prefix_routes"] = {name: h.snapshot_all() for name, h in sorted(prefix_route_latency.items())}
+            dump["breakers"] = {b.name: {**b.stats(), "retries": api.retry_counts.get(b.name, 0)} for b in api.breakers.values()}
+            payload = json.dumps(dump, indent=2).encode("utf-8")
+            await ctx.send(
+                "📊 API statistics dump",
+                file=discord.File(io.BytesIO(payload), filename=f"apistats-{int(time.time())}.json"),
+            )
+            return
+
+        window = option if option in RollingLatencyHistogram.WINDOWS else "5m"
+        window_seconds = RollingLatencyHistogram.WINDOWS[window]
+
         total = logger.request_count
         success_rate = (logger.success_count / total * 100) if total > 0 else 0
         
         # Add command cache info
-        cached_count = len(get_cached_commands())
-        cache_age = int(time.time() - _COMMANDS_LAST_FETCHED) if _COMMANDS_LAST_FETCHED > 0 else -1
-        
-        await ctx.send(
-            "📊 **API Request Statistics**\n\n"
-            f"📡 Total Requests: **{total}**\n"
-            f"✅ Successful: **{logger.success_count}**\n"
-            f"❌ Errors: **{logger.error_count}**\n"
-            f"📈 Success Rate: **{success_rate:.1f}%**\n\n"
-            f"📋 **Command Cache:**\n"
-            f"Commands loaded: **{cached_count}**\n"
-            f"Cache age: **{cache_age}s** (TTL: {_COMMANDS_CACHE_TTL}s)"
+        registry = get_command_registry()
+        cached_count = len(registry)
+        cache_age = int(registry.age()) if registry.loaded else -1
+        refresh = _COMMANDS_REFRESH_STATS
+
+        # Connection pool occupancy
+        pool = api.pool.stats()
+        pool_lines = [
+            f"Pool: {pool['in_flight']} in flight (limit {pool['limit']}, "
+            f"per host {pool['limit_per_host']}, DNS: {pool['resolver']})",
+            f"Connections: {pool['connections_created']} opened, {pool['connections_reused']} reused "
+            f"({pool['reuse_rate'] * 100:.0f}% reuse)",
+            f"Queue: {pool['connection_queued']} waits "
+            f"(avg {pool['connection_queue_avg_ms']:.0f}ms / max {pool['connection_queue_max_ms']:.0f}ms)",
+        ]
+        pool_lines += [
+            f"`{name}`: {ep['in_flight']}/{ep['limit'] or '∞'} "
+            f"(peak {ep['peak_in_flight']}, waiting {ep['waiting']}, "
+            f"wait max {ep['max_wait_ms']:.0f}ms)"
+            for name, ep in pool["endpoints"].items()
+        ]
+
+        # Circuit breakers and retries per endpoint
+        state_emojis = {"closed": "🟢", "half_open": "🟡", "open": "🔴"}
+        breaker_lines = []
+        for breaker in api.breakers.values():
+            b = breaker.stats()
+            line = (
+                f"{state_emojis.get(b['state'], '⚪')} `{breaker.name}`: {b['state']} "
+                f"(fail {b['consecutive_failures']}, opened {b['times_opened']}x, "
+                f"rejected {b['rejected']}, retries {api.retry_counts.get(breaker.name, 0)})"
+            )
+            if b["state"] == "open":
+                line += f" – probe in {b['retry_in']:.0f}s"
+            breaker_lines.append(line)
+
+        # Latency per endpoint, and the slowest actions by p95
+        now = time.time()
+        endpoint_lines = []
+        for name, hist in sorted(logger.endpoint_latency.items()):
+            snap = hist.snapshot(window_seconds, now)
+            if not snap["count"]:
+                continue
+            statuses = ", ".join(f"{st}: {c}" for st, c in sorted(snap["statuses"].items()))
+            endpoint_lines.append(
+                f"`{name}` n={snap['count']} p50 {snap['p50_ms']:.0f} / p95 {snap['p95_ms']:.0f} / "
+                f"p99 {snap['p99_ms']:.0f} / max {snap['max_ms']:.0f}ms, "
+                f"err {snap['error_rate'] * 100:.1f}% ({statuses})"
+            )
+
+        action_snaps = [(name, hist.snapshot(window_seconds, now)) for name, hist in logger.action_latency.items()]
+        action_snaps = sorted((a for a in action_snaps if a[1]["count"]), key=lambda a: a[1]["p95_ms"], reverse=True)
+        action_lines = [
+            f"`{name.split(':', 1)[-1]}` n={snap['count']} p50 {snap['p50_ms']:.0f} / "
+            f"p95 {snap['p95_ms']:.0f} / p99 {snap['p99_ms']:.0f}ms, err {snap['error_rate'] * 100:.0f}%"
+            for name, snap in action_snaps[:10]
+        ]
+
+        route_snaps = [(name, hist.snapshot(window_seconds, now)) for name, hist in prefix_route_latency.items()]
+        route_snaps = sorted((r for r in route_snaps if r[1]["count"]), key=lambda r: r[1]["p95_ms"], reverse=True)
+        route_lines = [
+            f"`{name}` n={snap['count']} p50 {snap['p50_ms']:.0f} / "
+            f"p95 {snap['p95_ms']:.0f} / max {snap['max_ms']:.0f}ms, err {snap['error_rate'] * 100:.0f}%"
+            for name, snap in route_snaps[:10]
+        ]
+
+        embed = discord.Embed(title="📊 API Request Statistics", color=discord.Color.blurple())
+        embed.add_field(
+            name="📡 Requests",
+            value=(
+                f"Total: **{total}** | ✅ {logger.success_count} | ❌ {logger.error_count}\n"
+                f"Success Rate: **{success_rate:.1f}%**"
+            ),
+            inline=False,
+        )
+        embed.add_field(
+            name=f"⏱️ Latency by endpoint ({window})",
+            value="\n".join(endpoint_lines)[:1024] or "No requests in this window",
+            inline=False,
+        )
+        embed.add_field(
+            name=f"🐢 Slowest actions by p95 ({window})",
+            value="\n".join(action_lines)[:1024] or "No requests in this window",
+            inline=False,
+        )
+        embed.add_field(
+            name=f"🧭 Prefix routes by p95 ({window})",
+            value="\n".join(route_lines)[:1024] or "No prefix commands in this window",
+            inline=False,
+        )
+        embed.add_field(
+            name="📋 Command Cache",
+            value=(
+                f"Commands loaded: **{cached_count}**\nCache age: **{cache_age}s** "
+                f"(TTL: {_COMMANDS_CACHE_TTL}s, hard: {_COMMANDS_HARD_TTL}s)\n"
+                f"Refreshes: {refresh['refreshes']} ({refresh['failures']} failed, "
+                f"{refresh['background_refreshes']} in background, {refresh['coalesced']} shared) | "
+                f"last {refresh['last_duration_ms']:.0f}ms / max {refresh['max_duration_ms']:.0f}ms | "
+                f"stale served {refresh['stale_served']}\n"
+                f"Sync: {refresh['full_syncs']} full / {refresh['delta_syncs']} delta / "
+                f"{refresh['not_modified']} unchanged (version `{registry.version or '-'}`, generation {registry.generation})\n"
+                f"Snapshot: {refresh['snapshot']} at startup, {refresh['snapshot_writes']} writes"
+            ),
+            inline=False,
+        )
+        embed.add_field(name="🔌 Connection Pool", value="\n".join(pool_lines)[:1024], inline=False)
+        bc = api.balance_cache.stats()
+        embed.add_field(
+            name="💰 Balance Cache",
+            value=(
+                f"Hits: **{bc['hits']}** | Misses: {bc['misses']} ({bc['hit_rate'] * 100:.0f}% hit rate)\n"
+                f"Entries: {bc['size']}/{bc['max_size']} (TTL: {bc['ttl']:g}s) | "
+                f"write-through {bc['write_throughs']}, invalidated {bc['invalidations']}, evicted {bc['evictions']}"
+            ),
+            inline=False,
+        )
+        lc = api.link_cache.stats()
+        embed.add_field(
+            name="🔗 Link Status Cache",
+            value=(
+                f"Hits: **{lc['hits']}** | Shared: {lc['coalesced']} | Misses: {lc['misses']} "
+                f"({lc['hit_rate'] * 100:.0f}% hit rate)\n"
+                f"Entries: {lc['size']} (TTL: {lc['ttl']:g}s / not linked: {lc['negative_ttl']:g}s)"
+            ),
+            inline=False,
+        )
+        tasks = task_supervisor.stats()
+        task_lines = [
+            f"`{kind}`: {k['running']} running (limit {k['limit'] or '∞'}, waiting {k['waiting']}) | "
+            f"{k['completed']} done, {k['failed']} failed, {k['cancelled']} cancelled"
+            for kind, k in tasks["kinds"].items()
+        ]
+        if tasks["reports"]:
+            last = tasks["reports"][-1]
+            task_lines.append(f"Last crash: `{last['name']}` – {last['error'][:120]}")
+        embed.add_field(
+            name="🧵 Background Tasks",
+            value="\n".join(task_lines)[:1024] or "No background tasks yet",
+            inline=False,
         )
+        embed.add_field(
+            name="⚡ Circuit Breakers",
+            value="\n".join(breaker_lines)[:1024] or "No calls yet",
+            inline=False,
+        )
+        embed.set_footer(text=f"?apistats 1m|5m|1h • ?apistats json • v:{BOT_CODE_VERSION}")
+        await ctx.send(embed=embed)
 
     @commands.command(name="version", aliases=["ver", "v"])
     async def version_command(self, ctx: commands.Context):
@@ -1896,8 +5354,9 @@ class UserVaultPrefixCommands(commands.Cog):
         """
         import sys
         
-        cached_count = len(get_cached_commands())
-        cache_age = int(time.time() - _COMMANDS_LAST_FETCHED) if _COMMANDS_LAST_FETCHED > 0 else -1
+        registry = get_command_registry()
+        cached_count = len(registry)
+        cache_age = int(registry.age()) if registry.loaded else -1
         
         embed = discord.Embed(
             title="🤖 UserVault Bot Info",
@@ -1916,7 +5375,7 @@ class UserVaultPrefixCommands(commands.Cog):
 
     @commands.command(name="balance")
     async def balance_prefix(self, ctx: commands.Context):
-        result = await ctx.bot.api.get_balance(str(ctx.author.id))  # type: ignore[attr-defined]
+        result = await ctx.bot.api.get_balance(str(ctx.author.id), fresh=True)  # type: ignore[attr-defined]
         if result.get("error"):
             await ctx.send(f"❌ Error: {result['error']}")
             return
@@ -1960,7 +5419,7 @@ class UserVaultPrefixCommands(commands.Cog):
             await ctx.send(f"❌ Insufficient balance! You have {current_balance} UC, but need {bet} UC.")
             return
         
-        result = await ctx.bot.api.spin_slots()  # type: ignore[attr-defined]
+        result = await ctx.bot.api.spin_slots(str(ctx.author.id))  # type: ignore[attr-defined]
         payout = result.get("payout", 0)
         display = result.get("display", "🎰 🎰 🎰")
         
@@ -2004,7 +5463,7 @@ class UserVaultPrefixCommands(commands.Cog):
             await ctx.send(f"❌ Insufficient balance! You have {current_balance} UC, but need {bet} UC.")
             return
         
-        result = await ctx.bot.api.flip_coin()  # type: ignore[attr-defined]
+        result = await ctx.bot.api.flip_coin(str(ctx.author.id))  # type: ignore[attr-defined]
         won = result.get("result") == choice
         emoji = result.get("emoji", "🪙")
         content = (
@@ -2045,7 +5504,7 @@ class UserVaultPrefixCommands(commands.Cog):
             await ctx.send(f"❌ Insufficient balance! You have {current_balance} UC, but need {bet} UC.")
             return
         
-        result = await ctx.bot.api.play_rps(choice)  # type: ignore[attr-defined]
+        result = await ctx.bot.api.play_rps(choice, str(ctx.author.id))  # type: ignore[attr-defined]
         if result.get("error"):
             await ctx.send(f"❌ Error: {result['error']}")
             return
@@ -2143,6 +5602,8 @@ class UserVaultPrefixCommands(commands.Cog):
 
         try:
             msg = await self.client.wait_for("message", check=check, timeout=60)
+            # Time spent waiting for the user doesn't count against the API budget
+            start_command_deadline()
             idx = int(msg.content.strip()) - 1
             if idx < 0 or idx >= len(options):
                 await ctx.send("❌ Ungültige Auswahl.")
@@ -2214,6 +5675,7 @@ class UserVaultPrefixCommands(commands.Cog):
         except asyncio.TimeoutError:
             await ctx.send("⏱️ Timeout – Account-Löschung abgebrochen.")
             return
+        start_command_deadline()
 
         # Proceed with deletion
         result = await ctx.bot.api.delete_account(str(ctx.author.id))  # type: ignore[attr-defined]
@@ -2286,8 +5748,7 @@ class UserVaultPrefixCommands(commands.Cog):
     async def users_prefix(self, ctx: commands.Context):
         """Admin command to list all registered UserVault users."""
         # Check if user is admin
-        admin_check = await ctx.bot.api.check_admin(str(ctx.author.id))  # type: ignore[attr-defined]
-        if not admin_check.get("is_admin"):
+        if not await ctx.bot.uservault_auth.is_uservault_admin(ctx.author.id):  # type: ignore[attr-defined]
             await ctx.send("❌ Admin access required!")
             return
         
@@ -2330,7 +5791,13 @@ class UserVaultPrefixCommands(commands.Cog):
         if len(pages) > 1:
             await ctx.send(f"ℹ️ Showing first {per_page} of {count} users.")
 
-    async def _execute_api_command(self, message: discord.Message, api_cmd: Dict[str, Any], content: str):
+    async def _execute_api_command(
+        self,
+        message: discord.Message,
+        api_cmd: Dict[str, Any],
+        content: str,
+        is_admin_command: Optional[bool] = None,
+    ):
         """Execute a command dynamically from the API configuration."""
         cmd_name = api_cmd.get("name", "unknown")
         
@@ -2346,24 +5813,13 @@ class UserVaultPrefixCommands(commands.Cog):
             description = api_cmd.get("description", "")
             usage = api_cmd.get("usage", f"?{cmd_name}")
             
-            # Check if this is an admin command
-            is_admin_command = category == "admin" or cmd_name in {"setbal", "addbal", "removebal", "ban", "unban", "kick", "mute", "unmute", "warn", "clearwarns"}
-            
-            # Hardcoded admin IDs that are always authorized
-            HARDCODED_ADMIN_IDS = {809976264856830022, 1132634609079824436}
-            is_hardcoded_admin = message.author.id in HARDCODED_ADMIN_IDS
+            # Check if this is an admin command (precomputed by the registry)
+            if is_admin_command is None:
+                is_admin_command = get_command_registry().is_admin_command(str(cmd_name).lower())
             
             if is_admin_command:
-                # Check admin status first (hardcoded or API)
-                is_authorized = is_hardcoded_admin
-                
-                if not is_authorized:
-                    try:
-                        admin_check = await self.client.api.check_admin(str(message.author.id))  # type: ignore[attr-defined]
-                        if admin_check.get("is_admin") or admin_check.get("is_supporter"):
-                            is_authorized = True
-                    except Exception as e:
-                        print(f"⚠️ [Dynamic Command] Could not check admin status: {e}")
+                # Hardcoded admins, UserVault admins and supporters
+                is_authorized = await self.client.uservault_auth.may_run_admin_command(message.author.id)  # type: ignore[attr-defined]
                 
                 if not is_authorized:
                     await message.reply("❌ **Admin only!** You need to be a UserVault admin or supporter.")
@@ -2371,8 +5827,8 @@ class UserVaultPrefixCommands(commands.Cog):
             else:
                 # For non-admin commands, check if user is linked
                 try:
-                    profile_result = await self.client.api.get_profile(str(message.author.id))  # type: ignore[attr-defined]
-                    if profile_result.get("error") and "not linked" in profile_result.get("error", "").lower():
+                    linked = await self.client.api.is_linked(str(message.author.id))  # type: ignore[attr-defined]
+                    if linked is False:
                         await message.reply(
                             f"❌ **Account Not Linked**\n\n"
                             f"Use `?link <code>` to link your Discord to UserVault first!\n"
@@ -2409,6 +5865,7 @@ class UserVaultPrefixCommands(commands.Cog):
                         target_user_id=target_user,
                         amount=target_amount
                     )
+                    self.client.api.balance_cache.invalidate(target_user)  # type: ignore[attr-defined]
                     
                     if result.get("error"):
                         await message.reply(f"❌ **SetBal Error:** {result['error']}")
@@ -2450,6 +5907,7 @@ class UserVaultPrefixCommands(commands.Cog):
                         target_user_id=target_user,
                         amount=amount
                     )
+                    self.client.api.balance_cache.invalidate(target_user)  # type: ignore[attr-defined]
                     
                     if result.get("error"):
                         await message.reply(f"❌ **AddBal Error:** {result['error']}")
@@ -2488,6 +5946,7 @@ class UserVaultPrefixCommands(commands.Cog):
                         target_user_id=target_user,
                         amount=amount
                     )
+                    self.client.api.balance_cache.invalidate(target_user)  # type: ignore[attr-defined]
                     
                     if result.get("error"):
                         await message.reply(f"❌ **RemoveBal Error:** {result['error']}")
@@ -2668,995 +6127,884 @@ class UserVaultPrefixCommands(commands.Cog):
             print(f"❌ [Dynamic Command] Error executing {cmd_name}: {e}")
             await message.reply(f"❌ Error executing command `{cmd_name}`. Please try again later.")
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot:
-            return
+    # ===== Built-in prefix routes (see PrefixRouter) =====
 
-        # DEBUG: Log all ? messages to verify the listener is active
-        content = (message.content or "").strip()
-        if content.startswith("?"):
-            print(f"📥 [UserVault] Received command: {content[:50]} from {message.author}")
-
-        # ===== Manual prefix handling (works even if host bot doesn't call process_commands) =====
-        # Some host bots override on_message without calling bot.process_commands().
-        # In that case, @commands.command prefix commands won't fire. We handle critical
-        # prefix commands here so they still work in extension mode.
-        lowered = content.lower()
+    async def _route_api_command(self, message: discord.Message, content: str, api_cmd: Dict[str, Any], is_admin_command: bool):
+        """Registry command - executed dynamically through the API"""
+        if not api_cmd.get("is_enabled", True):
+            await message.reply(f"ℹ️ Command `{api_cmd.get('name')}` is currently disabled.")
+            return
+        await self._execute_api_command(message, api_cmd, content, is_admin_command=is_admin_command)
 
-        # ===== ?help / ?helping - List all commands =====
-        if lowered in {"?help", "?helping", "?commands"}:
-            try:
-                result = await self.client.api.get_bot_commands()  # type: ignore[attr-defined]
-            except Exception as e:
-                await message.reply(f"❌ Failed to load commands: {e}")
-                return
-            
-            if result.get("error"):
-                await message.reply(f"❌ {result['error']}")
-                return
+    async def _route_help(self, message: discord.Message, content: str):
+        """?help / ?helping [command] - List all commands, or details for one"""
+        try:
+            registry = await fetch_commands_from_api(self.client.api)  # type: ignore[attr-defined]
+        except Exception as e:
+            await message.reply(f"❌ Failed to load commands: {e}")
+            return
             
-            cmds = result.get("commands", [])
-            if not cmds:
-                await message.reply("📋 No commands available.")
+        parts = content.split(None, 2)
+        if len(parts) > 1:
+            command_name = parts[1].lstrip("?")
+            embed = get_help_pages(registry).command_embed(command_name.lower())
+            if embed is None:
+                await message.reply(f"❌ Command `{command_name}` not found. Use `?help` to see all commands.")
                 return
+            await message.reply(embed=embed)
+            return
             
-            # Group by category
-            categories: Dict[str, List[dict]] = {}
-            for cmd in cmds:
-                cat = cmd.get("category") or "other"
-                if cat not in categories:
-                    categories[cat] = []
-                categories[cat].append(cmd)
-            
-            embed = discord.Embed(
-                title="📋 UserVault Bot Commands",
-                description="All available prefix commands:",
-                color=discord.Color.blurple(),
-            )
-            
-            cat_emojis = {
-                "games": "🎮",
-                "utility": "🔧",
-                "admin": "👮",
-                "other": "📦",
-            }
-            
-            for cat, cat_cmds in categories.items():
-                emoji = cat_emojis.get(cat, "📦")
-                lines = []
-                for c in cat_cmds:
-                    usage = c.get("usage") or f"?{c.get('name', '???')}"
-                    desc = c.get("description") or ""
-                    lines.append(f"`{usage}` – {desc[:50]}")
-                embed.add_field(
-                    name=f"{emoji} {cat.capitalize()}",
-                    value="\n".join(lines) or "–",
-                    inline=False,
-                )
+        if not registry.enabled:
+            await message.reply("📋 No commands available.")
+            return
             
-            embed.set_footer(text="uservault.cc")
+        # Rendered once per registry generation, served from memory
+        await send_help(message, message.author.id, registry)
+
+    async def _route_reload(self, message: discord.Message, content: str):
+        """?reload - Admin only extension reload"""
+        # Bot owner, ADMIN_USER_IDS, or a UserVault admin/supporter
+        is_authorized = await self.client.uservault_auth.may_manage_bot(message.author.id)  # type: ignore[attr-defined]
             
-            try:
-                await message.reply(embed=embed)
-            except discord.Forbidden:
-                # Fallback to text
-                text_lines = ["**📋 UserVault Bot Commands**\n"]
-                for cat, cat_cmds in categories.items():
-                    text_lines.append(f"**{cat.capitalize()}:**")
-                    for c in cat_cmds:
-                        usage = c.get("usage") or f"?{c.get('name', '???')}"
-                        text_lines.append(f"  {usage}")
-                await message.reply("\n".join(text_lines))
-            return
-
-        # ===== ?reload - Admin only extension reload =====
-        if lowered == "?reload":
-            # Check if user is bot owner, in env admin list, or a UserVault admin/supporter
-            admin_ids_str = os.getenv("ADMIN_USER_IDS", "")
-            admin_ids = {int(x.strip()) for x in admin_ids_str.split(",") if x.strip().isdigit()}
-            
-            app_info = getattr(self.client, "application", None)
-            owner_id = getattr(app_info, "owner", None)
-            owner_id = getattr(owner_id, "id", None) if owner_id else None
-            
-            is_authorized = message.author.id in admin_ids or message.author.id == owner_id
-            
-            # Also check UserVault admin or supporter role if not already authorized
-            if not is_authorized:
-                api = getattr(self.client, "api", None)
-                if api:
-                    try:
-                        result = await api.check_admin(str(message.author.id))
-                        if result.get("is_admin") or result.get("is_supporter"):
-                            is_authorized = True
-                        # Debug logging
-                        print(f"🔍 [reload] Admin check for {message.author.id}: {result}")
-                    except Exception as e:
-                        print(f"⚠️ Could not check UserVault admin status: {e}")
+        if not is_authorized:
+            await message.reply("❌ Admin only command. You need to be a UserVault admin or supporter.")
+            return
             
-            if not is_authorized:
-                await message.reply("❌ Admin only command. You need to be a UserVault admin or supporter.")
+        try:
+            # Attempt to reload the extension
+            # Use the Cog's module name (more robust than __name__ in some reload contexts)
+            ext_name = self.__class__.__module__
+            if ext_name == "__main__":
+                await message.reply("⚠️ Cannot reload in standalone mode. Restart the bot instead.")
                 return
-            
-            try:
-                # Attempt to reload the extension
-                # Use the Cog's module name (more robust than __name__ in some reload contexts)
-                ext_name = self.__class__.__module__
-                if ext_name == "__main__":
-                    await message.reply("⚠️ Cannot reload in standalone mode. Restart the bot instead.")
-                    return
 
-                # Proactively remove the cog/listeners to avoid duplicate handlers and to ensure
-                # the new module instance can re-register cleanly.
-                try:
-                    if self.client.get_cog("UserVaultPrefixCommands") is not None:
-                        self.client.remove_cog("UserVaultPrefixCommands")
-                except Exception as e:
-                    print(f"⚠️ [UserVault] Could not remove prefix cog before reload: {e}")
+            # Proactively remove the cog/listeners to avoid duplicate handlers and to ensure
+            # the new module instance can re-register cleanly.
+            try:
+                if self.client.get_cog("UserVaultPrefixCommands") is not None:
+                    self.client.remove_cog("UserVaultPrefixCommands")
+            except Exception as e:
+                print(f"⚠️ [UserVault] Could not remove prefix cog before reload: {e}")
                 
-                # Clear the flag so the cog gets re-added on reload
-                if hasattr(self.client, "_uservault_prefix_cog_loaded"):
-                    del self.client._uservault_prefix_cog_loaded
+            # Clear the flag so the cog gets re-added on reload
+            if hasattr(self.client, "_uservault_prefix_cog_loaded"):
+                del self.client._uservault_prefix_cog_loaded
 
-                # Clear cached implemented command set so unknown-command detection stays accurate
-                if hasattr(self.client, "_uservault_implemented_prefix_cmds"):
-                    del self.client._uservault_implemented_prefix_cmds
-                
-                # Cancel notification task if running (will restart on reload)
-                if hasattr(self.client, "_uservault_notification_task"):
-                    task = self.client._uservault_notification_task
-                    if task and not task.done():
-                        task.cancel()
-                    del self.client._uservault_notification_task
+            # Clear cached implemented command set so unknown-command detection stays accurate
+            if hasattr(self.client, "_uservault_implemented_prefix_cmds"):
+                del self.client._uservault_implemented_prefix_cmds
                 
-                # Vor dem Reload: Commands aus API laden
-                try:
-                    cmd_data = await fetch_commands_from_api(self.client.api, force=True)
-                    commands_list = cmd_data.get("commands", [])
-                    print(f"✅ [Reload] Loaded {len(commands_list)} commands from API before reload")
-                    
-                    # Notification an Kanal senden
-                    try:
-                        channel = self.client.get_channel(COMMAND_UPDATES_CHANNEL_ID)
-                        if channel:
-                            embed = discord.Embed(
-                                title="🔄 Extension Reload",
-                                description=f"**{len(commands_list)}** Commands geladen vor dem Reload.",
-                                color=discord.Color.green(),
-                                timestamp=discord.utils.utcnow()
-                            )
-                            embed.add_field(name="Version", value=f"`{BOT_CODE_VERSION}`", inline=True)
-                            embed.add_field(name="Initiated by", value=message.author.mention, inline=True)
-                            embed.set_footer(text="UserVault Bot Reload System")
-                            await channel.send(embed=embed)
-                    except Exception as e:
-                        print(f"⚠️ [Reload] Konnte Notification nicht senden: {e}")
-                        
-                except Exception as e:
-                    print(f"⚠️ [Reload] Konnte Commands nicht laden vor Reload: {e}")
+            # Cancel notification task if running (will restart on reload)
+            if hasattr(self.client, "_uservault_notification_task"):
+                task = self.client._uservault_notification_task
+                if task and not task.done():
+                    task.cancel()
+                del self.client._uservault_notification_task
                 
-                await message.reply("🔄 Reloading extension...")
-                await self.client.reload_extension(ext_name)
-                # Send a confirmation after successful reload.
-                # (This coroutine continues even though the module code was reloaded.)
-                try:
-                    await message.channel.send("✅ Reload complete. Commands should work immediately.")
-                except Exception:
-                    pass
-            except Exception as e:
-                await message.reply(f"❌ Reload failed: {e}")
-            return
-
-        # ===== ?restart - Admin only process restart (standalone only) =====
-        if lowered == "?restart":
-            # Same authorization logic as ?reload
-            admin_ids_str = os.getenv("ADMIN_USER_IDS", "")
-            admin_ids = {int(x.strip()) for x in admin_ids_str.split(",") if x.strip().isdigit()}
-
-            app_info = getattr(self.client, "application", None)
-            owner_id = getattr(app_info, "owner", None)
-            owner_id = getattr(owner_id, "id", None) if owner_id else None
-
-            is_authorized = message.author.id in admin_ids or message.author.id == owner_id
-
-            if not is_authorized:
-                api = getattr(self.client, "api", None)
-                if api:
-                    try:
-                        result = await api.check_admin(str(message.author.id))
-                        if result.get("is_admin") or result.get("is_supporter"):
-                            is_authorized = True
-                        print(f"🔍 [restart] Admin check for {message.author.id}: {result}")
-                    except Exception as e:
-                        print(f"⚠️ Could not check UserVault admin status: {e}")
-
-            if not is_authorized:
-                await message.reply("❌ Admin only command. You need to be a UserVault admin or supporter.")
-                return
-
-            # Never kill a host bot when loaded as extension
-            if _RUNNING_AS_EXTENSION or self.__class__.__module__ != "__main__":
-                await message.reply(
-                    "⚠️ `?restart` ist im Extension-Modus deaktiviert (würde den Host-Bot killen). "
-                    "Nutze `?reload` oder starte den Host-Prozess neu."
-                )
-                return
-
-            await message.reply("🧨 Restarting bot process now…")
-            
-            # Vor dem Restart: Commands aus API laden und Notification senden
+            # Vor dem Reload: Commands aus API laden
             try:
-                cmd_data = await fetch_commands_from_api(self.client.api, force=True)
-                commands_list = cmd_data.get("commands", [])
-                print(f"✅ [Restart] Loaded {len(commands_list)} commands from API before restart")
-                
-                # Notification an Kanal 1464326431038247002 senden
+                registry = await fetch_commands_from_api(self.client.api, force=True)
+                print(f"✅ [Reload] Loaded {len(registry)} commands from API before reload")
+                    
+                # Notification an Kanal senden
                 try:
                     channel = self.client.get_channel(COMMAND_UPDATES_CHANNEL_ID)
                     if channel:
                         embed = discord.Embed(
-                            title="🔄 Bot Restart",
-                            description=f"**{len(commands_list)}** Commands geladen vor dem Neustart.",
-                            color=discord.Color.blue(),
+                            title="🔄 Extension Reload",
+                            description=f"**{len(registry)}** Commands geladen vor dem Reload.",
+                            color=discord.Color.green(),
                             timestamp=discord.utils.utcnow()
                         )
                         embed.add_field(name="Version", value=f"`{BOT_CODE_VERSION}`", inline=True)
                         embed.add_field(name="Initiated by", value=message.author.mention, inline=True)
-                        embed.set_footer(text="UserVault Bot Restart System")
+                        embed.set_footer(text="UserVault Bot Reload System")
                         await channel.send(embed=embed)
                 except Exception as e:
-                    print(f"⚠️ [Restart] Konnte Notification nicht senden: {e}")
-                    
+                    print(f"⚠️ [Reload] Konnte Notification nicht senden: {e}")
+                        
             except Exception as e:
-                print(f"⚠️ [Restart] Konnte Commands nicht laden vor Restart: {e}")
-            
-            await asyncio.sleep(2)  # Kurze Pause damit die Nachricht gesendet wird
-            
+                print(f"⚠️ [Reload] Konnte Commands nicht laden vor Reload: {e}")
+                
+            await message.reply("🔄 Reloading extension...")
+            await self.client.reload_extension(ext_name)
+            # Send a confirmation after successful reload.
+            # (This coroutine continues even though the module code was reloaded.)
             try:
-                await self.client.close()
-            finally:
-                # Restart the bot process by re-executing the script
-                import sys
-                python = sys.executable
-                script = os.path.abspath(sys.argv[0])
-                args = sys.argv[1:]
-                print(f"🔄 Restarting: {python} {script} {' '.join(args)}")
-                os.execv(python, [python, script] + args)
+                await message.channel.send("✅ Reload complete. Commands should work immediately.")
+            except Exception:
+                pass
+        except Exception as e:
+            await message.reply(f"❌ Reload failed: {e}")
+
+    async def _route_restart(self, message: discord.Message, content: str):
+        """?restart - Admin only process restart (standalone only)"""
+        # Bot owner, ADMIN_USER_IDS, or a UserVault admin/supporter
+        is_authorized = await self.client.uservault_auth.may_manage_bot(message.author.id)  # type: ignore[attr-defined]
 
-        # ===== ?ping - Simple connectivity test =====
-        if lowered == "?ping":
-            await message.reply("🏓 Pong! Bot is responding.")
+        if not is_authorized:
+            await message.reply("❌ Admin only command. You need to be a UserVault admin or supporter.")
             return
 
-        # ===== ?balance - Show balance =====
-        if lowered == "?balance":
-            try:
-                result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
-                if result.get("error"):
-                    await message.reply(f"❌ Error: {result['error']}")
-                else:
-                    await message.reply(
-                        f"💰 **Your Balance**\n\n"
-                        f"Balance: **{result.get('balance', 0)} UC**\n"
-                        f"Total Earned: {result.get('totalEarned', 0)} UC"
-                    )
-            except Exception as e:
-                await message.reply(f"❌ Could not fetch balance: {e}")
+        # Never kill a host bot when loaded as extension
+        if _RUNNING_AS_EXTENSION or self.__class__.__module__ != "__main__":
+            await message.reply(
+                "⚠️ `?restart` ist im Extension-Modus deaktiviert (würde den Host-Bot killen). "
+                "Nutze `?reload` oder starte den Host-Prozess neu."
+            )
             return
 
-        # ===== ?daily - Claim daily reward =====
-        if lowered == "?daily":
+        await message.reply("🧨 Restarting bot process now…")
+            
+        # Vor dem Restart: Commands aus API laden und Notification senden
+        try:
+            registry = await fetch_commands_from_api(self.client.api, force=True)
+            print(f"✅ [Restart] Loaded {len(registry)} commands from API before restart")
+                
+            # Notification an Kanal 1464326431038247002 senden
             try:
-                result = await self.client.api.claim_daily(str(message.author.id))  # type: ignore[attr-defined]
-                if result.get("error"):
-                    await message.reply(f"❌ {result['error']}")
-                else:
-                    await message.reply(
-                        f"📅 **Daily Reward**\n\n"
-                        f"🎉 Claimed **{result.get('reward', 50)} UC**!\n"
-                        f"🔥 Streak: {result.get('streak', 1)} days\n"
-                        f"💰 New Balance: {result.get('newBalance', 0)} UC"
+                channel = self.client.get_channel(COMMAND_UPDATES_CHANNEL_ID)
+                if channel:
+                    embed = discord.Embed(
+                        title="🔄 Bot Restart",
+                        description=f"**{len(registry)}** Commands geladen vor dem Neustart.",
+                        color=discord.Color.blue(),
+                        timestamp=discord.utils.utcnow()
                     )
+                    embed.add_field(name="Version", value=f"`{BOT_CODE_VERSION}`", inline=True)
+                    embed.add_field(name="Initiated by", value=message.author.mention, inline=True)
+                    embed.set_footer(text="UserVault Bot Restart System")
+                    await channel.send(embed=embed)
             except Exception as e:
-                await message.reply(f"❌ Could not claim daily: {e}")
-            return
-
-        # ===== ?version - Show bot version =====
-        if lowered == "?version":
-            embed = discord.Embed(
-                title="🤖 Bot Version",
-                description=f"**Version:** `{BOT_CODE_VERSION}`",
-                color=0x5865F2,
-            )
+                print(f"⚠️ [Restart] Konnte Notification nicht senden: {e}")
+                    
+        except Exception as e:
+            print(f"⚠️ [Restart] Konnte Commands nicht laden vor Restart: {e}")
+            
+        await asyncio.sleep(2)  # Kurze Pause damit die Nachricht gesendet wird
+            
+        try:
+            await self.client.close()
+        finally:
+            # Restart the bot process by re-executing the script
+            import sys
+            python = sys.executable
+            script = os.path.abspath(sys.argv[0])
+            args = sys.argv[1:]
+            print(f"🔄 Restarting: {python} {script} {' '.join(args)}")
+            os.execv(python, [python, script] + args)
+
+    async def _route_ping(self, message: discord.Message, content: str):
+        """?ping - Simple connectivity test"""
+        await message.reply("🏓 Pong! Bot is responding.")
+
+    async def _route_balance(self, message: discord.Message, content: str):
+        """?balance - Show balance"""
+        try:
+            result = await self.client.api.get_balance(str(message.author.id), fresh=True)  # type: ignore[attr-defined]
+            if result.get("error"):
+                await message.reply(f"❌ Error: {result['error']}")
+            else:
+                await message.reply(
+                    f"💰 **Your Balance**\n\n"
+                    f"Balance: **{result.get('balance', 0)} UC**\n"
+                    f"Total Earned: {result.get('totalEarned', 0)} UC"
+                )
+        except Exception as e:
+            await message.reply(f"❌ Could not fetch balance: {e}")
 
-            embed.add_field(name="Mode", value="extension" if _RUNNING_AS_EXTENSION else "standalone", inline=True)
-            embed.add_field(name="PID", value=str(os.getpid()), inline=True)
-            embed.add_field(name="Module", value=f"`{self.__class__.__module__}`", inline=False)
-            embed.add_field(name="Running file", value=f"`{os.path.abspath(__file__)}`", inline=False)
-            embed.add_field(name="API Endpoint", value=f"`{FUNCTIONS_BASE_URL}`", inline=False)
+    async def _route_daily(self, message: discord.Message, content: str):
+        """?daily - Claim daily reward"""
+        try:
+            result = await self.client.api.claim_daily(str(message.author.id))  # type: ignore[attr-defined]
+            if result.get("error"):
+                await message.reply(f"❌ {result['error']}")
+            else:
+                await message.reply(
+                    f"📅 **Daily Reward**\n\n"
+                    f"🎉 Claimed **{result.get('reward', 50)} UC**!\n"
+                    f"🔥 Streak: {result.get('streak', 1)} days\n"
+                    f"💰 New Balance: {result.get('newBalance', 0)} UC"
+                )
+        except Exception as e:
+            await message.reply(f"❌ Could not claim daily: {e}")
 
-            embed.set_footer(text=f"UserVault Bot • {BOT_CODE_VERSION}")
-            await message.reply(embed=embed)
-            return
+    async def _route_version(self, message: discord.Message, content: str):
+        """?version - Show bot version"""
+        embed = discord.Embed(
+            title="🤖 Bot Version",
+            description=f"**Version:** `{BOT_CODE_VERSION}`",
+            color=0x5865F2,
+        )
 
-        # ===== ?crash - Crash game =====
-        if lowered.startswith("?crash"):
-            parts = content.split()
-            bet = 50  # Default bet
-            if len(parts) > 1:
-                try:
-                    bet = int(parts[1])
-                except ValueError:
-                    await message.reply("❌ Ungültiger Einsatz! Nutze: `?crash <einsatz>`")
-                    return
-            
-            if bet < 10:
-                await message.reply("❌ Minimum Einsatz ist 10 UC!")
+        embed.add_field(name="Mode", value="extension" if _RUNNING_AS_EXTENSION else "standalone", inline=True)
+        embed.add_field(name="PID", value=str(os.getpid()), inline=True)
+        embed.add_field(name="Module", value=f"`{self.__class__.__module__}`", inline=False)
+        embed.add_field(name="Running file", value=f"`{os.path.abspath(__file__)}`", inline=False)
+        embed.add_field(name="API Endpoint", value=f"`{FUNCTIONS_BASE_URL}`", inline=False)
+
+        embed.set_footer(text=f"UserVault Bot • {BOT_CODE_VERSION}")
+        await message.reply(embed=embed)
+
+    async def _route_crash(self, message: discord.Message, content: str):
+        """?crash [bet] [target x] [replay] - Crash game, live or with auto-cashout"""
+        parts = content.split()
+        bet = 50  # Default bet
+        target = None
+        if len(parts) > 1:
+            try:
+                bet = int(parts[1])
+            except ValueError:
+                await message.reply("❌ Ungültiger Einsatz! Nutze: `?crash <einsatz> [ziel]x`")
                 return
-            
-            # Check balance
-            balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
-            current_balance = safe_int_balance(balance_result.get("balance", 0))
-            if current_balance < bet:
-                await message.reply(f"❌ Nicht genug Guthaben! Du hast {current_balance} UC.")
+        if len(parts) > 2:
+            try:
+                target = parse_crash_target(parts[2])
+            except ValueError:
+                await message.reply(
+                    f"❌ Ungültiges Ziel! Nutze: `?crash <einsatz> <ziel>x [replay]`, z.B. `?crash 100 2x` "
+                    f"(x{CRASH_MIN_TARGET:.2f} – x{CRASH_MAX_TARGET:.0f})"
+                )
                 return
+        replay = len(parts) > 3 and parts[3].lower() in {"replay", "r"}
             
-            view = CrashView(self.client, message.author.id, bet)
-            asyncio.create_task(view.start_game(message.channel))
+        if bet < 10:
+            await message.reply("❌ Minimum Einsatz ist 10 UC!")
             return
-
-        # ===== ?mines - Minesweeper game =====
-        if lowered.startswith("?mines"):
-            parts = content.split()
-            bet = 50  # Default bet
-            if len(parts) > 1:
-                try:
-                    bet = int(parts[1])
-                except ValueError:
-                    await message.reply("❌ Ungültiger Einsatz! Nutze: `?mines <einsatz>`")
-                    return
             
-            if bet < 10:
-                await message.reply("❌ Minimum Einsatz ist 10 UC!")
-                return
-            
-            # Check balance
-            balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
-            current_balance = safe_int_balance(balance_result.get("balance", 0))
-            if current_balance < bet:
-                await message.reply(f"❌ Nicht genug Guthaben! Du hast {current_balance} UC.")
-                return
+        # Check balance
+        balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
+        current_balance = safe_int_balance(balance_result.get("balance", 0))
+        if current_balance < bet:
+            await message.reply(f"❌ Nicht genug Guthaben! Du hast {current_balance} UC.")
+            return
             
-            view = MinesView(self.client, message.author.id, bet)
-            embed = view.create_embed()
-            await message.reply(embed=embed, view=view)
+        if target is not None:
+            # Resolved and settled right away; the replay is only cosmetic
+            round_ = AutoCrashRound(message.author.id, bet, target)
+            await round_.settle(self.client.api)  # type: ignore[attr-defined]
+            reply = await message.reply(embed=round_.create_embed(game_over=not replay))
+            if replay:
+                round_.start_replay(reply)
             return
 
-        # ===== ?higherlower / ?hl - Higher or Lower game =====
-        if lowered.startswith("?higherlower") or lowered.startswith("?hl ") or lowered == "?hl":
-            parts = content.split()
-            bet = 50  # Default bet
-            if len(parts) > 1:
-                try:
-                    bet = int(parts[1])
-                except ValueError:
-                    await message.reply("❌ Ungültiger Einsatz! Nutze: `?higherlower <einsatz>` oder `?hl <einsatz>`")
-                    return
-            
-            if bet < 10:
-                await message.reply("❌ Minimum Einsatz ist 10 UC!")
+        view = CrashView(self.client, message.author.id, bet)
+        task_supervisor.spawn("game", view.start_game(message.channel), name=f"crash:{message.author.id}")
+
+    async def _route_crashround(self, message: discord.Message, content: str):
+        """?crashround [bet] [target x] - Join this channel's multiplayer Crash round"""
+        parts = content.split()
+        bet = 50  # Default bet
+        target = None
+        if len(parts) > 1:
+            try:
+                bet = int(parts[1])
+            except ValueError:
+                await message.reply("❌ Ungültiger Einsatz! Nutze: `?crashround <einsatz> [ziel]x`")
                 return
-            
-            # Check balance (no max limit - only balance dependent)
-            balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
-            current_balance = safe_int_balance(balance_result.get("balance", 0))
-            if current_balance < bet:
-                await message.reply(f"❌ Nicht genug Guthaben! Du hast {current_balance} UC.")
+        if len(parts) > 2:
+            try:
+                target = parse_crash_target(parts[2])
+            except ValueError:
+                await message.reply(f"❌ Ungültiges Ziel! Erlaubt: x{CRASH_MIN_TARGET:.2f} – x{CRASH_MAX_TARGET:.0f}")
                 return
-            
-            view = HigherLowerView(self.client, message.author.id, bet)
-            embed = view.create_embed()
-            await message.reply(embed=embed, view=view)
+
+        if bet < 10:
+            await message.reply("❌ Minimum Einsatz ist 10 UC!")
             return
 
-        # ===== ?roulette - Roulette game =====
-        if lowered.startswith("?roulette"):
-            parts = content.split()
-            
-            # Usage: ?roulette <bet> <wette>
-            # Wetten: red, black, odd, even, 0-36
-            if len(parts) < 3:
-                await message.reply(
-                    "🎰 **Roulette Usage:**\n"
-                    "`?roulette <einsatz> <wette>`\n\n"
-                    "**Wetten:**\n"
-                    "• `red` / `black` - Farbe (2x)\n"
-                    "• `odd` / `even` - Ungerade/Gerade (2x)\n"
-                    "• `0-36` - Einzelne Zahl (36x)\n\n"
-                    "Beispiel: `?roulette 100 red`"
-                )
-                return
-            
+        balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
+        current_balance = safe_int_balance(balance_result.get("balance", 0))
+        if current_balance < bet:
+            await message.reply(f"❌ Nicht genug Guthaben! Du hast {current_balance} UC.")
+            return
+
+        round_ = crash_rounds.get(message.channel.id)
+        if round_ is None:
+            # Running before the opener's bet is booked, so the round is settled whatever happens to this handler
+            round_ = crash_rounds[message.channel.id] = CrashRoundView(self.client, message.channel)
+            task_supervisor.spawn("game", round_.run(), name=f"crash-round:{message.channel.id}")
+        error = await round_.join(message.author, bet, target)
+        if error:
+            await message.reply(error)
+            return
+        try:
+            await message.add_reaction("🚀")
+        except discord.HTTPException:
+            pass
+
+    async def _route_mines(self, message: discord.Message, content: str):
+        """?mines - Minesweeper game"""
+        parts = content.split()
+        bet = 50  # Default bet
+        if len(parts) > 1:
             try:
                 bet = int(parts[1])
             except ValueError:
-                await message.reply("❌ Ungültiger Einsatz!")
+                await message.reply("❌ Ungültiger Einsatz! Nutze: `?mines <einsatz>`")
                 return
             
-            if bet < 10:
-                await message.reply("❌ Minimum Einsatz ist 10 UC!")
-                return
+        if bet < 10:
+            await message.reply("❌ Minimum Einsatz ist 10 UC!")
+            return
             
-            wette = parts[2].lower()
-            
-            # Validate bet type
-            valid_colors = {"red", "rot", "black", "schwarz"}
-            valid_parity = {"odd", "ungerade", "even", "gerade"}
-            valid_number = set(str(i) for i in range(37))
-            
-            bet_type = None
-            bet_value = None
-            
-            if wette in valid_colors:
-                bet_type = "color"
-                bet_value = "red" if wette in {"red", "rot"} else "black"
-            elif wette in valid_parity:
-                bet_type = "parity"
-                bet_value = "odd" if wette in {"odd", "ungerade"} else "even"
-            elif wette in valid_number:
-                bet_type = "number"
-                bet_value = int(wette)
-            else:
-                await message.reply(
-                    "❌ Ungültige Wette! Erlaubt: `red`, `black`, `odd`, `even`, `0-36`"
-                )
-                return
+        # Check balance
+        balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
+        current_balance = safe_int_balance(balance_result.get("balance", 0))
+        if current_balance < bet:
+            await message.reply(f"❌ Nicht genug Guthaben! Du hast {current_balance} UC.")
+            return
             
-            # Check balance
-            balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
-            current_balance = safe_int_balance(balance_result.get("balance", 0))
-            if current_balance < bet:
-                await message.reply(f"❌ Nicht genug Guthaben! Du hast {current_balance} UC.")
+        view = MinesView(self.client, message.author.id, bet)
+        embed = view.create_embed()
+        await message.reply(embed=embed, view=view)
+
+    async def _route_higherlower(self, message: discord.Message, content: str):
+        """?higherlower / ?hl - Higher or Lower game"""
+        parts = content.split()
+        bet = 50  # Default bet
+        if len(parts) > 1:
+            try:
+                bet = int(parts[1])
+            except ValueError:
+                await message.reply("❌ Ungültiger Einsatz! Nutze: `?higherlower <einsatz>` oder `?hl <einsatz>`")
                 return
             
-            # Roulette numbers and colors
-            red_numbers = {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}
-            
-            # Spin the wheel
-            import random
-            result_num = random.randint(0, 36)
-            result_color = "green" if result_num == 0 else ("red" if result_num in red_numbers else "black")
-            result_parity = None if result_num == 0 else ("odd" if result_num % 2 == 1 else "even")
-            
-            # Color emojis
-            color_emoji = {"red": "🔴", "black": "⚫", "green": "🟢"}
-            
-            # Check win
-            won = False
-            multiplier = 0
-            
-            if bet_type == "color":
-                won = (bet_value == result_color)
-                multiplier = 2
-            elif bet_type == "parity":
-                won = (result_num != 0 and bet_value == result_parity)
-                multiplier = 2
-            elif bet_type == "number":
-                won = (bet_value == result_num)
-                multiplier = 36
-            
-            # Calculate winnings
-            if won:
-                winnings = bet * multiplier
-                # Add winnings (net profit)
-                await self.client.api.send_reward(  # type: ignore[attr-defined]
-                    str(message.author.id),
-                    winnings - bet,  # Net profit
-                    "roulette",
-                    f"Roulette win ({bet_type}: {bet_value})"
-                )
-                result_text = f"🎉 **GEWONNEN!** +{winnings} UC (x{multiplier})"
-            else:
-                # Deduct bet
-                await self.client.api.send_reward(  # type: ignore[attr-defined]
-                    str(message.author.id),
-                    -bet,
-                    "roulette",
-                    f"Roulette loss ({bet_type}: {bet_value})"
-                )
-                result_text = f"❌ **Verloren!** -{bet} UC"
+        if bet < 10:
+            await message.reply("❌ Minimum Einsatz ist 10 UC!")
+            return
             
-            # Build response embed
-            embed = discord.Embed(
-                title="🎰 Roulette",
-                color=discord.Color.green() if won else discord.Color.red()
-            )
-            embed.add_field(
-                name="Ergebnis",
-                value=f"{color_emoji[result_color]} **{result_num}** ({result_color.upper()})",
-                inline=True
-            )
-            embed.add_field(
-                name="Deine Wette",
-                value=f"{bet} UC auf **{bet_value}**",
-                inline=True
-            )
-            embed.add_field(
-                name="Resultat",
-                value=result_text,
-                inline=False
+        # Check balance (no max limit - only balance dependent)
+        balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
+        current_balance = safe_int_balance(balance_result.get("balance", 0))
+        if current_balance < bet:
+            await message.reply(f"❌ Nicht genug Guthaben! Du hast {current_balance} UC.")
+            return
+            
+        view = HigherLowerView(self.client, message.author.id, bet)
+        embed = view.create_embed()
+        await message.reply(embed=embed, view=view)
+
+    async def _route_roulette(self, message: discord.Message, content: str):
+        """?roulette - Roulette game"""
+        parts = content.split()
+            
+        # Usage: ?roulette <bet> <wette>
+        # Wetten: red, black, odd, even, 0-36
+        if len(parts) < 3:
+            await message.reply(
+                "🎰 **Roulette Usage:**\n"
+                "`?roulette <einsatz> <wette>`\n\n"
+                "**Wetten:**\n"
+                "• `red` / `black` - Farbe (2x)\n"
+                "• `odd` / `even` - Ungerade/Gerade (2x)\n"
+                "• `0-36` - Einzelne Zahl (36x)\n\n"
+                "Beispiel: `?roulette 100 red`"
             )
-            embed.set_footer(text="Viel Glück beim nächsten Spin!")
+            return
+            
+        try:
+            bet = int(parts[1])
+        except ValueError:
+            await message.reply("❌ Ungültiger Einsatz!")
+            return
             
-            await message.reply(embed=embed)
+        if bet < 10:
+            await message.reply("❌ Minimum Einsatz ist 10 UC!")
             return
-
-        # ── ?dice ── Dice Duel game
-        if lowered.startswith("?dice"):
-            parts = content.split()
-            if len(parts) < 2:
-                await message.reply(
-                    "🎲 **Dice Duel**\n"
-                    "Roll dice against the bot - highest roll wins!\n\n"
-                    "Usage: `?dice <bet>`\n"
-                    "Example: `?dice 100`\n\n"
-                    "• Win: **2x** your bet\n"
-                    "• Tie: Bet returned"
-                )
-                return
             
-            bet_str = parts[1].replace(",", "")
-            if not bet_str.isdigit() or int(bet_str) < 10:
-                await message.reply("❌ Minimum bet is 10 UC!")
-                return
+        wette = parts[2].lower()
             
-            bet = int(bet_str)
+        # Validate bet type
+        valid_colors = {"red", "rot", "black", "schwarz"}
+        valid_parity = {"odd", "ungerade", "even", "gerade"}
+        valid_number = set(str(i) for i in range(37))
             
-            # Check balance
-            balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
-            current_balance = safe_int_balance(balance_result.get("balance", 0))
-            if current_balance < bet:
-                await message.reply(f"❌ Not enough UC! You have **{current_balance:,} UC**.")
-                return
+        bet_type = None
+        bet_value = None
             
-            # Roll dice (2d6 each)
-            import random
-            player_d1 = random.randint(1, 6)
-            player_d2 = random.randint(1, 6)
-            bot_d1 = random.randint(1, 6)
-            bot_d2 = random.randint(1, 6)
+        if wette in valid_colors:
+            bet_type = "color"
+            bet_value = "red" if wette in {"red", "rot"} else "black"
+        elif wette in valid_parity:
+            bet_type = "parity"
+            bet_value = "odd" if wette in {"odd", "ungerade"} else "even"
+        elif wette in valid_number:
+            bet_type = "number"
+            bet_value = int(wette)
+        else:
+            await message.reply(
+                "❌ Ungültige Wette! Erlaubt: `red`, `black`, `odd`, `even`, `0-36`"
+            )
+            return
             
-            player_total = player_d1 + player_d2
-            bot_total = bot_d1 + bot_d2
+        # Check balance
+        balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
+        current_balance = safe_int_balance(balance_result.get("balance", 0))
+        if current_balance < bet:
+            await message.reply(f"❌ Nicht genug Guthaben! Du hast {current_balance} UC.")
+            return
             
-            # Dice emojis
-            dice_emoji = {1: "⚀", 2: "⚁", 3: "⚂", 4: "⚃", 5: "⚄", 6: "⚅"}
+        # Spin the wheel
+        spin = game_engine.spin_roulette(bet_type, bet_value, str(message.author.id))
+        result_num = spin["number"]
+        result_color = spin["color"]
+        won = spin["won"]
+        multiplier = spin["multiplier"]
             
-            player_display = f"{dice_emoji[player_d1]} {dice_emoji[player_d2]} = **{player_total}**"
-            bot_display = f"{dice_emoji[bot_d1]} {dice_emoji[bot_d2]} = **{bot_total}**"
+        # Color emojis
+        color_emoji = {"red": "🔴", "black": "⚫", "green": "🟢"}
             
-            # Determine winner
-            if player_total > bot_total:
-                result_text = f"🎉 **YOU WIN!** +{bet:,} UC"
-                color = discord.Color.green()
-                # Award winnings (net profit = bet)
-                await self.client.api.send_reward(  # type: ignore[attr-defined]
-                    str(message.author.id), bet, "dice", "Dice Duel win"
-                )
-            elif player_total < bot_total:
-                result_text = f"💀 **Bot wins!** -{bet:,} UC"
-                color = discord.Color.red()
-                # Deduct bet
-                await self.client.api.send_reward(  # type: ignore[attr-defined]
-                    str(message.author.id), -bet, "dice", "Dice Duel loss"
-                )
-            else:
-                result_text = "🤝 **It's a tie!** Bet returned."
-                color = discord.Color.gold()
+        # Calculate winnings
+        if won:
+            winnings = bet * multiplier
+            # Add winnings (net profit)
+            await self.client.api.send_reward(  # type: ignore[attr-defined]
+                str(message.author.id),
+                winnings - bet,  # Net profit
+                "roulette",
+                f"Roulette win ({bet_type}: {bet_value})"
+            )
+            result_text = f"🎉 **GEWONNEN!** +{winnings} UC (x{multiplier})"
+        else:
+            # Deduct bet
+            await self.client.api.send_reward(  # type: ignore[attr-defined]
+                str(message.author.id),
+                -bet,
+                "roulette",
+                f"Roulette loss ({bet_type}: {bet_value})"
+            )
+            result_text = f"❌ **Verloren!** -{bet} UC"
             
-            embed = discord.Embed(title="🎲 Dice Duel", color=color)
-            embed.add_field(name="Your Roll", value=player_display, inline=True)
-            embed.add_field(name="Bot Roll", value=bot_display, inline=True)
-            embed.add_field(name="Result", value=result_text, inline=False)
-            embed.set_footer(text=f"Bet: {bet:,} UC • {BOT_CODE_VERSION}")
+        # Build response embed
+        embed = discord.Embed(
+            title="🎰 Roulette",
+            color=discord.Color.green() if won else discord.Color.red()
+        )
+        embed.add_field(
+            name="Ergebnis",
+            value=f"{color_emoji[result_color]} **{result_num}** ({result_color.upper()})",
+            inline=True
+        )
+        embed.add_field(
+            name="Deine Wette",
+            value=f"{bet} UC auf **{bet_value}**",
+            inline=True
+        )
+        embed.add_field(
+            name="Resultat",
+            value=result_text,
+            inline=False
+        )
+        embed.set_footer(text="Viel Glück beim nächsten Spin!")
             
-            await message.reply(embed=embed)
+        await message.reply(embed=embed)
+
+    async def _route_dice(self, message: discord.Message, content: str):
+        """?dice - Dice Duel game"""
+        parts = content.split()
+        if len(parts) < 2:
+            await message.reply(
+                "🎲 **Dice Duel**\n"
+                "Roll dice against the bot - highest roll wins!\n\n"
+                "Usage: `?dice <bet>`\n"
+                "Example: `?dice 100`\n\n"
+                "• Win: **2x** your bet\n"
+                "• Tie: Bet returned"
+            )
             return
-
-        # ── ?plinko ── Plinko game
-        if lowered.startswith("?plinko"):
-            parts = content.split()
-            bet = 50  # Default bet
-            risk = "medium"  # Default risk
-            
-            # Parse arguments: ?plinko [bet] [risk]
-            if len(parts) >= 2:
-                # First arg could be bet or risk
-                if parts[1].isdigit():
-                    bet = int(parts[1])
-                    if len(parts) >= 3:
-                        risk = parts[2].lower()
-                elif parts[1] in {"low", "medium", "high"}:
-                    risk = parts[1].lower()
-                    if len(parts) >= 3 and parts[2].isdigit():
-                        bet = int(parts[2])
-            
-            if bet < 10:
-                await message.reply("❌ Minimum bet is 10 UC!")
-                return
             
-            if risk not in {"low", "medium", "high"}:
-                await message.reply(
-                    "🔴 **Plinko**\n"
-                    "Drop a ball through the pyramid!\n\n"
-                    "**Usage:** `?plinko <bet> <risk>`\n"
-                    "**Risks:** `low`, `medium`, `high`\n\n"
-                    "• **Low Risk:** Safer, smaller multipliers (0.5x - 1.5x)\n"
-                    "• **Medium Risk:** Balanced (0.4x - 3x)\n"
-                    "• **High Risk:** Risky, huge rewards possible (0.2x - 10x)\n\n"
-                    "Example: `?plinko 100 high`"
-                )
-                return
+        bet_str = parts[1].replace(",", "")
+        if not bet_str.isdigit() or int(bet_str) < 10:
+            await message.reply("❌ Minimum bet is 10 UC!")
+            return
             
-            # Check balance
-            balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
-            current_balance = safe_int_balance(balance_result.get("balance", 0))
-            if current_balance < bet:
-                await message.reply(f"❌ Not enough UC! You have **{current_balance:,} UC**.")
-                return
+        bet = int(bet_str)
             
-            # Play Plinko via API
-            result = await self.client.api.play_plinko(risk, bet)  # type: ignore[attr-defined]
+        # Check balance
+        balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
+        current_balance = safe_int_balance(balance_result.get("balance", 0))
+        if current_balance < bet:
+            await message.reply(f"❌ Not enough UC! You have **{current_balance:,} UC**.")
+            return
             
-            if result.get("error"):
-                await message.reply(f"❌ {result['error']}")
-                return
+        # Roll dice (2d6 each)
+        roll = game_engine.roll_dice(str(message.author.id))
+        player_d1, player_d2 = roll["player"]
+        bot_d1, bot_d2 = roll["bot"]
+        player_total = roll["playerTotal"]
+        bot_total = roll["botTotal"]
             
-            multiplier = result.get("multiplier", 1)
-            payout = result.get("payout", bet)
-            path = result.get("path", [])
-            final_pos = result.get("finalPosition", 4)
+        # Dice emojis
+        dice_emoji = {1: "⚀", 2: "⚁", 3: "⚂", 4: "⚃", 5: "⚄", 6: "⚅"}
             
-            # Create visual pyramid display
-            risk_emojis = {"low": "🟢", "medium": "🟡", "high": "🔴"}
-            risk_emoji = risk_emojis.get(risk, "🟡")
+        player_display = f"{dice_emoji[player_d1]} {dice_emoji[player_d2]} = **{player_total}**"
+        bot_display = f"{dice_emoji[bot_d1]} {dice_emoji[bot_d2]} = **{bot_total}**"
             
-            # Build path visualization
-            path_display = " → ".join(["⬅️" if p == "L" else "➡️" for p in path[-4:]])  # Show last 4 moves
+        # Determine winner
+        if player_total > bot_total:
+            result_text = f"🎉 **YOU WIN!** +{bet:,} UC"
+            color = discord.Color.green()
+            # Award winnings (net profit = bet)
+            await self.client.api.send_reward(  # type: ignore[attr-defined]
+                str(message.author.id), bet, "dice", "Dice Duel win"
+            )
+        elif player_total < bot_total:
+            result_text = f"💀 **Bot wins!** -{bet:,} UC"
+            color = discord.Color.red()
+            # Deduct bet
+            await self.client.api.send_reward(  # type: ignore[attr-defined]
+                str(message.author.id), -bet, "dice", "Dice Duel loss"
+            )
+        else:
+            result_text = "🤝 **It's a tie!** Bet returned."
+            color = discord.Color.gold()
             
-            # Multiplier display for this risk level
-            multipliers = {
-                "low": [1.5, 1.2, 1.1, 1, 0.5, 1, 1.1, 1.2, 1.5],
-                "medium": [3, 1.5, 1.2, 0.7, 0.4, 0.7, 1.2, 1.5, 3],
-                "high": [10, 3, 1.5, 0.5, 0.2, 0.5, 1.5, 3, 10],
-            }
-            mult_row = multipliers[risk]
-            mult_display = " ".join([f"**{m}x**" if i == final_pos else f"{m}x" for i, m in enumerate(mult_row)])
+        embed = discord.Embed(title="🎲 Dice Duel", color=color)
+        embed.add_field(name="Your Roll", value=player_display, inline=True)
+        embed.add_field(name="Bot Roll", value=bot_display, inline=True)
+        embed.add_field(name="Result", value=result_text, inline=False)
+        embed.set_footer(text=f"Bet: {bet:,} UC • {BOT_CODE_VERSION}")
             
-            # Landing slots visual
-            slots = ["⚫"] * 9
-            slots[final_pos] = "🔵"
-            slots_display = " ".join(slots)
+        await message.reply(embed=embed)
+
+    async def _route_plinko(self, message: discord.Message, content: str):
+        """?plinko - Plinko game"""
+        parts = content.split()
+        bet = 50  # Default bet
+        risk = "medium"  # Default risk
             
-            # Net profit/loss
-            net = payout - bet
-            won = net >= 0
+        # Parse arguments: ?plinko [bet] [risk]
+        if len(parts) >= 2:
+            # First arg could be bet or risk
+            if parts[1].isdigit():
+                bet = int(parts[1])
+                if len(parts) >= 3:
+                    risk = parts[2].lower()
+            elif parts[1] in {"low", "medium", "high"}:
+                risk = parts[1].lower()
+                if len(parts) >= 3 and parts[2].isdigit():
+                    bet = int(parts[2])
             
-            if won:
-                if net > 0:
-                    result_text = f"🎉 **WIN!** +{net:,} UC (x{multiplier})"
-                    color = discord.Color.green()
-                    # Award net profit
-                    await self.client.api.send_reward(  # type: ignore[attr-defined]
-                        str(message.author.id), net, "plinko", f"Plinko win (x{multiplier})"
-                    )
-                else:
-                    result_text = f"🤝 **Break even!** x{multiplier}"
-                    color = discord.Color.gold()
-            else:
-                result_text = f"💀 **Lost!** {net:,} UC (x{multiplier})"
-                color = discord.Color.red()
-                # Deduct loss
-                await self.client.api.send_reward(  # type: ignore[attr-defined]
-                    str(message.author.id), net, "plinko", f"Plinko loss (x{multiplier})"
-                )
+        if bet < 10:
+            await message.reply("❌ Minimum bet is 10 UC!")
+            return
             
-            embed = discord.Embed(
-                title=f"🔴 Plinko {risk_emoji}",
-                description=(
-                    f"```\n{slots_display}\n```\n"
-                    f"**Path:** {path_display}\n\n"
-                    f"**Multipliers:**\n{mult_display}"
-                ),
-                color=color
+        if risk not in {"low", "medium", "high"}:
+            await message.reply(
+                "🔴 **Plinko**\n"
+                "Drop a ball through the pyramid!\n\n"
+                "**Usage:** `?plinko <bet> <risk>`\n"
+                "**Risks:** `low`, `medium`, `high`\n\n"
+                "• **Low Risk:** Safer, smaller multipliers (0.5x - 1.5x)\n"
+                "• **Medium Risk:** Balanced (0.4x - 3x)\n"
+                "• **High Risk:** Risky, huge rewards possible (0.2x - 10x)\n\n"
+                "Example: `?plinko 100 high`"
             )
-            embed.add_field(name="Bet", value=f"{bet:,} UC", inline=True)
-            embed.add_field(name="Risk", value=risk.capitalize(), inline=True)
-            embed.add_field(name="Multiplier", value=f"x{multiplier}", inline=True)
-            embed.add_field(name="Result", value=result_text, inline=False)
-            embed.set_footer(text=f"Payout: {payout:,} UC • {BOT_CODE_VERSION}")
+            return
             
-            await message.reply(embed=embed)
+        # Check balance
+        balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
+        current_balance = safe_int_balance(balance_result.get("balance", 0))
+        if current_balance < bet:
+            await message.reply(f"❌ Not enough UC! You have **{current_balance:,} UC**.")
             return
-
-        # ── ?keno ── Keno game
-        if lowered.startswith("?keno"):
-            parts = content.split()
-            bet = 50  # Default bet
-            picks: list = []
-            
-            # Parse arguments: ?keno <numbers> <bet>
-            # Example: ?keno 5,12,23,34,40 100
-            # Or: ?keno 5 12 23 34 40 100
-            if len(parts) >= 2:
-                # Check if first arg contains commas (comma-separated numbers)
-                if "," in parts[1]:
-                    try:
-                        picks = [int(x.strip()) for x in parts[1].split(",") if x.strip().isdigit()]
-                    except ValueError:
-                        pass
-                    if len(parts) >= 3 and parts[2].isdigit():
-                        bet = int(parts[2])
-                else:
-                    # Space-separated numbers, last numeric is bet
-                    for p in parts[1:]:
-                        if p.isdigit():
-                            num = int(p)
-                            if 1 <= num <= 40:
-                                picks.append(num)
-                            else:
-                                # Could be bet if > 40
-                                if num > 40:
-                                    bet = num
-            
-            if len(picks) == 0 or len(picks) > 10:
-                await message.reply(
-                    "🎱 **Keno**\n"
-                    "Pick 1-10 numbers between 1-40!\n\n"
-                    "**Usage:** `?keno <numbers> [bet]`\n"
-                    "**Example:** `?keno 5,12,23,34,40 100`\n"
-                    "Or: `?keno 5 12 23 100` (last number > 40 = bet)\n\n"
-                    "**How it works:**\n"
-                    "• 10 numbers are drawn randomly\n"
-                    "• More matches = higher multiplier!\n"
-                    "• Pick 10 & match all = **5000x** 🤑"
-                )
-                return
             
-            if bet < 10:
-                await message.reply("❌ Minimum bet is 10 UC!")
-                return
+        # Play Plinko via API
+        result = await self.client.api.play_plinko(risk, bet)  # type: ignore[attr-defined]
             
-            # Check balance
-            balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
-            current_balance = safe_int_balance(balance_result.get("balance", 0))
-            if current_balance < bet:
-                await message.reply(f"❌ Not enough UC! You have **{current_balance:,} UC**.")
-                return
+        if result.get("error"):
+            await message.reply(f"❌ {result['error']}")
+            return
             
-            # Play Keno via API
-            result = await self.client.api.play_keno(picks, bet)  # type: ignore[attr-defined]
+        multiplier = result.get("multiplier", 1)
+        payout = result.get("payout", bet)
+        path = result.get("path", [])
+        final_pos = result.get("finalPosition", 4)
             
-            if result.get("error"):
-                await message.reply(f"❌ {result['error']}")
-                return
+        # Create visual pyramid display
+        risk_emojis = {"low": "🟢", "medium": "🟡", "high": "🔴"}
+        risk_emoji = risk_emojis.get(risk, "🟡")
             
-            drawn = result.get("drawnNumbers", [])
-            matches = result.get("matches", [])
-            match_count = result.get("matchCount", 0)
-            multiplier = result.get("multiplier", 0)
-            payout = result.get("payout", 0)
+        # Build path visualization
+        path_display = " → ".join(["⬅️" if p == "L" else "➡️" for p in path[-4:]])  # Show last 4 moves
             
-            # Create visual display
-            picks_display = " ".join([f"**{n}**" if n in matches else str(n) for n in sorted(picks)])
-            drawn_display = " ".join([f"🟢{n}" if n in matches else str(n) for n in drawn])
+        # Multiplier display for this risk level
+        mult_row = PLINKO_MULTIPLIERS[risk]
+        mult_display = " ".join([f"**{m}x**" if i == final_pos else f"{m}x" for i, m in enumerate(mult_row)])
             
-            # Net profit/loss
-            net = payout - bet
-            won = net > 0
+        # Landing slots visual
+        slots = ["⚫"] * 9
+        slots[final_pos] = "🔵"
+        slots_display = " ".join(slots)
             
-            if won:
+        # Net profit/loss
+        net = payout - bet
+        won = net >= 0
+            
+        if won:
+            if net > 0:
                 result_text = f"🎉 **WIN!** +{net:,} UC (x{multiplier})"
                 color = discord.Color.green()
                 # Award net profit
                 await self.client.api.send_reward(  # type: ignore[attr-defined]
-                    str(message.author.id), net, "keno", f"Keno win ({match_count} matches, x{multiplier})"
+                    str(message.author.id), net, "plinko", f"Plinko win (x{multiplier})"
                 )
-            elif payout == bet:
+            else:
                 result_text = f"🤝 **Break even!** x{multiplier}"
                 color = discord.Color.gold()
+        else:
+            result_text = f"💀 **Lost!** {net:,} UC (x{multiplier})"
+            color = discord.Color.red()
+            # Deduct loss
+            await self.client.api.send_reward(  # type: ignore[attr-defined]
+                str(message.author.id), net, "plinko", f"Plinko loss (x{multiplier})"
+            )
+            
+        embed = discord.Embed(
+            title=f"🔴 Plinko {risk_emoji}",
+            description=(
+                f"```\n{slots_display}\n```\n"
+                f"**Path:** {path_display}\n\n"
+                f"**Multipliers:**\n{mult_display}"
+            ),
+            color=color
+        )
+        embed.add_field(name="Bet", value=f"{bet:,} UC", inline=True)
+        embed.add_field(name="Risk", value=risk.capitalize(), inline=True)
+        embed.add_field(name="Multiplier", value=f"x{multiplier}", inline=True)
+        embed.add_field(name="Result", value=result_text, inline=False)
+        embed.set_footer(text=f"Payout: {payout:,} UC • {BOT_CODE_VERSION}")
+            
+        await message.reply(embed=embed)
+
+    async def _route_keno(self, message: discord.Message, content: str):
+        """?keno - Keno game"""
+        parts = content.split()
+        bet = 50  # Default bet
+        picks: list = []
+            
+        # Parse arguments: ?keno <numbers> <bet>
+        # Example: ?keno 5,12,23,34,40 100
+        # Or: ?keno 5 12 23 34 40 100
+        if len(parts) >= 2:
+            # Check if first arg contains commas (comma-separated numbers)
+            if "," in parts[1]:
+                try:
+                    picks = [int(x.strip()) for x in parts[1].split(",") if x.strip().isdigit()]
+                except ValueError:
+                    pass
+                if len(parts) >= 3 and parts[2].isdigit():
+                    bet = int(parts[2])
             else:
-                result_text = f"💀 **Lost!** -{bet:,} UC"
-                color = discord.Color.red()
-                # Deduct loss
-                await self.client.api.send_reward(  # type: ignore[attr-defined]
-                    str(message.author.id), -bet, "keno", f"Keno loss ({match_count} matches)"
-                )
+                # Space-separated numbers, last numeric is bet
+                for p in parts[1:]:
+                    if p.isdigit():
+                        num = int(p)
+                        if 1 <= num <= 40:
+                            picks.append(num)
+                        else:
+                            # Could be bet if > 40
+                            if num > 40:
+                                bet = num
             
-            embed = discord.Embed(
-                title="🎱 Keno",
-                description=(
-                    f"**Your picks:** {picks_display}\n\n"
-                    f"**Drawn:** {drawn_display}\n\n"
-                    f"**Matches:** {match_count}/{len(picks)}"
-                ),
-                color=color
+        if len(picks) == 0 or len(picks) > 10:
+            await message.reply(
+                "🎱 **Keno**\n"
+                "Pick 1-10 numbers between 1-40!\n\n"
+                "**Usage:** `?keno <numbers> [bet]`\n"
+                "**Example:** `?keno 5,12,23,34,40 100`\n"
+                "Or: `?keno 5 12 23 100` (last number > 40 = bet)\n\n"
+                "**How it works:**\n"
+                "• 10 numbers are drawn randomly\n"
+                "• More matches = higher multiplier!\n"
+                "• Pick 10 & match all = **5000x** 🤑"
             )
-            embed.add_field(name="Bet", value=f"{bet:,} UC", inline=True)
-            embed.add_field(name="Multiplier", value=f"x{multiplier}", inline=True)
-            embed.add_field(name="Payout", value=f"{payout:,} UC", inline=True)
-            embed.add_field(name="Result", value=result_text, inline=False)
-            embed.set_footer(text=f"Matched numbers: {', '.join(map(str, matches)) if matches else 'None'}")
+            return
             
-            await message.reply(embed=embed)
+        if bet < 10:
+            await message.reply("❌ Minimum bet is 10 UC!")
             return
-
-        if lowered.startswith("?lookup"):
-            parts = content.split(maxsplit=1)
-            if len(parts) < 2 or not parts[1].strip():
-                await message.reply("❌ Usage: `?lookup <username>` or `?lookup #UID`")
-                return
-
-            query = parts[1].strip()
-            try:
-                result = await self.client.api.lookup_profile(query)  # type: ignore[attr-defined]
-            except Exception as e:
-                await message.reply(f"❌ Lookup failed: {e}")
-                return
-
-            if isinstance(result, dict) and result.get("error"):
-                await message.reply(f"❌ {result['error']}")
-                return
-
-            username = result.get("username", query)
-            display_name = result.get("display_name") or username
-            bio = result.get("bio") or ""
-            views = result.get("views_count", 0)
-            likes = result.get("likes_count", 0)
-            is_premium = result.get("is_premium", False)
-            uid = result.get("uid")
-            avatar_url = result.get("avatar_url")
-            badges = result.get("badges") or []
-            profile_url = f"https://uservault.cc/{username}"
-
-            premium_badge = "⭐ " if is_premium else ""
-            embed = discord.Embed(
-                title=f"{premium_badge}{display_name}",
-                url=profile_url,
-                description=bio[:200] if bio else "(no bio)",
-                color=discord.Color.blurple(),
-            )
             
-            # Add avatar as thumbnail
-            if avatar_url:
-                embed.set_thumbnail(url=avatar_url)
+        # Check balance
+        balance_result = await self.client.api.get_balance(str(message.author.id))  # type: ignore[attr-defined]
+        current_balance = safe_int_balance(balance_result.get("balance", 0))
+        if current_balance < bet:
+            await message.reply(f"❌ Not enough UC! You have **{current_balance:,} UC**.")
+            return
             
-            embed.add_field(name="👁️ Views", value=str(views), inline=True)
-            embed.add_field(name="❤️ Likes", value=str(likes), inline=True)
+        # Play Keno via API
+        result = await self.client.api.play_keno(picks, bet)  # type: ignore[attr-defined]
             
-            if uid:
-                embed.add_field(name="🆔 UID", value=f"#{uid}", inline=True)
+        if result.get("error"):
+            await message.reply(f"❌ {result['error']}")
+            return
             
-            # Show badges
-            if badges:
-                badge_names = [b.get("name", "?") for b in badges[:8]]
-                embed.add_field(
-                    name=f"🏅 Badges ({len(badges)})",
-                    value=", ".join(badge_names) + ("..." if len(badges) > 8 else ""),
-                    inline=False,
-                )
+        drawn = result.get("drawnNumbers", [])
+        matches = result.get("matches", [])
+        match_count = result.get("matchCount", 0)
+        multiplier = result.get("multiplier", 0)
+        payout = result.get("payout", 0)
+            
+        # Create visual display
+        picks_display = " ".join([f"**{n}**" if n in matches else str(n) for n in sorted(picks)])
+        drawn_display = " ".join([f"🟢{n}" if n in matches else str(n) for n in drawn])
+            
+        # Net profit/loss
+        net = payout - bet
+        won = net > 0
+            
+        if won:
+            result_text = f"🎉 **WIN!** +{net:,} UC (x{multiplier})"
+            color = discord.Color.green()
+            # Award net profit
+            await self.client.api.send_reward(  # type: ignore[attr-defined]
+                str(message.author.id), net, "keno", f"Keno win ({match_count} matches, x{multiplier})"
+            )
+        elif payout == bet:
+            result_text = f"🤝 **Break even!** x{multiplier}"
+            color = discord.Color.gold()
+        else:
+            result_text = f"💀 **Lost!** -{bet:,} UC"
+            color = discord.Color.red()
+            # Deduct loss
+            await self.client.api.send_reward(  # type: ignore[attr-defined]
+                str(message.author.id), -bet, "keno", f"Keno loss ({match_count} matches)"
+            )
+            
+        embed = discord.Embed(
+            title="🎱 Keno",
+            description=(
+                f"**Your picks:** {picks_display}\n\n"
+                f"**Drawn:** {drawn_display}\n\n"
+                f"**Matches:** {match_count}/{len(picks)}"
+            ),
+            color=color
+        )
+        embed.add_field(name="Bet", value=f"{bet:,} UC", inline=True)
+        embed.add_field(name="Multiplier", value=f"x{multiplier}", inline=True)
+        embed.add_field(name="Payout", value=f"{payout:,} UC", inline=True)
+        embed.add_field(name="Result", value=result_text, inline=False)
+        embed.set_footer(text=f"Matched numbers: {', '.join(map(str, matches)) if matches else 'None'}")
             
-            embed.set_footer(text=f"uservault.cc/{username}")
+        await message.reply(embed=embed)
 
-            try:
-                await message.reply(embed=embed)
-            except discord.Forbidden:
-                # No Embed Links permission → fallback to plain text
-                badge_text = f" | 🏅 {len(badges)} badges" if badges else ""
-                await message.reply(
-                    f"👤 {display_name} (#{uid})\n{profile_url}\n👁️ Views: {views} | ❤️ Likes: {likes}{badge_text}"
-                )
+    async def _route_lookup(self, message: discord.Message, content: str):
+        """?lookup - Look up a UserVault profile by username or #UID"""
+        parts = content.split(maxsplit=1)
+        if len(parts) < 2 or not parts[1].strip():
+            await message.reply("❌ Usage: `?lookup <username>` or `?lookup #UID`")
             return
 
-        # ===== ?users - Admin only list registered users =====
-        if lowered == "?users" or lowered.startswith("?users "):
-            # Check admin
-            admin_check = await self.client.api.check_admin(str(message.author.id))  # type: ignore[attr-defined]
-            if not admin_check.get("is_admin"):
-                await message.reply("❌ Admin access required!")
-                return
-
-            result = await self.client.api.get_all_users(str(message.author.id))  # type: ignore[attr-defined]
-            if result.get("error"):
-                await message.reply(f"❌ {result['error']}")
-                return
+        query = parts[1].strip()
+        try:
+            result = await self.client.api.lookup_profile(query)  # type: ignore[attr-defined]
+        except Exception as e:
+            await message.reply(f"❌ Lookup failed: {e}")
+            return
 
-            users = result.get("users", [])
-            count = int(result.get("count", 0) or 0)
+        if isinstance(result, dict) and result.get("error"):
+            await message.reply(f"❌ {result['error']}")
+            return
 
-            if not users:
-                await message.reply("📋 No registered users found.")
-                return
+        username = result.get("username", query)
+        display_name = result.get("display_name") or username
+        bio = result.get("bio") or ""
+        views = result.get("views_count", 0)
+        likes = result.get("likes_count", 0)
+        is_premium = result.get("is_premium", False)
+        uid = result.get("uid")
+        avatar_url = result.get("avatar_url")
+        badges = result.get("badges") or []
+        profile_url = f"https://uservault.cc/{username}"
 
-            # Show first 25 users (avoid spam)
-            per_page = 25
-            page_users = users[:per_page]
-            lines = [
-                f"**#{u.get('uid_number', '?')}** — {u.get('username', 'Unknown')}"
-                for u in page_users
-            ]
+        premium_badge = "⭐ " if is_premium else ""
+        embed = discord.Embed(
+            title=f"{premium_badge}{display_name}",
+            url=profile_url,
+            description=bio[:200] if bio else "(no bio)",
+            color=discord.Color.blurple(),
+        )
+            
+        # Add avatar as thumbnail
+        if avatar_url:
+            embed.set_thumbnail(url=avatar_url)
+            
+        embed.add_field(name="👁️ Views", value=str(views), inline=True)
+        embed.add_field(name="❤️ Likes", value=str(likes), inline=True)
+            
+        if uid:
+            embed.add_field(name="🆔 UID", value=f"#{uid}", inline=True)
+            
+        # Show badges
+        if badges:
+            badge_names = [b.get("name", "?") for b in badges[:8]]
+            embed.add_field(
+                name=f"🏅 Badges ({len(badges)})",
+                value=", ".join(badge_names) + ("..." if len(badges) > 8 else ""),
+                inline=False,
+            )
+            
+        embed.set_footer(text=f"uservault.cc/{username}")
 
-            embed = discord.Embed(
-                title=f"📋 Registered Users ({count} total)",
-                description="\n".join(lines)[:4000],
-                color=discord.Color.blurple(),
+        try:
+            await message.reply(embed=embed)
+        except discord.Forbidden:
+            # No Embed Links permission → fallback to plain text
+            badge_text = f" | 🏅 {len(badges)} badges" if badges else ""
+            await message.reply(
+                f"👤 {display_name} (#{uid})\n{profile_url}\n👁️ Views: {views} | ❤️ Likes: {likes}{badge_text}"
             )
-            embed.set_footer(text=f"Showing first {min(per_page, len(users))} of {count} • uservault.cc • v:{BOT_CODE_VERSION}")
 
-            try:
-                await message.reply(embed=embed)
-            except discord.Forbidden:
-                await message.reply("\n".join(lines))
+    async def _route_users(self, message: discord.Message, content: str):
+        """?users - Admin only list registered users"""
+        # Check admin
+        if not await self.client.uservault_auth.is_uservault_admin(message.author.id):  # type: ignore[attr-defined]
+            await message.reply("❌ Admin access required!")
+            return
 
+        result = await self.client.api.get_all_users(str(message.author.id))  # type: ignore[attr-defined]
+        if result.get("error"):
+            await message.reply(f"❌ {result['error']}")
             return
 
-        # ===== Unknown command handling - DYNAMIC API COMMAND EXECUTION =====
-        # Check if this is an API command that should be executed dynamically
-        if lowered.startswith("?"):
-            cmd_name = lowered[1:].split()[0].lower()  # Extract command name without ?
-            
-            # Skip if it's a hardcoded command (already handled above)
-            hardcoded_commands = {
-                "help", "helping", "commands", "reload", "restart", "ping", 
-                "version", "balance", "daily", "crash", "mines", "higherlower", "hl",
-                "roulette", "dice", "plinko", "keno", "lookup", "users",
-                "slots", "coin", "rps", "blackjack", "guess", "trivia",
-                "link", "unlink", "profile", "delete", "apistats", "refresh"
-            }
-            
-            if cmd_name not in hardcoded_commands:
-                # Check if this command exists in the API cache
-                api_cmd = get_command_by_name(cmd_name)
-                if api_cmd and api_cmd.get("is_enabled", True):
-                    # Execute the API command dynamically
-                    await self._execute_api_command(message, api_cmd, content)
-                    return
-                elif api_cmd and not api_cmd.get("is_enabled", True):
-                    await message.reply(f"ℹ️ Command `{cmd_name}` is currently disabled.")
-                    return
+        users = result.get("users", [])
+        count = int(result.get("count", 0) or 0)
 
-        active_guess_games = getattr(self.client, "active_guess_games", {})
-        game = active_guess_games.get(message.author.id)
-        if game and message.channel.id == game.get("channel_id"):
-            try:
-                guess_num = int(message.content)
-                if 1 <= guess_num <= 100:
-                    game["attempts"] -= 1
-                    result = await self.client.api.check_guess(  # type: ignore[attr-defined]
-                        game["secret"],
-                        guess_num,
-                        game["attempts"],
-                    )
+        if not users:
+            await message.reply("📋 No registered users found.")
+            return
 
-                    if result.get("correct"):
-                        reward = result.get("reward", 50)
-                        await message.reply(f"🎉 **Correct!** The number was {guess_num}! **+{reward} UC**")
-                        await self.client.api.send_reward(  # type: ignore[attr-defined]
-                            str(message.author.id),
-                            reward,
-                            "guess",
-                            "Number guess",
-                        )
-                        del active_guess_games[message.author.id]
-                    elif game["attempts"] == 0:
-                        await message.reply(f"❌ Out of attempts! The number was {result.get('answer', '???')}.")
-                        del active_guess_games[message.author.id]
-                    else:
-                        hint = result.get("hint", "Try again!")
-                        await message.reply(f"{hint} ({game['attempts']} attempts left)")
-            except ValueError:
-                pass
+        # Show first 25 users (avoid spam)
+        per_page = 25
+        page_users = users[:per_page]
+        lines = [
+            f"**#{u.get('uid_number', '?')}** — {u.get('username', 'Unknown')}"
+            for u in page_users
+        ]
+
+        embed = discord.Embed(
+            title=f"📋 Registered Users ({count} total)",
+            description="\n".join(lines)[:4000],
+            color=discord.Color.blurple(),
+        )
+        embed.set_footer(text=f"Showing first {min(per_page, len(users))} of {count} • uservault.cc • v:{BOT_CODE_VERSION}")
+
+        try:
+            await message.reply(embed=embed)
+        except discord.Forbidden:
+            await message.reply("\n".join(lines))
+
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        # Some host bots override on_message without calling bot.process_commands().
+        # In that case, @commands.command prefix commands won't fire, so the pipeline
+        # routes the critical prefix commands itself and they still work in extension mode.
+        # Standalone, UserVaultBot.on_message already runs the pipeline.
+        pipeline = self.client.uservault_messages  # type: ignore[attr-defined]
+        if not pipeline.owns_commands:
+            await pipeline.process(message)
 
 
 
@@ -3735,53 +7083,6 @@ async def profile(interaction: discord.Interaction):
         )
 
 
-# ============ MESSAGE HANDLER FOR GUESS GAME ============
-
-@bot.event
-async def on_message(message: discord.Message):
-    if message.author.bot:
-        return
-    
-    # Check if user has an active guess game
-    game = bot.active_guess_games.get(message.author.id)
-    if game and message.channel.id == game["channel_id"]:
-        try:
-            guess_num = int(message.content)
-            if 1 <= guess_num <= 100:
-                game["attempts"] -= 1
-                
-                result = await bot.api.check_guess(
-                    game["secret"], 
-                    guess_num,
-                    game["attempts"]
-                )
-                
-                if result.get("correct"):
-                    reward = result.get("reward", 50)
-                    await message.reply(
-                        f"🎉 **Correct!** The number was {guess_num}! **+{reward} UC**"
-                    )
-                    await bot.api.send_reward(
-                        str(message.author.id), 
-                        reward, 
-                        "guess", 
-                        "Number guess"
-                    )
-                    del bot.active_guess_games[message.author.id]
-                elif game["attempts"] == 0:
-                    await message.reply(
-                        f"❌ Out of attempts! The number was {result.get('answer', '???')}."
-                    )
-                    del bot.active_guess_games[message.author.id]
-                else:
-                    hint = result.get("hint", "Try again!")
-                    await message.reply(f"{hint} ({game['attempts']} attempts left)")
-        except ValueError:
-            pass  # Not a number, ignore
-    
-    await bot.process_commands(message)
-
-
 # ============ SETUP FUNCTION FOR COG/EXTENSION LOADING ============
 
 async def setup(client: commands.Bot):
@@ -3831,6 +7132,7 @@ async def setup(client: commands.Bot):
             coin,
             rps,
             blackjack,
+            crash,
             guess,
             balance,
             daily,
@@ -3852,15 +7154,8 @@ async def setup(client: commands.Bot):
     # If the client has an API attribute, use it; otherwise create one
     _ensure_uservault_client_state(client)
 
-    # ===== FETCH COMMANDS FROM API =====
-    # This is the key step that makes commands dynamic!
-    try:
-        print("📡 [UserVault] Fetching commands from API...")
-        cmd_data = await fetch_commands_from_api(client.api, force=True)
-        cmd_count = len(cmd_data.get("commands", []))
-        print(f"✅ [UserVault] Loaded {cmd_count} commands from API")
-    except Exception as e:
-        print(f"⚠️ [UserVault] Failed to fetch commands from API: {e}")
+    # Commands come from the on-disk snapshot loaded at import; the cog's
+    # cog_load() reconciles them with the API in the background.
 
     # Prefix commands + message listener (needed for '?guess')
     # IMPORTANT: Always remove+re-add to guarantee clean state on reload.
@@ -3875,6 +7170,9 @@ async def setup(client: commands.Bot):
     await client.add_cog(cog)
     client._uservault_prefix_cog_loaded = True
     print("📦 [UserVault] Prefix commands cog loaded")
+
+    # Restarted on every (re)load so the server reads this module's fresh state
+    await start_metrics_server(client)
     
     # Start notification polling if not already running
     if not hasattr(client, '_uservault_notification_task') or client._uservault_notification_task is None or client._uservault_notification_task.done():
@@ -3912,6 +7210,8 @@ async def setup(client: commands.Bot):
             while not client.is_closed():
                 try:
                     result = await client.api.get_pending_notifications()
+                    if not result.get("error"):
+                        client._uservault_last_notification_poll = time.time()
                     notifications = result.get("notifications") or []
                     needs_reload = False
 
@@ -3926,9 +7226,6 @@ async def setup(client: commands.Bot):
                         # First, refresh the command cache from API
                         print("🔄 [UserVault] Refreshing command cache due to notification...")
                         try:
-                            global _CACHED_BOT_COMMANDS, _COMMANDS_LAST_FETCHED
-                            _CACHED_BOT_COMMANDS = {}
-                            _COMMANDS_LAST_FETCHED = 0
                             await fetch_commands_from_api(client.api, force=True)
                         except Exception as e:
                             print(f"⚠️ [UserVault] Failed to refresh commands: {e}")
@@ -3950,13 +7247,9 @@ async def setup(client: commands.Bot):
                         except Exception:
                             pass
 
-                        # Stop this poller before reload to prevent duplicate loops
-                        try:
-                            if hasattr(client, "_uservault_notification_task") and client._uservault_notification_task is not None:
-                                client._uservault_notification_task.cancel()
-                            client._uservault_notification_task = None
-                        except Exception:
-                            pass
+                        # This poller ends after the reload (return below); the reloaded
+                        # module starts its own. Cancelling ourselves here would abort the reload.
+                        client._uservault_notification_task = None
 
                         try:
                             await client.reload_extension(ext_name)
@@ -3975,16 +7268,21 @@ async def setup(client: commands.Bot):
                 # Poll every 5 seconds
                 await asyncio.sleep(5)
 
-        client._uservault_notification_task = asyncio.create_task(poll_notifications_for_extension())
-        print("📡 [UserVault] Started command notification polling (extension mode)")
-
-        
-        client._uservault_notification_task = asyncio.create_task(poll_notifications_for_extension())
+        client._uservault_notification_task = task_supervisor.spawn(
+            "poller", poll_notifications_for_extension(), name="notifications", drain=False, unique=True
+        )
         print("📡 [UserVault] Started command notification polling (extension mode)")
     
     print("✅ UserVault API Bot extension loaded!")
 
 
+async def teardown(client: commands.Bot):
+    """Called by discord.py when the extension is unloaded or reloaded."""
+    # Let this module's games and payouts finish before its code is replaced
+    await task_supervisor.drain()
+    await stop_metrics_server(client)
+
+
 async def send_notification_embed(client: commands.Bot, channel, notif: dict):
     """Send a command notification embed to Discord."""
     action = notif.get("action", "unknown")
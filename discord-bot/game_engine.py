@@ -0,0 +1,275 @@
+"""
+UserVault Discord Bot - Local Game Engine
+=========================================
+Pure, deterministic outcome functions for the quick games (coinflip, rock
+paper scissors, slots, dice duel, roulette). Every function takes a GameRng,
+so the same seed always produces the same round - rounds can be replayed
+and verified, and the bot only needs the backend for settlement.
+
+Results use the same shape as the minigame-data edge function
+(supabase/functions/minigame-data/index.ts), so callers do not care whether
+a round was resolved locally or by the backend.
+
+Seeding:
+- GameRng.secure(): fresh seed from the OS CSPRNG (secrets)
+- GameRng.from_server_seed(): HMAC-SHA256(server_seed, "client_seed:nonce").
+  Publish only sha256(server_seed) while the seed is in use; once it has been
+  rotated out, revealing it lets players verify their past rounds.
+"""
+
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+from typing import Any, Dict, Optional, Sequence
+
+log = logging.getLogger("uservault.game_engine")
+
+# Slots configuration (mirrors minigame-data)
+SLOT_SYMBOLS = ("🍒", "🍋", "🍊", "🍇", "⭐", "💎", "7️⃣")
+SLOT_PAYOUTS = {
+    "💎💎💎": 500,
+    "7️⃣7️⃣7️⃣": 300,
+    "⭐⭐⭐": 150,
+    "🍇🍇🍇": 100,
+    "🍊🍊🍊": 75,
+    "🍋🍋🍋": 50,
+    "🍒🍒🍒": 25,
+}
+SLOT_PAIR_PAYOUT = 10
+
+# Rock paper scissors
+RPS_CHOICES = ("rock", "paper", "scissors")
+RPS_EMOJIS = {"rock": "🪨", "paper": "📄", "scissors": "✂️"}
+RPS_BEATS = {"rock": "scissors", "paper": "rock", "scissors": "paper"}
+RPS_REWARD = 15
+
+# Roulette (single zero)
+ROULETTE_RED = frozenset({1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36})
+ROULETTE_MULTIPLIERS = {"color": 2, "parity": 2, "number": 36}
+
+
+class GameRng:
+    """
+    Deterministic byte stream: HMAC-SHA256(seed, "message:counter") blocks.
+
+    Integers are drawn by rejection sampling, so every value in a range is
+    exactly equally likely (no modulo bias).
+    """
+    __slots__ = ("seed", "message", "_counter", "_buffer")
+
+    def __init__(self, seed: bytes, message: bytes = b""):
+        self.seed = seed
+        self.message = message
+        self._counter = 0
+        self._buffer = b""
+
+    @classmethod
+    def secure(cls) -> "GameRng":
+        return cls(secrets.token_bytes(32))
+
+    @classmethod
+    def from_server_seed(cls, server_seed: str, client_seed: str = "", nonce: int = 0) -> "GameRng":
+        return cls(server_seed.encode(), f"{client_seed}:{nonce}".encode())
+
+    def _bytes(self, n: int) -> bytes:
+        while len(self._buffer) < n:
+            block = hmac.new(self.seed, self.message + b":" + str(self._counter).encode(), hashlib.sha256).digest()
+            self._buffer += block
+            self._counter += 1
+        out, self._buffer = self._buffer[:n], self._buffer[n:]
+        return out
+
+    def randbelow(self, n: int) -> int:
+        """Uniform integer in [0, n)."""
+        if n <= 0:
+            raise ValueError("n must be positive")
+        size = max(1, (n.bit_length() + 7) // 8)
+        limit = (256 ** size // n) * n
+        while True:
+            value = int.from_bytes(self._bytes(size), "big")
+            if value < limit:
+                return value % n
+
+    def randint(self, a: int, b: int) -> int:
+        """Uniform integer in [a, b], like random.randint."""
+        return a + self.randbelow(b - a + 1)
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        return seq[self.randbelow(len(seq))]
+
+
+def coin_flip(rng: GameRng) -> Dict[str, Any]:
+    result = "heads" if rng.randbelow(2) == 0 else "tails"
+    return {"result": result, "emoji": "🪙" if result == "heads" else "💿"}
+
+
+def play_rps(choice: str, rng: GameRng) -> Dict[str, Any]:
+    if choice not in RPS_EMOJIS:
+        return {"error": "Invalid choice. Use: rock, paper, scissors"}
+    bot_choice = rng.choice(RPS_CHOICES)
+    if choice == bot_choice:
+        result = "tie"
+    elif RPS_BEATS[choice] == bot_choice:
+        result = "win"
+    else:
+        result = "lose"
+    return {
+        "playerChoice": choice,
+        "botChoice": bot_choice,
+        "result": result,
+        "playerEmoji": RPS_EMOJIS[choice],
+        "botEmoji": RPS_EMOJIS[bot_choice],
+        "reward": RPS_REWARD if result == "win" else 0,
+    }
+
+
+def slots_payout(symbols: Sequence[str]) -> int:
+    payout = SLOT_PAYOUTS.get("".join(symbols))
+    if payout is not None:
+        return payout
+    if symbols[0] == symbols[1] or symbols[1] == symbols[2]:
+        return SLOT_PAIR_PAYOUT
+    return 0
+
+
+def spin_slots(rng: GameRng) -> Dict[str, Any]:
+    symbols = [rng.choice(SLOT_SYMBOLS) for _ in range(3)]
+    return {"result": symbols, "display": " ".join(symbols), "payout": slots_payout(symbols)}
+
+
+def roll_dice(rng: GameRng) -> Dict[str, Any]:
+    """Dice duel: 2d6 for the player, then 2d6 for the bot."""
+    player = (rng.randint(1, 6), rng.randint(1, 6))
+    bot = (rng.randint(1, 6), rng.randint(1, 6))
+    player_total, bot_total = sum(player), sum(bot)
+    if player_total > bot_total:
+        result = "win"
+    elif player_total < bot_total:
+        result = "lose"
+    else:
+        result = "tie"
+    return {"player": player, "bot": bot, "playerTotal": player_total, "botTotal": bot_total, "result": result}
+
+
+def roulette_color(number: int) -> str:
+    if number == 0:
+        return "green"
+    return "red" if number in ROULETTE_RED else "black"
+
+
+def roulette_parity(number: int) -> Optional[str]:
+    if number == 0:
+        return None
+    return "odd" if number % 2 == 1 else "even"
+
+
+def roulette_wins(bet_type: str, bet_value: Any, number: int) -> bool:
+    if bet_type == "color":
+        return bet_value == roulette_color(number)
+    if bet_type == "parity":
+        return bet_value == roulette_parity(number)
+    if bet_type == "number":
+        return bet_value == number
+    raise ValueError(f"Unknown roulette bet type: {bet_type}")
+
+
+def spin_roulette(bet_type: str, bet_value: Any, rng: GameRng) -> Dict[str, Any]:
+    number = rng.randint(0, 36)
+    won = roulette_wins(bet_type, bet_value, number)
+    return {
+        "number": number,
+        "color": roulette_color(number),
+        "parity": roulette_parity(number),
+        "won": won,
+        "multiplier": ROULETTE_MULTIPLIERS[bet_type],
+    }
+
+
+class GameEngine:
+    """
+    Hands out one GameRng per round.
+
+    Without a server seed every round gets a fresh CSPRNG seed. With one,
+    rounds are derived from (server_seed, "<game>:<client_seed>:<nonce>"),
+    where the client seed identifies the player (e.g. their user id) and the
+    nonce never repeats for the seed: it is reserved in blocks of NONCE_BLOCK
+    in `nonce_file`, so a restart continues after the last reserved block
+    instead of replaying earlier rounds. The first block is reserved on
+    construction (an unwritable nonce file raises OSError there); if a later
+    block cannot be persisted, rounds fall back to CSPRNG seeds until it can.
+    """
+
+    NONCE_BLOCK = 1000
+
+    def __init__(self, server_seed: Optional[str] = None, nonce_file: Optional[str] = None):
+        self.server_seed = server_seed or None
+        self.nonce_file = nonce_file or None
+        self.nonce = self._load_nonce()
+        self._reserved = self.nonce
+        self._reserve_failed = False
+        self.rounds: Dict[str, int] = {}
+        if self.server_seed is not None:
+            self._reserve()
+
+    @property
+    def server_seed_hash(self) -> Optional[str]:
+        """sha256 of the server seed - the only part of it that may be published while it is in use."""
+        if self.server_seed is None:
+            return None
+        return hashlib.sha256(self.server_seed.encode()).hexdigest()
+
+    def _load_nonce(self) -> int:
+        """Nonce to continue from; raises OSError/ValueError if the nonce file exists but is unusable."""
+        if self.server_seed is None or self.nonce_file is None or not os.path.exists(self.nonce_file):
+            return 0
+        with open(self.nonce_file, encoding="utf-8") as f:
+            nonce = int(f.read().strip())
+        if nonce < 0:
+            raise ValueError(f"negative nonce in {self.nonce_file}")
+        return nonce
+
+    def _reserve(self):
+        """Persist the end of the next nonce block before any nonce from it is used."""
+        reserved = self.nonce + self.NONCE_BLOCK
+        if self.nonce_file is not None:
+            tmp = f"{self.nonce_file}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(str(reserved))
+            os.replace(tmp, self.nonce_file)
+        self._reserved = reserved
+
+    def rng(self, game: str, client_seed: str = "") -> GameRng:
+        self.rounds[game] = self.rounds.get(game, 0) + 1
+        if self.server_seed is None:
+            return GameRng.secure()
+        if self.nonce >= self._reserved:
+            try:
+                self._reserve()
+            except OSError as e:
+                # Never hand out an unpersisted nonce; unseeded rounds are safe, just not verifiable
+                if not self._reserve_failed:
+                    log.error("❌ Could not persist the nonce block to %s (%s); using unseeded rounds", self.nonce_file, e)
+                self._reserve_failed = True
+                return GameRng.secure()
+            if self._reserve_failed:
+                log.info("✅ Nonce file %s writable again; seeded rounds resumed", self.nonce_file)
+                self._reserve_failed = False
+        self.nonce += 1
+        return GameRng.from_server_seed(self.server_seed, f"{game}:{client_seed}", self.nonce)
+
+    def coin_flip(self, client_seed: str = "") -> Dict[str, Any]:
+        return coin_flip(self.rng("coin_flip", client_seed))
+
+    def play_rps(self, choice: str, client_seed: str = "") -> Dict[str, Any]:
+        return play_rps(choice, self.rng("play_rps", client_seed))
+
+    def spin_slots(self, client_seed: str = "") -> Dict[str, Any]:
+        return spin_slots(self.rng("spin_slots", client_seed))
+
+    def roll_dice(self, client_seed: str = "") -> Dict[str, Any]:
+        return roll_dice(self.rng("dice", client_seed))
+
+    def spin_roulette(self, bet_type: str, bet_value: Any, client_seed: str = "") -> Dict[str, Any]:
+        return spin_roulette(bet_type, bet_value, self.rng("roulette", client_seed))
@@ -0,0 +1,148 @@
+"""
+UserVault Discord Bot - Payout Tables
+=====================================
+Pure payout math for the local minigames (no Discord or network code), so
+the bot, tools and simulations all use the same numbers.
+
+Multipliers are precomputed per game configuration on first use and then
+served by table lookup:
+- Mines: one table per (cells, mines) with the multiplier for every number
+  of revealed safe cells.
+- Higher/Lower: one table with the multiplier for every streak length.
+- Crash: the crash point formula and the shared multiplier curve.
+- Plinko/Keno: the payout tables of the minigame-data edge function, which
+  resolves these games (kept here for display and RTP simulation).
+
+The house edge is a fraction of the table multiplier that is kept back
+(0.02 = pay 98% of it). For Mines the table is the fair multiplier, so 0.0
+means fair odds; Higher/Lower keeps its fixed 1 + 0.5 * streak ladder, which
+is not derived from the win probability, and the edge scales that ladder.
+"""
+
+import bisect
+from functools import lru_cache
+from math import comb
+from typing import Dict, Tuple
+
+# Mines board: 4 rows of 5 buttons (the 5th row holds the cashout button)
+MINES_GRID_COLUMNS = 5
+MINES_GRID_ROWS = 4
+MINES_CELLS = MINES_GRID_COLUMNS * MINES_GRID_ROWS
+
+# Crash: crash point = CRASH_HOUSE_FACTOR / (1 - r) for a uniform r in [0, 1),
+# capped at CRASH_MAX_MULTIPLIER (r >= CRASH_HOUSE_FACTOR always hits the cap)
+CRASH_HOUSE_FACTOR = 0.99
+CRASH_MAX_MULTIPLIER = 100.0
+
+# Plinko: ball starts in the middle slot and moves one slot left/right per row
+# (clamped to the board); mirrors plinkoMultipliers in minigame-data
+PLINKO_ROWS = 8
+PLINKO_START = 4
+PLINKO_MULTIPLIERS: Dict[str, Tuple[float, ...]] = {
+    "low": (1.5, 1.2, 1.1, 1, 0.5, 1, 1.1, 1.2, 1.5),
+    "medium": (3, 1.5, 1.2, 0.7, 0.4, 0.7, 1.2, 1.5, 3),
+    "high": (10, 3, 1.5, 0.5, 0.2, 0.5, 1.5, 3, 10),
+}
+
+# Keno: KENO_DRAWN numbers out of 1..KENO_NUMBERS; multiplier by picks and
+# matches (mirrors kenoPayouts in minigame-data, missing entries pay 0)
+KENO_NUMBERS = 40
+KENO_DRAWN = 10
+KENO_PAYOUTS: Dict[int, Dict[int, float]] = {
+    1: {1: 3.5},
+    2: {1: 1, 2: 9},
+    3: {2: 2, 3: 25},
+    4: {2: 1, 3: 5, 4: 50},
+    5: {3: 2, 4: 12, 5: 100},
+    6: {3: 1, 4: 4, 5: 25, 6: 300},
+    7: {3: 1, 4: 2, 5: 10, 6: 75, 7: 500},
+    8: {4: 2, 5: 5, 6: 25, 7: 150, 8: 1000},
+    9: {4: 1, 5: 3, 6: 10, 7: 50, 8: 300, 9: 2000},
+    10: {5: 2, 6: 5, 7: 20, 8: 100, 9: 500, 10: 5000},
+}
+
+# Higher/Lower: streaks up to this length are tabled; longer ones are computed
+HIGHERLOWER_MAX_TABLED_STREAK = 100
+HIGHERLOWER_STEP = 0.5
+
+
+def check_house_edge(house_edge: float) -> float:
+    """Validated house edge; raises ValueError outside [0, 1)."""
+    if not 0.0 <= house_edge < 1.0:
+        raise ValueError(f"house_edge must be in [0, 1), got {house_edge}")
+    return float(house_edge)
+
+
+@lru_cache(maxsize=None)
+def mines_table(cells: int = MINES_CELLS, mines: int = 5, house_edge: float = 0.0) -> Tuple[float, ...]:
+    """
+    Multiplier for every number of revealed safe cells (index 0 .. cells - mines).
+
+    The fair multiplier after `r` safe reveals is 1 / P(r safe picks in a row)
+    = C(cells, r) / C(cells - mines, r), computed exactly and rounded once.
+    """
+    if not 0 < mines < cells:
+        raise ValueError(f"mines must be between 1 and {cells - 1}, got {mines}")
+    edge = check_house_edge(house_edge)
+    safe = cells - mines
+    table = [1.0]
+    for revealed in range(1, safe + 1):
+        fair = comb(cells, revealed) / comb(safe, revealed)
+        table.append(round(fair * (1.0 - edge), 2))
+    return tuple(table)
+
+
+def mines_multiplier(revealed: int, mines: int = 5, cells: int = MINES_CELLS, house_edge: float = 0.0) -> float:
+    """Multiplier after `revealed` safe cells; 1.0 before the first reveal."""
+    return mines_table(cells, mines, house_edge)[revealed]
+
+
+def _higherlower_value(streak: int, edge: float) -> float:
+    if streak <= 0:
+        return 1.0
+    return round((1.0 + streak * HIGHERLOWER_STEP) * (1.0 - edge), 2)
+
+
+@lru_cache(maxsize=None)
+def higherlower_table(house_edge: float = 0.0) -> Tuple[float, ...]:
+    """Multiplier for every streak length 0 .. HIGHERLOWER_MAX_TABLED_STREAK."""
+    edge = check_house_edge(house_edge)
+    return tuple(_higherlower_value(streak, edge) for streak in range(HIGHERLOWER_MAX_TABLED_STREAK + 1))
+
+
+def higherlower_multiplier(streak: int, house_edge: float = 0.0) -> float:
+    """Multiplier after `streak` correct guesses; 1.0 before the first one."""
+    if streak <= HIGHERLOWER_MAX_TABLED_STREAK:
+        return higherlower_table(house_edge)[max(streak, 0)]
+    return _higherlower_value(streak, check_house_edge(house_edge))
+
+
+def crash_point_for(r: float) -> float:
+    """Crash point for a uniform random r in [0, 1)."""
+    if r >= CRASH_HOUSE_FACTOR:
+        return CRASH_MAX_MULTIPLIER
+    return min(round(CRASH_HOUSE_FACTOR / (1 - r), 2), CRASH_MAX_MULTIPLIER)
+
+
+@lru_cache(maxsize=None)
+def crash_curve(limit: float = CRASH_MAX_MULTIPLIER) -> Tuple[float, ...]:
+    """
+    Displayed Crash multiplier per tick (tick 0 = x1.00), up to the first value >= limit.
+
+    Growth accelerates: each tick adds 0.05 + 0.02 * tick. A round shows the
+    curve until the next value would reach its crash point.
+    """
+    curve = [1.00]
+    while curve[-1] < limit:
+        curve.append(round(curve[-1] + 0.05 + len(curve) * 0.02, 2))
+    return tuple(curve)
+
+
+def crash_ticks_before(crash: float) -> int:
+    """Number of curve values shown before a round with this crash point crashes."""
+    curve = crash_curve(max(crash, CRASH_MAX_MULTIPLIER))
+    return bisect.bisect_left(curve, crash, 1)
+
+
+def keno_multiplier(picks: int, matches: int) -> float:
+    return KENO_PAYOUTS.get(picks, {}).get(matches, 0)
@@ -0,0 +1,343 @@
+"""
+UserVault Discord Bot - RTP Simulator
+=====================================
+Vectorized Monte Carlo benchmark for the bot games. Every game is simulated
+the way the bot books it (net UC per round passed to send_reward), using the
+bot's own payout tables and rules from payouts.py and game_engine.py.
+
+For every game configuration it reports:
+- RTP (return to player, 1 + mean net / bet) with its standard error
+- standard deviation of the net result per unit bet
+- max drawdown (in bets) of a player betting every simulated round
+- hit rate and the most frequent net outcomes (per-bet distribution)
+- throughput (rounds per second)
+
+Runs as a benchmark suite: save a baseline, then compare later runs against
+it to catch payout changes (RTP outside the statistical tolerance) and
+performance regressions.
+
+Requires NumPy (not needed by the bot itself):
+    pip install numpy
+
+Usage:
+    python rtp_simulator.py                               # all games, 1M rounds each
+    python rtp_simulator.py --rounds 200000000 --games crash,mines
+    python rtp_simulator.py --save-baseline rtp_baseline.json
+    python rtp_simulator.py --baseline rtp_baseline.json  # exit 1 if an RTP changed
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - reported by main()
+    np = None
+
+from payouts import (
+    CRASH_HOUSE_FACTOR, CRASH_MAX_MULTIPLIER, KENO_DRAWN, KENO_NUMBERS, MINES_CELLS,
+    PLINKO_MULTIPLIERS, PLINKO_ROWS, PLINKO_START,
+    crash_point_for, keno_multiplier, mines_multiplier,
+)
+from game_engine import RPS_BEATS, RPS_CHOICES, ROULETTE_MULTIPLIERS, SLOT_SYMBOLS, roulette_wins, slots_payout
+
+DEFAULT_ROUNDS = 1_000_000
+DEFAULT_CHUNK = 1_000_000
+# RTP differences beyond this many combined standard errors fail a baseline check
+DEFAULT_RTP_SIGMAS = 5.0
+TOP_OUTCOMES = 8
+
+
+# ============ GAME MODELS ============
+# Each model returns the net UC per round (int64 array) for `n` rounds.
+
+def sim_coin(rng, n: int, bet: int) -> "np.ndarray":
+    """?coin: even money."""
+    return np.where(rng.integers(0, 2, n) == 0, bet, -bet)
+
+
+def sim_rps(rng, n: int, bet: int, choice: str = "rock") -> "np.ndarray":
+    """?rps: win +bet, lose -bet, tie 0."""
+    table = np.array([
+        0 if bot == choice else (bet if RPS_BEATS[choice] == bot else -bet)
+        for bot in RPS_CHOICES
+    ], dtype=np.int64)
+    return table[rng.integers(0, len(RPS_CHOICES), n)]
+
+
+def sim_dice(rng, n: int, bet: int) -> "np.ndarray":
+    """?dice: 2d6 against 2d6, win +bet, lose -bet, tie 0."""
+    dice = rng.integers(1, 7, (n, 4))
+    return np.sign(dice[:, 0] + dice[:, 1] - dice[:, 2] - dice[:, 3]) * bet
+
+
+def sim_slots(rng, n: int, bet: int) -> "np.ndarray":
+    """?slots: a win credits the fixed payout (not scaled by the bet), a loss costs the bet."""
+    count = len(SLOT_SYMBOLS)
+    table = np.array([
+        slots_payout((a, b, c)) for a in SLOT_SYMBOLS for b in SLOT_SYMBOLS for c in SLOT_SYMBOLS
+    ], dtype=np.int64)
+    reels = rng.integers(0, count, (n, 3))
+    payout = table[(reels[:, 0] * count + reels[:, 1]) * count + reels[:, 2]]
+    return np.where(payout > 0, payout, -bet)
+
+
+def sim_roulette(rng, n: int, bet: int, bet_type: str = "color", bet_value: Any = "red") -> "np.ndarray":
+    """?roulette: a win books bet * (multiplier - 1), a loss -bet."""
+    wins = np.array([roulette_wins(bet_type, bet_value, number) for number in range(37)])
+    profit = bet * ROULETTE_MULTIPLIERS[bet_type] - bet
+    return np.where(wins[rng.integers(0, 37, n)], profit, -bet)
+
+
+def sim_plinko(rng, n: int, bet: int, risk: str = "medium") -> "np.ndarray":
+    """?plinko: clamped left/right walk over PLINKO_ROWS rows, payout floor(bet * multiplier)."""
+    multipliers = np.array(PLINKO_MULTIPLIERS[risk], dtype=np.float64)
+    position = np.full(n, PLINKO_START, dtype=np.int64)
+    for _ in range(PLINKO_ROWS):
+        position += 2 * rng.integers(0, 2, n) - 1
+        np.clip(position, 0, len(multipliers) - 1, out=position)
+    return np.floor(bet * multipliers[position]).astype(np.int64) - bet
+
+
+def sim_keno(rng, n: int, bet: int, picks: int = 5) -> "np.ndarray":
+    """?keno: matches of `picks` numbers among KENO_DRAWN drawn, payout floor(bet * multiplier)."""
+    multipliers = np.array([keno_multiplier(picks, m) for m in range(picks + 1)], dtype=np.float64)
+    matches = rng.hypergeometric(picks, KENO_NUMBERS - picks, KENO_DRAWN, n)
+    return np.floor(bet * multipliers[matches]).astype(np.int64) - bet
+
+
+def crash_points(r: "np.ndarray") -> "np.ndarray":
+    """Vectorized payouts.crash_point_for() for uniform values r in [0, 1)."""
+    with np.errstate(divide="ignore"):
+        crash = np.minimum(np.round(CRASH_HOUSE_FACTOR / (1 - r), 2), CRASH_MAX_MULTIPLIER)
+    return np.where(r >= CRASH_HOUSE_FACTOR, CRASH_MAX_MULTIPLIER, crash)
+
+
+def sim_crash(rng, n: int, bet: int, target: float = 2.0) -> "np.ndarray":
+    """
+    ?crash <bet> <target>x: wins int(bet * target) - bet if the round crashes
+    above the target (see CrashTrajectory.cashout_tick).
+    """
+    return np.where(crash_points(rng.random(n)) > target, int(bet * target) - bet, -bet)
+
+
+def sim_mines(rng, n: int, bet: int, mines: int = 5, reveals: int = 3, house_edge: float = 0.0) -> "np.ndarray":
+    """
+    ?mines, cashing out after `reveals` safe cells. Booked like MinesView
+    settles today: a win credits int(bet * multiplier), a mine books nothing.
+    """
+    multiplier = mines_multiplier(reveals, mines, MINES_CELLS, house_edge)
+    hits = rng.hypergeometric(mines, MINES_CELLS - mines, reveals, n)
+    return np.where(hits == 0, int(bet * multiplier), 0)
+
+
+# ============ SUITE ============
+
+class Scenario:
+    """One game configuration of the benchmark suite."""
+    __slots__ = ("game", "label", "model", "bet", "params")
+
+    def __init__(self, game: str, label: str, model: Callable[..., Any], bet: int, **params):
+        self.game = game
+        self.label = label
+        self.model = model
+        self.bet = bet
+        self.params = params
+
+
+def build_suite(house_edge: float = 0.0) -> List[Scenario]:
+    suite = [
+        Scenario("coin", "coin", sim_coin, 10),
+        Scenario("rps", "rps", sim_rps, 15),
+        Scenario("dice", "dice", sim_dice, 100),
+    ]
+    suite += [Scenario("slots", f"slots bet={bet}", sim_slots, bet) for bet in (10, 20, 100, 500)]
+    suite += [
+        Scenario("roulette", "roulette color", sim_roulette, 100, bet_type="color", bet_value="red"),
+        Scenario("roulette", "roulette parity", sim_roulette, 100, bet_type="parity", bet_value="even"),
+        Scenario("roulette", "roulette number", sim_roulette, 100, bet_type="number", bet_value=17),
+    ]
+    suite += [Scenario("plinko", f"plinko {risk}", sim_plinko, 100, risk=risk) for risk in PLINKO_MULTIPLIERS]
+    suite += [Scenario("keno", f"keno picks={picks}", sim_keno, 100, picks=picks) for picks in range(1, 11)]
+    suite += [
+        Scenario("crash", f"crash target=x{target:.2f}", sim_crash, 100, target=target)
+        for target in (1.1, 1.5, 2.0, 5.0, 10.0, 50.0)
+    ]
+    suite += [
+        Scenario("mines", f"mines mines={mines} reveals={reveals}", sim_mines, 100,
+                 mines=mines, reveals=reveals, house_edge=house_edge)
+        for mines, reveals in ((1, 5), (3, 3), (5, 1), (5, 3), (5, 5), (10, 3))
+    ]
+    return suite
+
+
+class RunningStats:
+    """Streaming RTP/variance/drawdown/distribution over chunks of rounds."""
+
+    def __init__(self, bet: int):
+        self.bet = bet
+        self.rounds = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.hits = 0
+        self.balance = 0.0
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+        self.outcomes: Dict[int, int] = {}
+
+    def update(self, net: "np.ndarray"):
+        units = net / self.bet
+        self.rounds += len(units)
+        self.total += float(units.sum())
+        self.total_sq += float(np.dot(units, units))
+        self.hits += int(np.count_nonzero(net > 0))
+
+        # Drawdown of the running balance (in bets), carried across chunks
+        balance = self.balance + np.cumsum(units)
+        peak = np.maximum(np.maximum.accumulate(balance), self.peak)
+        self.max_drawdown = max(self.max_drawdown, float((peak - balance).max()))
+        self.balance = float(balance[-1])
+        self.peak = float(peak[-1])
+
+        values, counts = np.unique(net, return_counts=True)
+        for value, count in zip(values.tolist(), counts.tolist()):
+            self.outcomes[value] = self.outcomes.get(value, 0) + count
+
+    def report(self) -> Dict[str, Any]:
+        mean = self.total / self.rounds
+        variance = max(self.total_sq / self.rounds - mean * mean, 0.0)
+        top = sorted(self.outcomes.items(), key=lambda item: -item[1])[:TOP_OUTCOMES]
+        return {
+            "rounds": self.rounds,
+            "bet": self.bet,
+            "rtp": 1.0 + mean,
+            "rtp_stderr": math.sqrt(variance / self.rounds),
+            "stdev": math.sqrt(variance),
+            "max_drawdown": self.max_drawdown,
+            "hit_rate": self.hits / self.rounds,
+            "outcomes": {str(value): count / self.rounds for value, count in top},
+        }
+
+
+def run_scenario(scenario: Scenario, rounds: int, chunk: int, seed: List[int]) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    stats = RunningStats(scenario.bet)
+    started = time.perf_counter()
+    remaining = rounds
+    while remaining > 0:
+        n = min(chunk, remaining)
+        stats.update(scenario.model(rng, n, scenario.bet, **scenario.params))
+        remaining -= n
+    elapsed = time.perf_counter() - started
+    result = stats.report()
+    result["game"] = scenario.game
+    result["seconds"] = elapsed
+    result["rounds_per_second"] = rounds / elapsed if elapsed > 0 else float("inf")
+    return result
+
+
+def check_crash_formula(samples: int = 100_000) -> int:
+    """Count disagreements between crash_points() and the scalar payouts.crash_point_for()."""
+    r = np.random.default_rng(1).random(samples)
+    vectorized = crash_points(r)
+    scalar = np.array([crash_point_for(value) for value in r.tolist()])
+    return int(np.count_nonzero(vectorized != scalar))
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], sigmas: float, max_slowdown: float):
+    """Return (rtp_failures, slowdowns) as lists of messages."""
+    rtp_failures, slowdowns = [], []
+    for label, old in baseline.get("results", {}).items():
+        new = results.get(label)
+        if new is None:
+            continue
+        tolerance = sigmas * math.hypot(new["rtp_stderr"], old["rtp_stderr"]) + 1e-9
+        if abs(new["rtp"] - old["rtp"]) > tolerance:
+            rtp_failures.append(
+                f"{label}: RTP {old['rtp']:.4%} -> {new['rtp']:.4%} (tolerance ±{tolerance:.4%})"
+            )
+        if new["rounds_per_second"] < old["rounds_per_second"] * (1 - max_slowdown):
+            slowdowns.append(
+                f"{label}: {old['rounds_per_second']:,.0f} -> {new['rounds_per_second']:,.0f} rounds/s"
+            )
+    return rtp_failures, slowdowns
+
+
+def print_result(label: str, result: Dict[str, Any], show_outcomes: bool):
+    print(
+        f"{label:<28} RTP {result['rtp']:>8.3%} ±{result['rtp_stderr']:.3%}  "
+        f"σ {result['stdev']:>7.3f}  DD {result['max_drawdown']:>10.1f}  "
+        f"hit {result['hit_rate']:>6.2%}  {result['rounds_per_second'] / 1e6:>6.1f}M/s"
+    )
+    if show_outcomes:
+        outcomes = ", ".join(f"{net:>6} UC: {share:.3%}" for net, share in result["outcomes"].items())
+        print(f"{'':<28} {outcomes}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Monte Carlo RTP benchmark for the UserVault bot games")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="rounds per configuration")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="rounds simulated per vectorized batch")
+    parser.add_argument("--seed", type=int, default=0, help="base seed (each configuration gets its own stream)")
+    parser.add_argument("--games", default="", help="comma-separated games to run (default: all)")
+    parser.add_argument("--house-edge", type=float, default=0.0, help="PAYOUT_HOUSE_EDGE for Mines")
+    parser.add_argument("--outcomes", action="store_true", help="print the most frequent net outcomes")
+    parser.add_argument("--json", help="write the full report to this file")
+    parser.add_argument("--save-baseline", help="write results as a baseline file")
+    parser.add_argument("--baseline", help="compare against a baseline file")
+    parser.add_argument("--rtp-sigmas", type=float, default=DEFAULT_RTP_SIGMAS,
+                        help="allowed RTP difference in combined standard errors")
+    parser.add_argument("--max-slowdown", type=float, default=0.25,
+                        help="allowed throughput drop vs baseline (0.25 = 25%%)")
+    parser.add_argument("--fail-on-slowdown", action="store_true", help="exit 1 on throughput regressions too")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("❌ NumPy is required for the RTP simulator: pip install numpy", file=sys.stderr)
+        return 2
+
+    games = {name.strip() for name in args.games.split(",") if name.strip()}
+    suite = [s for s in build_suite(args.house_edge) if not games or s.game in games]
+    if not suite:
+        print(f"❌ No configurations for games: {', '.join(sorted(games))}", file=sys.stderr)
+        return 2
+
+    if not games or "crash" in games:
+        mismatches = check_crash_formula()
+        if mismatches:
+            print(f"⚠️ Vectorized crash formula differs from payouts.crash_point_for in {mismatches} samples")
+
+    print(f"🎲 {len(suite)} configurations × {args.rounds:,} rounds (seed {args.seed})")
+    results: Dict[str, Dict[str, Any]] = {}
+    for index, scenario in enumerate(suite):
+        result = run_scenario(scenario, args.rounds, args.chunk, [args.seed, index])
+        results[scenario.label] = result
+        print_result(scenario.label, result, args.outcomes)
+
+    report = {"rounds": args.rounds, "seed": args.seed, "house_edge": args.house_edge, "results": results}
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"💾 Saved {path}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rtp_failures, slowdowns = compare(results, baseline, args.rtp_sigmas, args.max_slowdown)
+    for message in rtp_failures:
+        print(f"❌ {message}")
+    for message in slowdowns:
+        print(f"⚠️ slower: {message}")
+    if not rtp_failures and not slowdowns:
+        print(f"✅ Matches baseline {args.baseline}")
+    return 1 if rtp_failures or (slowdowns and args.fail_on_slowdown) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())